@@ -1,12 +1,19 @@
-from typing import Sequence, Type
+from contextlib import contextmanager
+import threading
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Type
 
 from eth_typing import BLSPubkey, BLSSignature, Hash32
+from lru import LRU
 from py_ecc.bls.typing import Domain
 
+from eth2.beacon.constants import (
+    AGGREGATE_PUBKEYS_CACHE_SIZE,
+    VERIFIED_SIGNATURES_CACHE_SIZE,
+)
 from eth2.beacon.exceptions import SignatureError
 
 from .backends import DEFAULT_BACKEND, NoOpBackend
-from .backends.base import BaseBLSBackend
+from .backends.base import BaseBLSBackend, SignatureSet
 from .validation import (
     validate_many_public_keys,
     validate_private_key,
@@ -15,8 +22,39 @@ from .validation import (
 )
 
 
+class SignatureCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+class _SignatureBatch(threading.local):
+    # Set while signatures are collected to be verified in one batch
+    signature_sets: Optional[List[SignatureSet]] = None
+
+
 class Eth2BLS:
     backend: Type[BaseBLSBackend]
+    # Each thread has its own batch, so that a signature checked on another thread
+    # is never deferred to a batch it doesn't own
+    _batch = _SignatureBatch()
+
+    # Signature sets which were found valid, so that the same attestation is only
+    # verified once when it is gossiped and then included in a block.
+    _verified_signature_sets = LRU(VERIFIED_SIGNATURES_CACHE_SIZE)
+    _signature_cache_hits = 0
+    _signature_cache_misses = 0
+
+    # Committees are mostly the same all epoch, as are the validators taking part
+    _aggregate_pubkeys_cache = LRU(AGGREGATE_PUBKEYS_CACHE_SIZE)
 
     def __init__(self) -> None:
         self.use_default_backend()
@@ -24,6 +62,38 @@ class Eth2BLS:
     @classmethod
     def use(cls, backend: Type[BaseBLSBackend]) -> None:
         cls.backend = backend
+        # Signatures checked by another backend, e.g. ``NoOpBackend``, can't be trusted
+        cls.clear_signature_cache()
+        cls._aggregate_pubkeys_cache.clear()
+
+    @classmethod
+    def clear_signature_cache(cls) -> None:
+        cls._verified_signature_sets.clear()
+        cls._signature_cache_hits = 0
+        cls._signature_cache_misses = 0
+
+    @classmethod
+    def signature_cache_info(cls) -> SignatureCacheInfo:
+        return SignatureCacheInfo(
+            hits=cls._signature_cache_hits,
+            misses=cls._signature_cache_misses,
+            maxsize=cls._verified_signature_sets.get_size(),
+            currsize=len(cls._verified_signature_sets),
+        )
+
+    @classmethod
+    def _is_verified(cls, signature_set: SignatureSet) -> bool:
+        if signature_set in cls._verified_signature_sets:
+            cls._signature_cache_hits += 1
+            return True
+        else:
+            cls._signature_cache_misses += 1
+            return False
+
+    @classmethod
+    def _add_verified(cls, signature_sets: Sequence[SignatureSet]) -> None:
+        for signature_set in signature_sets:
+            cls._verified_signature_sets[signature_set] = True
 
     @classmethod
     def use_default_backend(cls) -> None:
@@ -49,7 +119,13 @@ class Eth2BLS:
 
     @classmethod
     def aggregate_pubkeys(cls, pubkeys: Sequence[BLSPubkey]) -> BLSPubkey:
-        return cls.backend.aggregate_pubkeys(pubkeys)
+        key = tuple(pubkeys)
+        try:
+            return cls._aggregate_pubkeys_cache[key]
+        except KeyError:
+            aggregate_pubkey = cls.backend.aggregate_pubkeys(key)
+            cls._aggregate_pubkeys_cache[key] = aggregate_pubkey
+            return aggregate_pubkey
 
     @classmethod
     def verify(
@@ -83,7 +159,14 @@ class Eth2BLS:
             validate_signature(signature)
             validate_public_key(pubkey)
 
-        if not cls.verify(message_hash, pubkey, signature, domain):
+        signature_set = SignatureSet((pubkey,), (message_hash,), signature, domain)
+        if cls._is_verified(signature_set):
+            return
+        elif cls._batch.signature_sets is not None:
+            cls._batch.signature_sets.append(signature_set)
+        elif cls.verify(message_hash, pubkey, signature, domain):
+            cls._add_verified((signature_set,))
+        else:
             raise SignatureError(
                 f"backend {cls.backend.__name__}\n"
                 f"message_hash {message_hash}\n"
@@ -104,7 +187,16 @@ class Eth2BLS:
             validate_signature(signature)
             validate_many_public_keys(pubkeys)
 
-        if not cls.verify_multiple(pubkeys, message_hashes, signature, domain):
+        signature_set = SignatureSet(
+            tuple(pubkeys), tuple(message_hashes), signature, domain
+        )
+        if cls._is_verified(signature_set):
+            return
+        elif cls._batch.signature_sets is not None:
+            cls._batch.signature_sets.append(signature_set)
+        elif cls.verify_multiple(pubkeys, message_hashes, signature, domain):
+            cls._add_verified((signature_set,))
+        else:
             raise SignatureError(
                 f"backend {cls.backend.__name__}\n"
                 f"pubkeys {pubkeys}\n"
@@ -113,5 +205,49 @@ class Eth2BLS:
                 f"domain {domain}"
             )
 
+    @classmethod
+    def validate_signature_sets(cls, signature_sets: Sequence[SignatureSet]) -> None:
+        """
+        Check all of ``signature_sets`` at once, falling back to checking them one by one
+        to find out which one is invalid.
+        """
+        if cls.backend.verify_signature_sets(signature_sets):
+            cls._add_verified(signature_sets)
+            return
+
+        for signature_set in signature_sets:
+            if cls.backend.verify_signature_set(signature_set):
+                cls._add_verified((signature_set,))
+            else:
+                raise SignatureError(
+                    f"backend {cls.backend.__name__}\n"
+                    f"pubkeys {signature_set.pubkeys}\n"
+                    f"message_hashes {signature_set.message_hashes}\n"
+                    f"signature {signature_set.signature}\n"
+                    f"domain {signature_set.domain}"
+                )
+
+    @classmethod
+    @contextmanager
+    def batch_validation(cls) -> Iterator[None]:
+        """
+        Defer the signature checks of ``validate`` and ``validate_multiple`` until the end
+        of the block, where they are all checked in one batch. ``SignatureError`` is then
+        raised on exit if any of them is invalid.
+
+        Batches are per thread, and nested batches are merged into the outermost one.
+        """
+        if cls._batch.signature_sets is not None:
+            yield
+            return
+
+        cls._batch.signature_sets = []
+        try:
+            yield
+            signature_sets = cls._batch.signature_sets
+        finally:
+            cls._batch.signature_sets = None
+        cls.validate_signature_sets(signature_sets)
+
 
 bls = Eth2BLS()
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Sequence
+from typing import NamedTuple, Sequence, Tuple
 
 from eth_typing import BLSPubkey, BLSSignature, Hash32
 from py_ecc.bls.typing import Domain
 
 
+class SignatureSet(NamedTuple):
+    """
+    A signature over one message per public key, as checked by ``verify_multiple``.
+    """
+
+    pubkeys: Tuple[BLSPubkey, ...]
+    message_hashes: Tuple[Hash32, ...]
+    signature: BLSSignature
+    domain: Domain
+
+
 class BaseBLSBackend(ABC):
     @staticmethod
     @abstractmethod
@@ -42,3 +53,27 @@ class BaseBLSBackend(ABC):
         domain: Domain,
     ) -> bool:
         ...
+
+    @classmethod
+    def verify_signature_set(cls, signature_set: SignatureSet) -> bool:
+        if len(signature_set.pubkeys) == 1:
+            return cls.verify(
+                signature_set.message_hashes[0],
+                signature_set.pubkeys[0],
+                signature_set.signature,
+                signature_set.domain,
+            )
+        else:
+            return cls.verify_multiple(*signature_set)
+
+    @classmethod
+    def verify_signature_sets(cls, signature_sets: Sequence[SignatureSet]) -> bool:
+        """
+        Return whether every one of ``signature_sets`` is valid.
+
+        Backends which can check many signatures at once for less than the cost of
+        checking them one by one should override this.
+        """
+        return all(
+            cls.verify_signature_set(signature_set) for signature_set in signature_sets
+        )
@@ -1,18 +1,39 @@
-from typing import Sequence
+import functools
+import secrets
+from typing import Dict, Sequence, Tuple
 
 from eth_typing import BLSPubkey, BLSSignature, Hash32
-from py_ecc.bls import (
-    aggregate_pubkeys,
-    aggregate_signatures,
-    privtopub,
-    sign,
-    verify,
-    verify_multiple,
+from eth_utils import ValidationError
+from py_ecc.bls import aggregate_signatures, privtopub, sign, verify, verify_multiple
+from py_ecc.bls.typing import Domain, G1Uncompressed
+from py_ecc.bls.utils import G1_to_pubkey, hash_to_G2, pubkey_to_G1, signature_to_G2
+from py_ecc.fields import optimized_bls12_381_FQ12 as FQ12
+from py_ecc.optimized_bls12_381 import (
+    G1,
+    Z1,
+    Z2,
+    add,
+    final_exponentiate,
+    multiply,
+    neg,
+    pairing,
 )
-from py_ecc.bls.typing import Domain
 
-from eth2._utils.bls.backends.base import BaseBLSBackend
-from eth2.beacon.constants import EMPTY_PUBKEY, EMPTY_SIGNATURE
+from eth2._utils.bls.backends.base import BaseBLSBackend, SignatureSet
+from eth2.beacon.constants import (
+    DECOMPRESSED_PUBKEYS_CACHE_SIZE,
+    EMPTY_PUBKEY,
+    EMPTY_SIGNATURE,
+)
+
+# Bits of the random scalars used to combine signatures verified together
+RANDOM_SCALAR_BITS = 64
+
+
+@functools.lru_cache(maxsize=DECOMPRESSED_PUBKEYS_CACHE_SIZE)
+def _pubkey_to_G1(pubkey: BLSPubkey) -> G1Uncompressed:
+    # Decompressing a point takes a square root, which costs far more than adding it
+    return pubkey_to_G1(pubkey)
 
 
 class PyECCBackend(BaseBLSBackend):
@@ -42,7 +63,10 @@ class PyECCBackend(BaseBLSBackend):
         # py_ecc use a different EMPTY_PUBKEY. Return the Trinity one here:
         if len(pubkeys) == 0:
             return EMPTY_PUBKEY
-        return aggregate_pubkeys(pubkeys)
+        aggregate_point = Z1
+        for pubkey in pubkeys:
+            aggregate_point = add(aggregate_point, _pubkey_to_G1(pubkey))
+        return G1_to_pubkey(aggregate_point)
 
     @staticmethod
     def verify_multiple(
@@ -52,3 +76,45 @@ class PyECCBackend(BaseBLSBackend):
         domain: Domain,
     ) -> bool:
         return verify_multiple(pubkeys, message_hashes, signature, domain)
+
+    @classmethod
+    def verify_signature_sets(cls, signature_sets: Sequence[SignatureSet]) -> bool:
+        """
+        Check all of ``signature_sets`` with a single final exponentiation and one pairing
+        per distinct message, plus one for all signatures combined.
+
+        Every set is multiplied by a random scalar first, so that an invalid signature
+        can't be made up for by another one.
+        """
+        if len(signature_sets) == 0:
+            return True
+        elif len(signature_sets) == 1:
+            return cls.verify_signature_set(signature_sets[0])
+
+        try:
+            combined_signature = Z2
+            combined_pubkeys: Dict[Tuple[Hash32, Domain], G1Uncompressed] = {}
+            for pubkeys, message_hashes, signature, domain in signature_sets:
+                scalar = secrets.randbelow(2 ** RANDOM_SCALAR_BITS - 1) + 1
+                combined_signature = add(
+                    combined_signature, multiply(signature_to_G2(signature), scalar)
+                )
+                for pubkey, message_hash in zip(pubkeys, message_hashes):
+                    if pubkey == EMPTY_PUBKEY:
+                        continue
+                    key = (message_hash, domain)
+                    combined_pubkeys[key] = add(
+                        combined_pubkeys.get(key, Z1),
+                        multiply(_pubkey_to_G1(pubkey), scalar),
+                    )
+
+            product = pairing(combined_signature, neg(G1), final_exponentiate=False)
+            for (message_hash, domain), combined_pubkey in combined_pubkeys.items():
+                product *= pairing(
+                    hash_to_G2(message_hash, domain),
+                    combined_pubkey,
+                    final_exponentiate=False,
+                )
+            return final_exponentiate(product) == FQ12.one()
+        except (ValidationError, ValueError, AssertionError):
+            return False
@@ -0,0 +1,81 @@
+"""Utilities for append-only binary merkle trees of a fixed depth.
+
+Only the right-most branch of the tree is kept, as in the deposit contract: appending a leaf,
+or reading off the root or the proof of the latest leaf, hashes a single node per layer.
+"""
+
+from typing import List
+
+from eth_typing import Hash32
+
+from .common import MerkleProof, _calc_parent_hash
+from .sparse import EmptyNodeHashes, TreeDepth
+
+
+def mix_in_length(root: Hash32, length: int) -> Hash32:
+    """
+    Return the root of a list whose elements have the Merkle root ``root``.
+    """
+    return _calc_parent_hash(root, Hash32(length.to_bytes(32, "little")))
+
+
+class IncrementalMerkleTree:
+    def __init__(self, depth: int = TreeDepth) -> None:
+        if depth > len(EmptyNodeHashes):
+            raise ValueError(
+                f"Trees can't be deeper than {len(EmptyNodeHashes)}, got {depth}"
+            )
+        self.depth = depth
+        # The left-hand node of every layer of the right-most branch which is a left
+        # child, i.e. the roots of the complete subtrees left of the next leaf.
+        self._branch: List[Hash32] = list(EmptyNodeHashes[:depth])
+        self._leaf_count = 0
+
+    def __len__(self) -> int:
+        return self._leaf_count
+
+    def append(self, leaf: Hash32) -> None:
+        # Like the deposit contract, leave the last leaf empty so that the root of the
+        # complete tree never has to be kept on the branch.
+        if self._leaf_count >= 2 ** self.depth - 1:
+            raise ValueError("The Merkle tree is full")
+
+        self._leaf_count += 1
+        size = self._leaf_count
+        node = leaf
+        for height in range(self.depth):
+            if size % 2 == 1:
+                self._branch[height] = node
+                return
+            node = _calc_parent_hash(self._branch[height], node)
+            size //= 2
+
+    def get_root(self) -> Hash32:
+        node = EmptyNodeHashes[0]
+        size = self._leaf_count
+        for height in range(self.depth):
+            if size % 2 == 1:
+                node = _calc_parent_hash(self._branch[height], node)
+            else:
+                node = _calc_parent_hash(node, EmptyNodeHashes[height])
+            size //= 2
+        return node
+
+    def get_last_proof(self) -> MerkleProof:
+        """
+        Return the Merkle proof of the latest leaf appended, from the leaves up.
+        """
+        if self._leaf_count == 0:
+            raise ValueError("The Merkle tree is empty")
+
+        # Everything to the right of the latest leaf is empty, and everything to its left
+        # is in the complete subtrees on the branch.
+        index = self._leaf_count - 1
+        return MerkleProof(
+            tuple(
+                self._branch[height]
+                if (index >> height) % 2 == 1
+                else EmptyNodeHashes[height]
+                for height in range(self.depth)
+            )
+        )
@@ -0,0 +1,220 @@
+"""Persistent Merkle caches for the fields of large SSZ containers.
+
+Every field of a container gets a :class:`FieldRootCache` holding the field's root and, for
+lists and vectors, every layer of the Merkle tree over the field's chunks. When a new version of
+the container is hashed, the caches of a previous version are used to only rehash the chunks
+(and their ancestors) which changed, which are found by comparing the elements of the old and
+new values by identity. Caches are never mutated, so any number of versions can share them.
+"""
+
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from eth_typing import Hash32
+from ssz.constants import CHUNK_SIZE, EMPTY_CHUNK, ZERO_HASHES
+from ssz.sedes import BasicSedes
+from ssz.sedes import List as ListSedes
+from ssz.sedes import Vector
+from ssz.utils import merkleize, mix_in_length
+
+from eth2._utils.hash import hash_eth2
+
+_node_hash_count = 0
+
+
+def get_node_hash_count() -> int:
+    """
+    Return the number of Merkle nodes hashed by field root caches since startup.
+    """
+    return _node_hash_count
+
+
+def _hash_node(left: Hash32, right: Hash32) -> Hash32:
+    global _node_hash_count
+    _node_hash_count += 1
+    return hash_eth2(left + right)
+
+
+class FieldRootCache:
+    __slots__ = ("value", "root", "layers")
+
+    def __init__(
+        self, value: Any, root: Hash32, layers: Optional[Tuple[List[Hash32], ...]]
+    ) -> None:
+        self.value = value
+        self.root = root
+        # Leaves first, only set for lists and vectors
+        self.layers = layers
+
+
+def _get_items_per_chunk(element_sedes: BasicSedes) -> int:
+    return CHUNK_SIZE // element_sedes.get_fixed_size()
+
+
+def _get_chunk(element_sedes: Any, value: Sequence[Any], chunk_index: int) -> Hash32:
+    if isinstance(element_sedes, BasicSedes):
+        items_per_chunk = _get_items_per_chunk(element_sedes)
+        items = value[
+            chunk_index * items_per_chunk : (chunk_index + 1) * items_per_chunk
+        ]
+        return Hash32(
+            b"".join(element_sedes.serialize(item) for item in items).ljust(
+                CHUNK_SIZE, b"\x00"
+            )
+        )
+    else:
+        return element_sedes.get_hash_tree_root(value[chunk_index])
+
+
+def _get_chunk_count(element_sedes: Any, length: int) -> int:
+    if isinstance(element_sedes, BasicSedes):
+        items_per_chunk = _get_items_per_chunk(element_sedes)
+        return (length + items_per_chunk - 1) // items_per_chunk
+    else:
+        return length
+
+
+def _get_dirty_chunks(
+    element_sedes: Any, old_value: Sequence[Any], new_value: Sequence[Any]
+) -> Set[int]:
+    if isinstance(element_sedes, BasicSedes):
+        items_per_chunk = _get_items_per_chunk(element_sedes)
+    else:
+        items_per_chunk = 1
+
+    dirty_items = (
+        index
+        for index, (old_item, new_item) in enumerate(zip(old_value, new_value))
+        # Basic values like integers are cheap to compare and aren't always
+        # interned, composite ones are compared by identity only.
+        if old_item is not new_item
+        and (not isinstance(element_sedes, BasicSedes) or old_item != new_item)
+    )
+    dirty_chunks = set(index // items_per_chunk for index in dirty_items)
+    if len(new_value) > len(old_value):
+        # The previously last chunk may have been partially filled
+        dirty_chunks.update(
+            range(
+                len(old_value) // items_per_chunk,
+                _get_chunk_count(element_sedes, len(new_value)),
+            )
+        )
+    return dirty_chunks
+
+
+def _build_layers(leaves: List[Hash32]) -> Tuple[List[Hash32], ...]:
+    layers = [leaves]
+    while len(layers[-1]) > 1:
+        child_layer = layers[-1]
+        depth = len(layers) - 1
+        layers.append(
+            [
+                _hash_node(
+                    child_layer[index],
+                    child_layer[index + 1]
+                    if index + 1 < len(child_layer)
+                    else ZERO_HASHES[depth],
+                )
+                for index in range(0, len(child_layer), 2)
+            ]
+        )
+    return tuple(layers)
+
+
+def _update_layers(
+    layers: Tuple[List[Hash32], ...], leaves: List[Hash32], dirty_leaves: Set[int]
+) -> Tuple[List[Hash32], ...]:
+    new_layers = [leaves]
+    dirty_nodes = dirty_leaves
+    depth = 0
+    while len(new_layers[-1]) > 1:
+        child_layer = new_layers[-1]
+        parent_length = (len(child_layer) + 1) // 2
+        if depth + 1 < len(layers):
+            parent_layer = layers[depth + 1][:parent_length]
+            parent_layer.extend([EMPTY_CHUNK] * (parent_length - len(parent_layer)))
+        else:
+            parent_layer = [EMPTY_CHUNK] * parent_length
+
+        dirty_nodes = set(index // 2 for index in dirty_nodes)
+        for parent_index in dirty_nodes:
+            index = parent_index * 2
+            parent_layer[parent_index] = _hash_node(
+                child_layer[index],
+                child_layer[index + 1]
+                if index + 1 < len(child_layer)
+                else ZERO_HASHES[depth],
+            )
+        new_layers.append(parent_layer)
+        depth += 1
+    return tuple(new_layers)
+
+
+def _get_root_from_layers(
+    sedes: Any, value: Sequence[Any], layers: Tuple[List[Hash32], ...]
+) -> Hash32:
+    # The tree over the chunks may be smaller than the one the limit of the
+    # sedes calls for, in which case it is the left-most subtree of zeroes.
+    limit_depth = (sedes.chunk_count() - 1).bit_length()
+    root = layers[-1][0]
+    for depth in range(len(layers) - 1, limit_depth):
+        root = _hash_node(root, ZERO_HASHES[depth])
+
+    if isinstance(sedes, ListSedes):
+        return mix_in_length(root, len(value))
+    else:
+        return root
+
+
+def get_field_root_cache(
+    sedes: Any, value: Any, previous: Optional[FieldRootCache] = None
+) -> FieldRootCache:
+    """
+    Return a :class:`FieldRootCache` for a field of a container, reusing ``previous``, the cache
+    of the same field in another version of the container, as much as possible.
+    """
+    if previous is not None and previous.value is value:
+        return previous
+
+    is_sequence = isinstance(sedes, (ListSedes, Vector)) and sedes.chunk_count() > 0
+    if not is_sequence:
+        if previous is not None and previous.value == value:
+            return FieldRootCache(value, previous.root, None)
+        else:
+            return FieldRootCache(value, sedes.get_hash_tree_root(value), None)
+
+    element_sedes = sedes.element_sedes
+    chunk_count = _get_chunk_count(element_sedes, len(value))
+    if chunk_count == 0:
+        # Same as merkleizing a single empty chunk
+        return FieldRootCache(value, sedes.get_hash_tree_root(value), None)
+
+    can_update = (
+        previous is not None
+        and previous.layers is not None
+        and len(previous.value) <= len(value)
+    )
+    if can_update:
+        leaves = previous.layers[0][:chunk_count]
+        previous_chunk_count = len(leaves)
+        leaves.extend([EMPTY_CHUNK] * (chunk_count - previous_chunk_count))
+
+        dirty_chunks: Set[int] = set()
+        for chunk_index in _get_dirty_chunks(element_sedes, previous.value, value):
+            chunk = _get_chunk(element_sedes, value, chunk_index)
+            # Equal elements may still be distinct objects, e.g. after decoding
+            if chunk_index >= previous_chunk_count or chunk != leaves[chunk_index]:
+                leaves[chunk_index] = chunk
+                dirty_chunks.add(chunk_index)
+        layers = _update_layers(previous.layers, leaves, dirty_chunks)
+    else:
+        leaves = [
+            _get_chunk(element_sedes, value, chunk_index)
+            for chunk_index in range(chunk_count)
+        ]
+        layers = _build_layers(leaves)
+
+    return FieldRootCache(value, _get_root_from_layers(sedes, value, layers), layers)
+
+
+def get_container_root_from_caches(field_caches: Sequence[FieldRootCache]) -> Hash32:
+    return merkleize(tuple(field_cache.root for field_cache in field_caches))
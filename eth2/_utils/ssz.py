@@ -1,8 +1,10 @@
-from typing import Iterable, Optional, Tuple
+import functools
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
 
 from eth_utils import ValidationError, to_tuple
 from eth_utils.toolz import curry
 import ssz
+from ssz.constants import OFFSET_SIZE
 
 from eth2.beacon.types.blocks import BaseBeaconBlock
 
@@ -72,3 +74,111 @@ def validate_ssz_equal(
 validate_imported_block_unchanged = validate_ssz_equal(
     obj_a_name="block", obj_b_name="imported block"
 )
+
+
+@functools.lru_cache()
+def _get_container_layout(
+    serializable_class: Type[ssz.Serializable]
+) -> Tuple[int, Tuple[Tuple[str, Any, int], ...]]:
+    """
+    Return the size of the fixed-size part of the encoding of ``serializable_class``,
+    and the name, sedes and position in that part of each of its fields. The position of a
+    variable-size field is the one of its offset.
+    """
+    layout = []
+    position = 0
+    for field_name, field_sedes in serializable_class._meta.fields:
+        layout.append((field_name, field_sedes, position))
+        if field_sedes.is_fixed_sized:
+            position += field_sedes.get_fixed_size()
+        else:
+            position += OFFSET_SIZE
+    return position, tuple(layout)
+
+
+def _get_field_spans(
+    data: memoryview, serializable_class: Type[ssz.Serializable]
+) -> Dict[str, Tuple[Any, int, int]]:
+    fixed_part_size, layout = _get_container_layout(serializable_class)
+    if len(data) < fixed_part_size:
+        raise ssz.DeserializationError(
+            f"Expected at least {fixed_part_size} bytes for {serializable_class.__name__}, "
+            f"got {len(data)}"
+        )
+
+    spans = {}
+    variable_fields = []
+    for field_name, field_sedes, position in layout:
+        if field_sedes.is_fixed_sized:
+            end = position + field_sedes.get_fixed_size()
+            spans[field_name] = (field_sedes, position, end)
+        else:
+            offset = int.from_bytes(
+                bytes(data[position : position + OFFSET_SIZE]), "little"
+            )
+            variable_fields.append((field_name, field_sedes, offset))
+
+    if not variable_fields and len(data) != fixed_part_size:
+        raise ssz.DeserializationError(
+            f"Expected {fixed_part_size} bytes for {serializable_class.__name__}, "
+            f"got {len(data)}"
+        )
+
+    ends = tuple(offset for _, _, offset in variable_fields[1:]) + (len(data),)
+    previous_end = fixed_part_size
+    for (field_name, field_sedes, start), end in zip(variable_fields, ends):
+        if start != previous_end or end < start:
+            raise ssz.DeserializationError(
+                f"Invalid offset {start} of field {field_name} "
+                f"of {serializable_class.__name__}"
+            )
+        spans[field_name] = (field_sedes, start, end)
+        previous_end = end
+    return spans
+
+
+class SSZView:
+    """
+    A read-only view on the SSZ encoding of a ``serializable_class`` object, which only
+    deserializes the fields which are accessed, e.g. the ``slot`` of a block or the
+    ``finalized_checkpoint`` of a state without the validator registry.
+
+    The field boundaries are read from the encoding when the view is created, and slicing
+    ``data`` does not copy it.
+    """
+
+    __slots__ = ("_serializable_class", "_data", "_field_spans", "_field_values")
+
+    def __init__(self, serializable_class: Type[ssz.Serializable], data: bytes) -> None:
+        self._serializable_class = serializable_class
+        self._data = memoryview(data)
+        self._field_spans = _get_field_spans(self._data, serializable_class)
+        self._field_values: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        try:
+            return self._field_values[name]
+        except KeyError:
+            pass
+
+        try:
+            field_sedes, start, end = self._field_spans[name]
+        except KeyError:
+            raise AttributeError(
+                f"{self._serializable_class.__name__} has no field {name}"
+            )
+        value = field_sedes.deserialize(bytes(self._data[start:end]))
+        self._field_values[name] = value
+        return value
+
+    def __repr__(self) -> str:
+        return f"<SSZView of {self._serializable_class.__name__}>"
+
+    def materialize(self) -> ssz.Serializable:
+        """
+        Deserialize the whole object.
+        """
+        return ssz.decode(bytes(self._data), sedes=self._serializable_class)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 import logging
-from typing import TYPE_CHECKING, Tuple, Type
+from typing import TYPE_CHECKING, Sequence, Tuple, Type, Union
 
 from eth._utils.datatypes import Configurable
 from eth.abc import AtomicDatabaseAPI
@@ -8,10 +9,14 @@ from eth.exceptions import BlockNotFound
 from eth.validation import validate_word
 from eth_utils import ValidationError, humanize_hash
 
+from eth2._utils.bls import bls
 from eth2._utils.funcs import constantly
-from eth2._utils.ssz import validate_imported_block_unchanged
+from eth2._utils.merkle.ssz_cache import get_node_hash_count
+from eth2._utils.ssz import SSZView, validate_imported_block_unchanged
+from eth2.beacon.constants import PRE_STATES_CACHE_SIZE
 from eth2.beacon.db.chain import BaseBeaconChainDB, BeaconChainDB
 from eth2.beacon.exceptions import BlockClassError, StateMachineNotFound
+from eth2.beacon.fork_choice.lmd_ghost import ProtoArrayStore
 from eth2.beacon.operations.attestation_pool import AttestationPool
 from eth2.beacon.types.attestations import Attestation
 from eth2.beacon.types.blocks import BaseBeaconBlock
@@ -99,6 +104,20 @@ class BaseBeaconChain(Configurable, ABC):
     def get_state_by_slot(self, slot: Slot) -> BeaconState:
         ...
 
+    @abstractmethod
+    def get_pre_state(self, parent_root: SigningRoot, slot: Slot) -> BeaconState:
+        ...
+
+    @abstractmethod
+    def has_pre_state(self, parent_root: SigningRoot, slot: Slot) -> bool:
+        ...
+
+    @abstractmethod
+    def add_pre_state(
+        self, parent_root: SigningRoot, slot: Slot, state: BeaconState
+    ) -> None:
+        ...
+
     #
     # Block API
     #
@@ -136,10 +155,30 @@ class BaseBeaconChain(Configurable, ABC):
     def get_canonical_block_root(self, slot: Slot) -> SigningRoot:
         ...
 
+    @abstractmethod
+    def get_canonical_block_ssz_by_slot_range(
+        self, start_slot: Slot, count: int, step: int = 1
+    ) -> Tuple[bytes, ...]:
+        ...
+
+    @abstractmethod
+    def get_block_ssz_by_root(self, block_root: SigningRoot) -> bytes:
+        ...
+
+    @abstractmethod
+    def get_ancestor_block_ssz_by_slots(
+        self, block_root: SigningRoot, slots: Sequence[Slot]
+    ) -> Tuple[bytes, ...]:
+        ...
+
     @abstractmethod
     def get_head_state(self) -> BeaconState:
         ...
 
+    @abstractmethod
+    def get_head_state_view(self) -> Union[BeaconState, SSZView]:
+        ...
+
     @abstractmethod
     def import_block(
         self, block: BaseBeaconBlock, perform_validation: bool = True
@@ -189,6 +228,12 @@ class BeaconChain(BaseBeaconChain):
 
         self.chaindb = self.get_chaindb_class()(base_db, genesis_config)
         self.attestation_pool = attestation_pool
+        self.fork_choice_store = ProtoArrayStore()
+        # Evicted in insertion order: the states are rarely looked up more than a few
+        # times, right after they are added.
+        self._pre_states: "OrderedDict[Tuple[SigningRoot, Slot], BeaconState]" = (
+            OrderedDict()
+        )
 
     #
     # Helpers
@@ -288,7 +333,11 @@ class BeaconChain(BaseBeaconChain):
             slot = at_slot
         sm_class = self.get_state_machine_class_for_block_slot(slot)
 
-        return sm_class(chaindb=self.chaindb, attestation_pool=self.attestation_pool)
+        return sm_class(
+            chaindb=self.chaindb,
+            attestation_pool=self.attestation_pool,
+            fork_choice_store=self.fork_choice_store,
+        )
 
     @classmethod
     def get_genesis_state_machine_class(cls) -> Type["BaseBeaconStateMachine"]:
@@ -308,6 +357,46 @@ class BeaconChain(BaseBeaconChain):
         state_root = self.chaindb.get_state_root_by_slot(slot)
         return self.chaindb.get_state_by_root(state_root, state_class)
 
+    def get_pre_state(self, parent_root: SigningRoot, slot: Slot) -> BeaconState:
+        """
+        Return the post-state of the block with the given root, advanced through empty
+        slots up to ``slot``: the state a block at ``slot`` on top of it is applied to.
+
+        The states are cached, so that validating a gossiped block, importing it and
+        precomputing the state of the upcoming slot only process the slots once.
+
+        Raise ``BlockNotFound`` if there's no block with the given root in the db.
+        """
+        key = (parent_root, slot)
+        cached_state = self._pre_states.get(key)
+        if cached_state is not None:
+            return cached_state
+
+        parent_block = self.get_block_by_root(parent_root)
+        state_machine = self.get_state_machine(at_slot=parent_block.slot)
+        state = self.chaindb.get_state_by_root(
+            parent_block.state_root, state_machine.get_state_class()
+        )
+        state = state_machine.state_transition.apply_state_transition(
+            state, future_slot=slot
+        )
+        self.add_pre_state(parent_root, slot, state)
+        return state
+
+    def has_pre_state(self, parent_root: SigningRoot, slot: Slot) -> bool:
+        return (parent_root, slot) in self._pre_states
+
+    def add_pre_state(
+        self, parent_root: SigningRoot, slot: Slot, state: BeaconState
+    ) -> None:
+        """
+        Cache ``state`` as the pre-state of a block at ``slot`` on top of the block with
+        the given root, e.g. after advancing it outside of the chain.
+        """
+        self._pre_states[(parent_root, slot)] = state
+        if len(self._pre_states) > PRE_STATES_CACHE_SIZE:
+            self._pre_states.popitem(last=False)
+
     #
     # Block API
     #
@@ -382,10 +471,49 @@ class BeaconChain(BaseBeaconChain):
         """
         return self.chaindb.get_canonical_block_root(slot)
 
+    def get_canonical_block_ssz_by_slot_range(
+        self, start_slot: Slot, count: int, step: int = 1
+    ) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encoding of the canonical blocks at ``count`` slots from
+        ``start_slot``, ``step`` slots apart, leaving out the skipped slots.
+        """
+        return self.chaindb.get_canonical_block_ssz_by_slot_range(
+            start_slot, count, step
+        )
+
+    def get_block_ssz_by_root(self, block_root: SigningRoot) -> bytes:
+        """
+        Return the SSZ encoding of the block with the given signing root.
+
+        Raise ``BlockNotFound`` if there's no block with the given root in the db.
+        """
+        return self.chaindb.get_block_ssz_by_root(block_root)
+
+    def get_ancestor_block_ssz_by_slots(
+        self, block_root: SigningRoot, slots: Sequence[Slot]
+    ) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encoding of the blocks at ``slots`` on the chain ending with the
+        block ``block_root``, leaving out the skipped slots.
+        """
+        return self.chaindb.get_ancestor_block_ssz_by_slots(block_root, slots)
+
     def get_head_state(self) -> BeaconState:
         head_state_slot = self.chaindb.get_head_state_slot()
         return self.get_state_by_slot(head_state_slot)
 
+    def get_head_state_view(self) -> Union[BeaconState, SSZView]:
+        """
+        Return a read-only view of the head state, which only decodes the fields that are
+        accessed. See ``BeaconChainDB.get_state_view_by_root``.
+        """
+        head_state_slot = self.chaindb.get_head_state_slot()
+        sm_class = self.get_state_machine_class_for_block_slot(head_state_slot)
+        state_class = sm_class.get_state_class()
+        state_root = self.chaindb.get_state_root_by_slot(head_state_slot)
+        return self.chaindb.get_state_view_by_root(state_root, state_class)
+
     def import_block(
         self, block: BaseBeaconBlock, perform_validation: bool = True
     ) -> Tuple[
@@ -403,6 +531,7 @@ class BeaconChain(BaseBeaconChain):
             block.slot,
             humanize_hash(block.signing_root),
         )
+        node_hash_count_before_import = get_node_hash_count()
 
         try:
             parent_block = self.get_block_by_root(block.parent_root)
@@ -414,27 +543,8 @@ class BeaconChain(BaseBeaconChain):
                 )
             )
 
-        try:
-            canonical_root_at_slot = self.get_canonical_block_root(parent_block.slot)
-        except BlockNotFound:
-            # No corresponding block at this slot which means parent block is not
-            # on canonical chain.
-            is_new_canonical_block = False
-        else:
-            is_on_canonical_chain = parent_block.signing_root == canonical_root_at_slot
-            is_newer_than_head_state_slot = (
-                self.chaindb.get_head_state_slot() < block.slot
-            )
-            is_new_canonical_block = (
-                is_on_canonical_chain and is_newer_than_head_state_slot
-            )
-
-        if is_new_canonical_block:
-            state_machine = self.get_state_machine()
-            state = self.get_head_state()
-        else:
-            state_machine = self.get_state_machine(at_slot=parent_block.slot)
-            state = self.get_state_by_slot(parent_block.slot)
+        state_machine = self.get_state_machine(at_slot=parent_block.slot)
+        state = self.get_pre_state(parent_block.signing_root, block.slot)
 
         state, imported_block = state_machine.import_block(
             block, state, check_proposer_signature=perform_validation
@@ -453,9 +563,12 @@ class BeaconChain(BaseBeaconChain):
         )
 
         self.logger.debug(
-            "successfully imported block at slot %s with signing root %s",
+            "successfully imported block at slot %s with signing root %s, "
+            "hashing %d state tree nodes, signature cache hit rate %.2f",
             imported_block.slot,
             humanize_hash(imported_block.signing_root),
+            get_node_hash_count() - node_hash_count_before_import,
+            bls.signature_cache_info().hit_rate,
         )
 
         return imported_block, new_canonical_blocks, old_canonical_blocks
@@ -1,12 +1,14 @@
-from typing import Iterable, Sequence, Tuple
+from array import array
+from typing import Iterable, List, Sequence, Tuple
 
 from eth_typing import BLSPubkey, Hash32
 from eth_utils import ValidationError, to_tuple
+from lru import LRU
 import ssz
 
 from eth2._utils.hash import hash_eth2
 from eth2._utils.tuple import update_tuple_item
-from eth2.beacon.constants import MAX_INDEX_COUNT, MAX_RANDOM_BYTE
+from eth2.beacon.constants import MAX_INDEX_COUNT, MAX_RANDOM_BYTE, SHUFFLING_CACHE_SIZE
 from eth2.beacon.exceptions import ImprobableToReach
 from eth2.beacon.helpers import get_active_validator_indices, get_seed
 from eth2.beacon.types.compact_committees import CompactCommittee
@@ -219,6 +221,98 @@ def compute_shuffled_index(
     return new_index
 
 
+def _swap_or_not_segment(
+    segment: List[ValidatorIndex], bits: str
+) -> List[ValidatorIndex]:
+    """
+    Within a ``segment`` every position ``x`` is paired with its mirror
+    ``len(segment) - 1 - x``; the pair is swapped if the bit of the larger
+    position of the two is set.
+    """
+    half = len(segment) // 2
+    mask = bits[::-1][:half] + bits[half:]
+    return [
+        partner if bit == "1" else item
+        for item, partner, bit in zip(segment, segment[::-1], mask)
+    ]
+
+
+def compute_shuffled_indices(
+    indices: Sequence[ValidatorIndex], seed: Hash32, shuffle_round_count: int
+) -> Tuple[ValidatorIndex, ...]:
+    """
+    Return the whole shuffled list of ``indices``, i.e. ``result[i]`` is
+    ``indices[compute_shuffled_index(i, len(indices), seed, shuffle_round_count)]``.
+
+    Rather than following every index through all of the rounds, each round
+    is applied to the whole list at once: the ``index_count / 256`` source
+    hashes of a round are computed a single time and the pairs of positions
+    exchanged by the round are swapped with list operations.  The rounds are
+    applied in reverse order, which composes the per-round permutations the
+    same way ``compute_shuffled_index`` does.
+    """
+    index_count = len(indices)
+    if index_count > MAX_INDEX_COUNT:
+        raise ValidationError(
+            f"The given `index_count` ({index_count}) should be equal to or less than "
+            f"`MAX_INDEX_COUNT` ({MAX_INDEX_COUNT}"
+        )
+
+    result = list(indices)
+    if index_count <= 1:
+        return tuple(result)
+
+    for current_round in reversed(range(shuffle_round_count)):
+        round_prefix = seed + current_round.to_bytes(1, "little")
+        pivot = int.from_bytes(hash_eth2(round_prefix)[0:8], "little") % index_count
+
+        source = b"".join(
+            hash_eth2(round_prefix + chunk.to_bytes(4, "little"))
+            for chunk in range((index_count + 255) // 256)
+        )
+        # `bits[position]` is the bit that decides whether the pair with the
+        # larger position ``position`` is swapped.
+        bits = format(int.from_bytes(source, "little"), "b").zfill(len(source) * 8)
+        bits = bits[::-1]
+
+        # Positions `0...pivot` pair up as `(x, pivot - x)` and positions
+        # `pivot + 1...index_count - 1` as `(x, pivot + index_count - x)`, so
+        # each of the two ranges is mirrored onto itself.
+        result[: pivot + 1] = _swap_or_not_segment(
+            result[: pivot + 1], bits[: pivot + 1]
+        )
+        result[pivot + 1 :] = _swap_or_not_segment(
+            result[pivot + 1 :], bits[pivot + 1 : index_count]
+        )
+
+    return tuple(result)
+
+
+# Maps ``(seed, indices_root, shuffle_round_count)`` to the shuffled indices
+_shuffling_cache = LRU(SHUFFLING_CACHE_SIZE)
+
+
+def _get_indices_root(indices: Sequence[ValidatorIndex]) -> Hash32:
+    return hash_eth2(array("Q", indices).tobytes())
+
+
+def get_shuffled_indices(
+    indices: Sequence[ValidatorIndex], seed: Hash32, shuffle_round_count: int
+) -> Tuple[ValidatorIndex, ...]:
+    """
+    Return ``compute_shuffled_indices(indices, seed, shuffle_round_count)``,
+    serving the committees of an epoch from a single shuffle of the active
+    validator indices.
+    """
+    key = (seed, _get_indices_root(indices), shuffle_round_count)
+    try:
+        return _shuffling_cache[key]
+    except KeyError:
+        shuffled_indices = compute_shuffled_indices(indices, seed, shuffle_round_count)
+        _shuffling_cache[key] = shuffled_indices
+        return shuffled_indices
+
+
 def _compute_committee(
     indices: Sequence[ValidatorIndex],
     seed: Hash32,
@@ -228,11 +322,7 @@ def _compute_committee(
 ) -> Iterable[ValidatorIndex]:
     start = (len(indices) * index) // count
     end = (len(indices) * (index + 1)) // count
-    for i in range(start, end):
-        shuffled_index = compute_shuffled_index(
-            i, len(indices), seed, shuffle_round_count
-        )
-        yield indices[shuffled_index]
+    return get_shuffled_indices(indices, seed, shuffle_round_count)[start:end]
 
 
 @to_tuple
@@ -16,6 +16,31 @@ ZERO_TIMESTAMP = Timestamp(0)
 
 MAX_INDEX_COUNT = 2 ** 40
 
+# Number of whole-list shufflings of active validator indices to keep; enough
+# to serve the previous, current and next epoch across a few competing forks.
+SHUFFLING_CACHE_SIZE = 16
+
+# Number of (validator registry, epoch) pairs whose active validator indices, and whose
+# total active balance, are remembered; a registry is replaced whenever a validator is
+# updated, so this covers the registries a few states of the recent epochs go through.
+REGISTRY_EPOCH_CACHE_SIZE = 32
+
+# Number of recently persisted states kept in memory by the chain database.
+RECENT_STATES_CACHE_SIZE = 8
+
+# Number of states advanced to the slot of a block yet to be applied on top of them,
+# kept by the chain; enough for the current and next slot on a few competing heads.
+PRE_STATES_CACHE_SIZE = 8
+
+# Number of valid signatures remembered by ``Eth2BLS``; enough for the attestations
+# gossiped over a couple of epochs.
+VERIFIED_SIGNATURES_CACHE_SIZE = 2 ** 14
+
+# Number of aggregate public keys of (the participants of) committees remembered by
+# ``Eth2BLS``, and of public keys kept decompressed by the backends which need them.
+AGGREGATE_PUBKEYS_CACHE_SIZE = 2 ** 12
+DECOMPRESSED_PUBKEYS_CACHE_SIZE = 2 ** 16
+
 MAX_RANDOM_BYTE = 2 ** 8 - 1
 
 BASE_REWARDS_PER_EPOCH = 5
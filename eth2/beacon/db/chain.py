@@ -1,16 +1,18 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 import functools
-from typing import Iterable, Optional, Tuple, Type, cast
+from typing import Iterable, Optional, Sequence, Tuple, Type, Union, cast
 
 from cytoolz import concat, first, sliding_window
 from eth.abc import AtomicDatabaseAPI, DatabaseAPI
 from eth.exceptions import BlockNotFound, CanonicalHeadNotFound, ParentNotFound
 from eth.validation import validate_word
-from eth_typing import Hash32
+from eth_typing import BLSPubkey, Hash32
 from eth_utils import ValidationError, encode_hex, to_tuple
 import ssz
 
-from eth2.beacon.constants import ZERO_SIGNING_ROOT
+from eth2._utils.ssz import SSZView
+from eth2.beacon.constants import RECENT_STATES_CACHE_SIZE, ZERO_SIGNING_ROOT
 from eth2.beacon.db.exceptions import (
     AttestationRootNotFound,
     FinalizedHeadNotFound,
@@ -18,13 +20,19 @@ from eth2.beacon.db.exceptions import (
     JustifiedHeadNotFound,
     MissingForkChoiceScoringFns,
     StateNotFound,
+    ValidatorIndexNotFound,
 )
 from eth2.beacon.db.schema import SchemaV1
+from eth2.beacon.db.state_diffs import (
+    apply_state_diff,
+    decode_state_diff,
+    encode_state_diff,
+)
 from eth2.beacon.fork_choice.scoring import ScoringFn as ForkChoiceScoringFn
-from eth2.beacon.helpers import compute_epoch_of_slot
+from eth2.beacon.helpers import compute_epoch_of_slot, compute_start_slot_of_epoch
 from eth2.beacon.types.blocks import BaseBeaconBlock, BeaconBlock  # noqa: F401
 from eth2.beacon.types.states import BeaconState  # noqa: F401
-from eth2.beacon.typing import Epoch, HashTreeRoot, SigningRoot, Slot
+from eth2.beacon.typing import Epoch, HashTreeRoot, SigningRoot, Slot, ValidatorIndex
 from eth2.configs import Eth2GenesisConfig
 
 
@@ -32,6 +40,10 @@ class AttestationKey(ssz.Serializable):
     fields = [("block_root", ssz.sedes.bytes32), ("index", ssz.sedes.uint8)]
 
 
+# The roots of all the states persisted at a slot, canonical or not
+StateRootsSedes = ssz.sedes.List(ssz.sedes.bytes32, 2 ** 32)
+
+
 class BaseBeaconChainDB(ABC):
     db: AtomicDatabaseAPI = None
 
@@ -67,6 +79,12 @@ class BaseBeaconChainDB(ABC):
     ) -> BaseBeaconBlock:
         pass
 
+    @abstractmethod
+    def get_canonical_block_ssz_by_slot_range(
+        self, start_slot: Slot, count: int, step: int = 1
+    ) -> Tuple[bytes, ...]:
+        pass
+
     @abstractmethod
     def get_canonical_head(self, block_class: Type[BaseBeaconBlock]) -> BaseBeaconBlock:
         pass
@@ -89,6 +107,16 @@ class BaseBeaconChainDB(ABC):
     ) -> BaseBeaconBlock:
         pass
 
+    @abstractmethod
+    def get_block_ssz_by_root(self, block_root: SigningRoot) -> bytes:
+        pass
+
+    @abstractmethod
+    def get_ancestor_block_ssz_by_slots(
+        self, block_root: SigningRoot, slots: Sequence[Slot]
+    ) -> Tuple[bytes, ...]:
+        pass
+
     @abstractmethod
     def get_slot_by_root(self, block_root: SigningRoot) -> Slot:
         pass
@@ -137,10 +165,27 @@ class BaseBeaconChainDB(ABC):
     ) -> BeaconState:
         pass
 
+    @abstractmethod
+    def get_state_view_by_root(
+        self, state_root: Hash32, state_class: Type[BeaconState]
+    ) -> Union[BeaconState, SSZView]:
+        pass
+
     @abstractmethod
     def persist_state(self, state: BeaconState) -> None:
         pass
 
+    #
+    # Validator API
+    #
+    @abstractmethod
+    def index_validators(self, state: BeaconState) -> None:
+        pass
+
+    @abstractmethod
+    def get_validator_index_by_pubkey(self, pubkey: BLSPubkey) -> ValidatorIndex:
+        pass
+
     #
     # Attestation API
     #
@@ -176,6 +221,10 @@ class BeaconChainDB(BaseBeaconChainDB):
         self._finalized_root = self._get_finalized_root_if_present(db)
         self._highest_justified_epoch = self._get_highest_justified_epoch(db)
 
+        # Recently persisted or loaded states. The persisted ones carry the Merkle
+        # caches that make hashing the states derived from them cheap.
+        self._recent_states: "OrderedDict[Hash32, BeaconState]" = OrderedDict()
+
     def _get_finalized_root_if_present(self, db: DatabaseAPI) -> SigningRoot:
         try:
             return self._get_finalized_head_root(db)
@@ -270,6 +319,31 @@ class BeaconChainDB(BaseBeaconChainDB):
         canonical_block_root = cls._get_canonical_block_root(db, slot)
         return cls._get_block_by_root(db, canonical_block_root, block_class)
 
+    def get_canonical_block_ssz_by_slot_range(
+        self, start_slot: Slot, count: int, step: int = 1
+    ) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encoding of the canonical blocks at ``count`` slots from
+        ``start_slot``, ``step`` slots apart. The skipped slots are left out.
+
+        The blocks are not decoded, for the callers which only send them over.
+        """
+        return self._get_canonical_block_ssz_by_slot_range(
+            self.db, start_slot, count, step
+        )
+
+    @classmethod
+    @to_tuple
+    def _get_canonical_block_ssz_by_slot_range(
+        cls, db: DatabaseAPI, start_slot: Slot, count: int, step: int
+    ) -> Iterable[bytes]:
+        for slot in range(start_slot, start_slot + count * step, step):
+            try:
+                canonical_block_root = cls._get_canonical_block_root(db, Slot(slot))
+            except BlockNotFound:
+                continue
+            yield cls._get_block_ssz_by_root(db, canonical_block_root)
+
     def get_canonical_head(self, block_class: Type[BaseBeaconBlock]) -> BaseBeaconBlock:
         """
         Return the current block at the head of the chain.
@@ -344,23 +418,76 @@ class BeaconChainDB(BaseBeaconChainDB):
     ) -> BaseBeaconBlock:
         return self._get_block_by_root(self.db, block_root, block_class)
 
-    @staticmethod
+    @classmethod
     def _get_block_by_root(
-        db: DatabaseAPI, block_root: SigningRoot, block_class: Type[BaseBeaconBlock]
+        cls,
+        db: DatabaseAPI,
+        block_root: SigningRoot,
+        block_class: Type[BaseBeaconBlock],
     ) -> BaseBeaconBlock:
         """
         Return the requested block header as specified by block root.
 
         Raise BlockNotFound if it is not present in the db.
         """
+        block_ssz = cls._get_block_ssz_by_root(db, block_root)
+        return _decode_block(block_ssz, block_class)
+
+    def get_block_ssz_by_root(self, block_root: SigningRoot) -> bytes:
+        """
+        Return the SSZ encoding of the block with the given signing root.
+
+        Raise BlockNotFound if it is not present in the db.
+        """
+        return self._get_block_ssz_by_root(self.db, block_root)
+
+    @staticmethod
+    def _get_block_ssz_by_root(db: DatabaseAPI, block_root: SigningRoot) -> bytes:
         validate_word(block_root, title="block root")
         try:
-            block_ssz = db[block_root]
+            return db[block_root]
         except KeyError:
             raise BlockNotFound(
                 "No block with signing root {0} found".format(encode_hex(block_root))
             )
-        return _decode_block(block_ssz, block_class)
+
+    def get_ancestor_block_ssz_by_slots(
+        self, block_root: SigningRoot, slots: Sequence[Slot]
+    ) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encoding of the blocks at ``slots`` on the chain ending with the
+        block ``block_root``, in the order of ``slots`` which must be increasing.
+        The skipped slots are left out.
+
+        The chain is walked back through the parent roots read from the encoded blocks,
+        without decoding them.
+        """
+        return self._get_ancestor_block_ssz_by_slots(self.db, block_root, slots)
+
+    @classmethod
+    def _get_ancestor_block_ssz_by_slots(
+        cls, db: DatabaseAPI, block_root: SigningRoot, slots: Sequence[Slot]
+    ) -> Tuple[bytes, ...]:
+        if len(slots) == 0:
+            return ()
+
+        requested_slots = set(slots)
+        ancestors_ssz = []
+        while True:
+            try:
+                block_ssz = cls._get_block_ssz_by_root(db, block_root)
+            except BlockNotFound:
+                # We only persist a block if its ancestors are also in the database,
+                # so this is the genesis block's parent
+                break
+            slot = _get_slot_from_block_ssz(block_ssz)
+            if slot in requested_slots:
+                ancestors_ssz.append(block_ssz)
+            if slot <= slots[0]:
+                break
+            block_root = _get_parent_root_from_block_ssz(block_ssz)
+
+        return tuple(reversed(ancestors_ssz))
 
     def get_slot_by_root(self, block_root: SigningRoot) -> Slot:
         """
@@ -470,9 +597,7 @@ class BeaconChainDB(BaseBeaconChainDB):
             return tuple(), tuple()
 
         try:
-            previous_canonical_head = cls._get_canonical_head(
-                db, block_class
-            ).signing_root
+            previous_canonical_head = cls._get_canonical_head_root(db)
             head_score = cls._get_score(db, previous_canonical_head)
         except CanonicalHeadNotFound:
             no_canonical_head = True
@@ -599,12 +724,12 @@ class BeaconChainDB(BaseBeaconChainDB):
         """
         while True:
             try:
-                orig = cls._get_canonical_block_by_slot(db, block.slot, block_class)
+                orig_root = cls._get_canonical_block_root(db, block.slot)
             except BlockNotFound:
                 # This just means the block is not on the canonical chain.
                 pass
             else:
-                if orig.signing_root == block.signing_root:
+                if orig_root == block.signing_root:
                     # Found the common ancestor, stop.
                     break
 
@@ -665,6 +790,26 @@ class BeaconChainDB(BaseBeaconChainDB):
         slot_to_state_root_key = SchemaV1.make_slot_to_state_root_lookup_key(slot)
         self.db.set(slot_to_state_root_key, state_root)
 
+    def _add_slot_to_state_roots_lookup(self, slot: Slot, state_root: Hash32) -> None:
+        """
+        Add ``state_root`` to the roots of all the states persisted at ``slot``,
+        which are used to prune the non-canonical ones once finalized.
+        """
+        state_roots = self._get_state_roots_by_slot(self.db, slot)
+        if state_root not in state_roots:
+            self.db.set(
+                SchemaV1.make_slot_to_state_roots_lookup_key(slot),
+                ssz.encode(state_roots + (state_root,), sedes=StateRootsSedes),
+            )
+
+    @staticmethod
+    def _get_state_roots_by_slot(db: DatabaseAPI, slot: Slot) -> Tuple[Hash32, ...]:
+        try:
+            encoded_state_roots = db[SchemaV1.make_slot_to_state_roots_lookup_key(slot)]
+        except KeyError:
+            return ()
+        return ssz.decode(encoded_state_roots, sedes=StateRootsSedes)
+
     def get_head_state_slot(self) -> Slot:
         return self._get_head_state_slot(self.db)
 
@@ -700,23 +845,73 @@ class BeaconChainDB(BaseBeaconChainDB):
     def get_state_by_root(
         self, state_root: Hash32, state_class: Type[BeaconState]
     ) -> BeaconState:
-        return self._get_state_by_root(self.db, state_root, state_class)
+        if state_root in self._recent_states:
+            self._recent_states.move_to_end(state_root)
+            state = self._recent_states[state_root]
+            if isinstance(state, state_class):
+                return state
+
+        state_diff_key = SchemaV1.make_state_diff_lookup_key(HashTreeRoot(state_root))
+        if self.db.exists(state_diff_key):
+            state_diff = decode_state_diff(self.db[state_diff_key], state_class)
+            base_state = self.get_state_by_root(state_diff.base_root, state_class)
+            state = apply_state_diff(base_state, state_diff)
+        else:
+            state = self._get_state_by_root(self.db, state_root, state_class)
 
-    @staticmethod
+        self._add_recent_state(state_root, state)
+        return state
+
+    @classmethod
     def _get_state_by_root(
-        db: DatabaseAPI, state_root: Hash32, state_class: Type[BeaconState]
+        cls, db: DatabaseAPI, state_root: Hash32, state_class: Type[BeaconState]
     ) -> BeaconState:
         """
         Return the requested beacon state as specified by state hash.
 
         Raises StateNotFound if it is not present in the db.
         """
+        state_ssz = cls._get_state_ssz_by_root(db, state_root)
+        return _decode_state(state_ssz, state_class)
+
+    @staticmethod
+    def _get_state_ssz_by_root(db: DatabaseAPI, state_root: Hash32) -> bytes:
         # TODO: validate_state_root
         try:
-            state_ssz = db[state_root]
+            return db[state_root]
         except KeyError:
             raise StateNotFound(f"No state with root {encode_hex(state_root)} found")
-        return _decode_state(state_ssz, state_class)
+
+    def get_state_view_by_root(
+        self, state_root: Hash32, state_class: Type[BeaconState]
+    ) -> Union[BeaconState, SSZView]:
+        """
+        Return a read-only view of the state with the given root, which only decodes the
+        fields that are accessed, for lookups like the finalized checkpoint which don't
+        need the whole state.
+
+        Recent states are returned as they are, as well as the states stored as a diff,
+        since their base state has to be decoded anyway.
+        """
+        if state_root in self._recent_states:
+            self._recent_states.move_to_end(state_root)
+            state = self._recent_states[state_root]
+            if isinstance(state, state_class):
+                return state
+
+        if self.db.exists(
+            SchemaV1.make_state_diff_lookup_key(HashTreeRoot(state_root))
+        ):
+            return self.get_state_by_root(state_root, state_class)
+
+        state_ssz = self._get_state_ssz_by_root(self.db, state_root)
+        return SSZView(state_class, state_ssz)
+
+    def _add_recent_state(self, state_root: Hash32, state: BeaconState) -> None:
+        self._recent_states[state_root] = state
+        self._recent_states.move_to_end(state_root)
+        if len(self._recent_states) > RECENT_STATES_CACHE_SIZE:
+            self._recent_states.popitem(last=False)
 
     def persist_state(self, state: BeaconState) -> None:
         """
@@ -727,8 +922,26 @@ class BeaconChainDB(BaseBeaconChainDB):
         return self._persist_state(state)
 
     def _persist_state(self, state: BeaconState) -> None:
-        self.db.set(state.hash_tree_root, ssz.encode(state))
-        self._add_slot_to_state_root_lookup(state.slot, state.hash_tree_root)
+        state_root = state.hash_tree_root
+        is_persisted = self.db.exists(state_root) or self.db.exists(
+            SchemaV1.make_state_diff_lookup_key(HashTreeRoot(state_root))
+        )
+        if not is_persisted:
+            snapshot_root = self._find_snapshot_root(state)
+            if snapshot_root is None:
+                self.db.set(state_root, ssz.encode(state))
+            else:
+                snapshot = self.get_state_by_root(snapshot_root, type(state))
+                self.db.set(
+                    SchemaV1.make_state_diff_lookup_key(HashTreeRoot(state_root)),
+                    encode_state_diff(snapshot_root, snapshot, state),
+                )
+
+        self._add_slot_to_state_root_lookup(state.slot, state_root)
+        self._add_slot_to_state_roots_lookup(state.slot, state_root)
+        self._add_recent_state(state_root, state)
+
+        self.index_validators(state)
 
         self._persist_finalized_head(state)
         self._persist_justified_head(state)
@@ -743,6 +956,89 @@ class BeaconChainDB(BaseBeaconChainDB):
             if state.slot > head_state_slot:
                 self._add_head_state_slot_lookup(state.slot)
 
+    def _find_snapshot_root(self, state: BeaconState) -> Optional[Hash32]:
+        """
+        Return the root of the full snapshot, persisted earlier in the same epoch, that
+        ``state`` should be stored as a diff against, or ``None`` if ``state`` should be
+        stored as a full snapshot, which is the case for the first state of every epoch.
+        """
+        history_length = len(state.state_roots)
+        epoch_start_slot = compute_start_slot_of_epoch(
+            compute_epoch_of_slot(state.slot, self.genesis_config.SLOTS_PER_EPOCH),
+            self.genesis_config.SLOTS_PER_EPOCH,
+        )
+        for slot in range(
+            max(epoch_start_slot, state.slot - history_length), state.slot
+        ):
+            # ``state_roots`` holds the roots of the ancestors of ``state``, which are
+            # the states we persisted for the slots which had a block.
+            ancestor_root = state.state_roots[slot % history_length]
+            if self.db.exists(ancestor_root):
+                return ancestor_root
+        return None
+
+    def _prune_states(self, state: BeaconState) -> None:
+        """
+        Delete the states persisted before the finalized epoch of ``state`` which are not
+        its ancestors, as their forks can no longer become canonical.
+
+        Only the slots covered by ``state.state_roots`` can be checked; states on forks
+        which were abandoned further back are kept.
+        """
+        history_length = len(state.state_roots)
+        finalized_slot = compute_start_slot_of_epoch(
+            state.finalized_checkpoint.epoch, self.genesis_config.SLOTS_PER_EPOCH
+        )
+        try:
+            pruned_slot = ssz.decode(
+                self.db[SchemaV1.make_states_pruned_slot_lookup_key()],
+                sedes=ssz.sedes.uint64,
+            )
+        except KeyError:
+            pruned_slot = 0
+
+        with self.db.atomic_batch() as db:
+            for slot in range(
+                max(pruned_slot, state.slot - history_length), finalized_slot
+            ):
+                canonical_root = state.state_roots[slot % history_length]
+                state_roots = self._get_state_roots_by_slot(db, Slot(slot))
+                non_canonical_roots = tuple(
+                    state_root
+                    for state_root in state_roots
+                    if state_root != canonical_root
+                )
+                if not non_canonical_roots:
+                    continue
+
+                for state_root in non_canonical_roots:
+                    db.delete(state_root)
+                    db.delete(
+                        SchemaV1.make_state_diff_lookup_key(HashTreeRoot(state_root))
+                    )
+                    self._recent_states.pop(state_root, None)
+
+                slot_to_state_root_key = SchemaV1.make_slot_to_state_root_lookup_key(
+                    slot
+                )
+                slot_to_state_roots_key = SchemaV1.make_slot_to_state_roots_lookup_key(
+                    slot
+                )
+                if canonical_root in state_roots:
+                    db.set(slot_to_state_root_key, canonical_root)
+                    db.set(
+                        slot_to_state_roots_key,
+                        ssz.encode((canonical_root,), sedes=StateRootsSedes),
+                    )
+                else:
+                    db.delete(slot_to_state_root_key)
+                    db.delete(slot_to_state_roots_key)
+
+            db.set(
+                SchemaV1.make_states_pruned_slot_lookup_key(),
+                ssz.encode(max(pruned_slot, finalized_slot), sedes=ssz.sedes.uint64),
+            )
+
     def _update_finalized_head(self, finalized_root: SigningRoot) -> None:
         """
         Unconditionally write the ``finalized_root`` as the root of the currently
@@ -763,6 +1059,7 @@ class BeaconChainDB(BaseBeaconChainDB):
 
         if state.finalized_checkpoint.root != self._finalized_root:
             self._update_finalized_head(state.finalized_checkpoint.root)
+            self._prune_states(state)
 
     def _update_justified_head(self, justified_root: SigningRoot, epoch: Epoch) -> None:
         """
@@ -817,6 +1114,58 @@ class BeaconChainDB(BaseBeaconChainDB):
         self._update_finalized_head(genesis_root)
         self._update_justified_head(genesis_root, self.genesis_config.GENESIS_EPOCH)
 
+    #
+    # Validator API
+    #
+    def _get_validator_count(self) -> int:
+        try:
+            encoded_count = self.db[SchemaV1.make_validator_count_lookup_key()]
+        except KeyError:
+            return 0
+        return ssz.decode(encoded_count, sedes=ssz.sedes.uint64)
+
+    def index_validators(self, state: BeaconState) -> None:
+        """
+        Index the validators of ``state`` which were not indexed yet by their public key.
+
+        Validators are only ever appended to the registry, in the order of the deposits,
+        so only the ones beyond the count of validators indexed so far are new, whichever
+        chain ``state`` is on. Databases written before validators were indexed have a
+        count of zero, so all validators of ``state`` get indexed then.
+        """
+        validator_count = self._get_validator_count()
+        if len(state.validators) <= validator_count:
+            return
+
+        for index in range(validator_count, len(state.validators)):
+            pubkey_to_index_key = SchemaV1.make_validator_pubkey_to_index_lookup_key(
+                state.validators[index].pubkey
+            )
+            if not self.db.exists(pubkey_to_index_key):
+                self.db.set(
+                    pubkey_to_index_key, ssz.encode(index, sedes=ssz.sedes.uint64)
+                )
+        self.db.set(
+            SchemaV1.make_validator_count_lookup_key(),
+            ssz.encode(len(state.validators), sedes=ssz.sedes.uint64),
+        )
+
+    def get_validator_index_by_pubkey(self, pubkey: BLSPubkey) -> ValidatorIndex:
+        """
+        Return the index of the validator with the given public key.
+
+        Raise ``ValidatorIndexNotFound`` if no persisted state has such a validator.
+        """
+        try:
+            encoded_index = self.db[
+                SchemaV1.make_validator_pubkey_to_index_lookup_key(pubkey)
+            ]
+        except KeyError:
+            raise ValidatorIndexNotFound(
+                f"No validator with public key {encode_hex(pubkey)} found"
+            )
+        return ValidatorIndex(ssz.decode(encoded_index, sedes=ssz.sedes.uint64))
+
     #
     # Attestation API
     #
@@ -877,6 +1226,16 @@ class BeaconChainDB(BaseBeaconChainDB):
         return self.db[key]
 
 
+# ``slot`` and ``parent_root`` are the leading fixed-size fields of every block class,
+# so they can be read from the encoding of a block without decoding it.
+def _get_slot_from_block_ssz(block_ssz: bytes) -> Slot:
+    return Slot(int.from_bytes(block_ssz[:8], "little"))
+
+
+def _get_parent_root_from_block_ssz(block_ssz: bytes) -> SigningRoot:
+    return SigningRoot(Hash32(block_ssz[8:40]))
+
+
 # When performing a chain sync (either fast or regular modes), we'll very often need to look
 # up recent blocks to validate the chain, and decoding their SSZ representation is
 # relatively expensive so we cache that here, but use a small cache because we *should* only
@@ -886,6 +1245,6 @@ def _decode_block(block_ssz: bytes, sedes: Type[BaseBeaconBlock]) -> BaseBeaconB
     return ssz.decode(block_ssz, sedes=sedes)
 
 
-@functools.lru_cache(128)
+# Decoded states are cached by ``BeaconChainDB`` itself, keyed by root.
 def _decode_state(state_ssz: bytes, state_class: Type[BeaconState]) -> BeaconState:
     return ssz.decode(state_ssz, sedes=state_class)
@@ -46,6 +46,14 @@ class AttestationRootNotFound(BeaconDBException):
     pass
 
 
+class ValidatorIndexNotFound(BeaconDBException):
+    """
+    Exception raised if no validator with the given public key is in this database.
+    """
+
+    pass
+
+
 class MissingForkChoiceScoringFns(BeaconDBException):
     """
     Exception raised if a client tries to score a block without providing
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from eth_typing import BLSPubkey
+
 from eth2.beacon.constants import HashTreeRoot, SigningRoot
 
 
@@ -17,6 +19,31 @@ class BaseSchema(ABC):
     def make_slot_to_state_root_lookup_key(slot: int) -> bytes:
         ...
 
+    @staticmethod
+    @abstractmethod
+    def make_slot_to_state_roots_lookup_key(slot: int) -> bytes:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_state_diff_lookup_key(state_root: HashTreeRoot) -> bytes:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_states_pruned_slot_lookup_key() -> bytes:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_validator_pubkey_to_index_lookup_key(pubkey: BLSPubkey) -> bytes:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_validator_count_lookup_key() -> bytes:
+        ...
+
     #
     # Block
     #
@@ -80,6 +107,26 @@ class SchemaV1(BaseSchema):
     def make_slot_to_state_root_lookup_key(slot: int) -> bytes:
         return b"v1:beacon:slot-to-state-root%d" % slot
 
+    @staticmethod
+    def make_slot_to_state_roots_lookup_key(slot: int) -> bytes:
+        return b"v1:beacon:slot-to-state-roots:%d" % slot
+
+    @staticmethod
+    def make_state_diff_lookup_key(state_root: HashTreeRoot) -> bytes:
+        return b"v1:beacon:state-diff:%s" % state_root
+
+    @staticmethod
+    def make_states_pruned_slot_lookup_key() -> bytes:
+        return b"v1:beacon:states-pruned-slot"
+
+    @staticmethod
+    def make_validator_pubkey_to_index_lookup_key(pubkey: BLSPubkey) -> bytes:
+        return b"v1:beacon:validator-pubkey-to-index:%s" % pubkey
+
+    @staticmethod
+    def make_validator_count_lookup_key() -> bytes:
+        return b"v1:beacon:validator-count"
+
     #
     # Block
     #
@@ -0,0 +1,121 @@
+import functools
+from typing import Any, Dict, Iterable, NamedTuple, Sequence, Tuple, Type
+
+from eth_typing import Hash32
+from eth_utils import to_tuple
+import ssz
+from ssz.sedes import Container, List, Vector, bytes32, uint64
+
+from eth2.beacon.types.states import BeaconState
+
+# Only used to (de)serialize diffs, which are never hashed
+MAX_DIFF_LENGTH = 2 ** 40
+
+
+class StateDiff(NamedTuple):
+    """
+    The fields of a state which differ from those of an earlier state on the same chain.
+
+    ``field_diffs`` has one entry per field of the state: an empty tuple if the field is
+    unchanged, a 1-tuple with the new value for fields which aren't sequences, and a 1-tuple
+    with ``(length, indices, elements)`` for lists and vectors, where only the elements
+    which changed are included.
+    """
+
+    base_root: Hash32
+    field_diffs: Tuple[Tuple[Any, ...], ...]
+
+
+def _is_sequence_sedes(sedes: Any) -> bool:
+    return isinstance(sedes, (List, Vector))
+
+
+@functools.lru_cache()
+def _get_state_diff_sedes(state_class: Type[BeaconState]) -> Container:
+    field_diff_sedes = tuple(
+        List(
+            Container(
+                (
+                    uint64,
+                    List(uint64, MAX_DIFF_LENGTH),
+                    List(sedes.element_sedes, MAX_DIFF_LENGTH),
+                )
+            ),
+            1,
+        )
+        if _is_sequence_sedes(sedes)
+        else List(sedes, 1)
+        for _, sedes in state_class._meta.fields
+    )
+    return Container((bytes32,) + field_diff_sedes)
+
+
+@to_tuple
+def _get_changed_indices(
+    base_value: Sequence[Any], value: Sequence[Any]
+) -> Iterable[int]:
+    for index, (base_element, element) in enumerate(zip(base_value, value)):
+        if base_element is not element and base_element != element:
+            yield index
+    yield from range(len(base_value), len(value))
+
+
+@to_tuple
+def _get_field_diffs(
+    base_state: BeaconState, state: BeaconState
+) -> Iterable[Tuple[Any, ...]]:
+    for (_, sedes), base_value, value in zip(state._meta.fields, base_state, state):
+        if base_value is value:
+            yield ()
+        elif _is_sequence_sedes(sedes):
+            indices = _get_changed_indices(base_value, value)
+            if indices or len(base_value) != len(value):
+                elements = tuple(value[index] for index in indices)
+                yield ((len(value), indices, elements),)
+            else:
+                yield ()
+        elif base_value == value:
+            yield ()
+        else:
+            yield (value,)
+
+
+def encode_state_diff(
+    base_root: Hash32, base_state: BeaconState, state: BeaconState
+) -> bytes:
+    """
+    Encode the difference between ``state`` and ``base_state``, an earlier state on the
+    same chain whose root is ``base_root``.
+    """
+    state_diff: Tuple[Any, ...] = (base_root, *_get_field_diffs(base_state, state))
+    return ssz.encode(state_diff, sedes=_get_state_diff_sedes(type(state)))
+
+
+def decode_state_diff(encoded: bytes, state_class: Type[BeaconState]) -> StateDiff:
+    base_root, *field_diffs = ssz.decode(
+        encoded, sedes=_get_state_diff_sedes(state_class)
+    )
+    return StateDiff(base_root, tuple(field_diffs))
+
+
+def apply_state_diff(base_state: BeaconState, state_diff: StateDiff) -> BeaconState:
+    """
+    Rebuild a state from the state it was diffed against.
+    """
+    changed_fields: Dict[str, Any] = {}
+    for (field_name, sedes), base_value, field_diff in zip(
+        base_state._meta.fields, base_state, state_diff.field_diffs
+    ):
+        if not field_diff:
+            continue
+        elif _is_sequence_sedes(sedes):
+            ((length, indices, elements),) = field_diff
+            value = list(base_value[:length])
+            value.extend([None] * (length - len(value)))
+            for index, element in zip(indices, elements):
+                value[index] = element
+            changed_fields[field_name] = tuple(value)
+        else:
+            (changed_fields[field_name],) = field_diff
+
+    return base_state.copy(**changed_fields)
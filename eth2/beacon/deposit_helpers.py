@@ -4,12 +4,11 @@ from eth2._utils.bls import bls
 from eth2._utils.merkle.common import verify_merkle_branch
 from eth2.beacon.constants import DEPOSIT_CONTRACT_TREE_DEPTH
 from eth2.beacon.epoch_processing_helpers import increase_balance
-from eth2.beacon.helpers import compute_domain
+from eth2.beacon.helpers import compute_domain, get_validator_index_by_pubkey
 from eth2.beacon.signature_domain import SignatureDomain
 from eth2.beacon.types.deposits import Deposit
 from eth2.beacon.types.states import BeaconState
 from eth2.beacon.types.validators import Validator
-from eth2.beacon.typing import ValidatorIndex
 from eth2.configs import Eth2Config
 
 
@@ -52,8 +51,8 @@ def process_deposit(
 
     pubkey = deposit.data.pubkey
     amount = deposit.data.amount
-    validator_pubkeys = tuple(v.pubkey for v in state.validators)
-    if pubkey not in validator_pubkeys:
+    index = get_validator_index_by_pubkey(state.validators, pubkey)
+    if index is None:
         # Verify the deposit signature (proof of possession) for new validators.
         # Note: The deposit contract does not check signatures.
         # Note: Deposits are valid across forks, thus the deposit domain
@@ -77,5 +76,4 @@ def process_deposit(
             balances=state.balances + (amount,),
         )
     else:
-        index = ValidatorIndex(validator_pubkeys.index(pubkey))
         return increase_balance(state, index, amount)
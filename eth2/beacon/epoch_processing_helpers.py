@@ -3,18 +3,20 @@ from typing import Iterable, Sequence, Set, Tuple
 from eth_typing import Hash32
 from eth_utils import ValidationError, to_tuple
 from eth_utils.toolz import curry, groupby, thread_first
+from lru import LRU
 
 from eth2._utils.bitfield import Bitfield, has_voted
 from eth2._utils.numeric import integer_squareroot
 from eth2._utils.tuple import update_tuple_item_with_fn
 from eth2.beacon.attestation_helpers import get_attestation_data_slot
 from eth2.beacon.committee_helpers import get_crosslink_committee
-from eth2.beacon.constants import BASE_REWARDS_PER_EPOCH
+from eth2.beacon.constants import BASE_REWARDS_PER_EPOCH, REGISTRY_EPOCH_CACHE_SIZE
 from eth2.beacon.exceptions import InvalidEpochError
 from eth2.beacon.helpers import (
     get_active_validator_indices,
     get_block_root,
     get_block_root_at_slot,
+    get_cached_for_registry,
     get_total_balance,
 )
 from eth2.beacon.types.attestation_data import AttestationData
@@ -110,12 +112,26 @@ def get_validator_churn_limit(state: BeaconState, config: Eth2Config) -> int:
     )
 
 
+# Maps ``(id(validators), epoch)`` to ``validators`` and its total active balance
+_total_active_balance_cache = LRU(REGISTRY_EPOCH_CACHE_SIZE)
+
+
 def get_total_active_balance(state: BeaconState, config: Eth2Config) -> Gwei:
     current_epoch = state.current_epoch(config.SLOTS_PER_EPOCH)
-    active_validator_indices = get_active_validator_indices(
-        state.validators, current_epoch
+
+    def _compute_total_active_balance() -> Gwei:
+        active_validator_indices = get_active_validator_indices(
+            state.validators, current_epoch
+        )
+        return get_total_balance(state, set(active_validator_indices))
+
+    # The effective balances are part of the registry
+    return get_cached_for_registry(
+        _total_active_balance_cache,
+        state.validators,
+        current_epoch,
+        _compute_total_active_balance,
     )
-    return get_total_balance(state, set(active_validator_indices))
 
 
 def get_matching_source_attestations(
@@ -280,3 +296,22 @@ def get_base_reward(
         // integer_squareroot(total_balance)
         // BASE_REWARDS_PER_EPOCH
     )
+
+
+def get_base_rewards(
+    state: BeaconState, total_active_balance: Gwei, config: Eth2Config
+) -> Tuple[Gwei, ...]:
+    """
+    Return the base reward of every validator, i.e. ``get_base_reward`` for all
+    indices, computing the (expensive) total active balance only once.
+    """
+    sqrt_total_balance = integer_squareroot(total_active_balance)
+    return tuple(
+        Gwei(
+            validator.effective_balance
+            * config.BASE_REWARD_FACTOR
+            // sqrt_total_balance
+            // BASE_REWARDS_PER_EPOCH
+        )
+        for validator in state.validators
+    )
@@ -1,19 +1,32 @@
 from typing import Dict, Iterable, Optional, Sequence, Tuple, Type, Union
 
+from eth_typing import Hash32
 from eth_utils import to_tuple
 from eth_utils.toolz import curry, first, mapcat, merge, merge_with, second, valmap
 
 from eth2.beacon.attestation_helpers import get_attestation_data_slot
 from eth2.beacon.db.chain import BeaconChainDB
 from eth2.beacon.epoch_processing_helpers import get_attesting_indices
-from eth2.beacon.helpers import compute_epoch_of_slot, get_active_validator_indices
+from eth2.beacon.fork_choice.proto_array import ProtoArrayForkChoice
+from eth2.beacon.helpers import (
+    compute_epoch_of_slot,
+    compute_start_slot_of_epoch,
+    get_active_validator_indices,
+)
 from eth2.beacon.operations.attestation_pool import AttestationPool
 from eth2.beacon.types.attestation_data import AttestationData
 from eth2.beacon.types.attestations import Attestation
 from eth2.beacon.types.blocks import BaseBeaconBlock
 from eth2.beacon.types.pending_attestations import PendingAttestation
 from eth2.beacon.types.states import BeaconState
-from eth2.beacon.typing import Gwei, SigningRoot, Slot, ValidatorIndex
+from eth2.beacon.typing import (
+    Epoch,
+    Gwei,
+    HashTreeRoot,
+    SigningRoot,
+    Slot,
+    ValidatorIndex,
+)
 from eth2.configs import CommitteeConfig, Eth2Config
 
 # TODO(ralexstokes) integrate `AttestationPool` once it has been merged
@@ -219,3 +232,165 @@ def lmd_ghost_scoring(
     block_root_score = score_block_by_root(block)
 
     return attestation_score + block_root_score
+
+
+class ProtoArrayStore:
+    """
+    Keep a :class:`~eth2.beacon.fork_choice.proto_array.ProtoArrayForkChoice` in sync with
+    the blocks in the database, the attestations in the justified state and the pool and the
+    balances of the justified state, so that blocks are scored by the same rule as
+    :func:`lmd_ghost_scoring` without rebuilding the attestation index every time.
+
+    Only the blocks, attestations and balances which are new since the last block was
+    scored are processed. Unlike :func:`lmd_ghost_scoring`, the latest vote of a validator
+    is remembered when the justified state moves on.
+    """
+
+    def __init__(self) -> None:
+        self.fork_choice = ProtoArrayForkChoice()
+        # The target epoch of the attestations already processed, by attestation root
+        self._processed_attestations: Dict[HashTreeRoot, Epoch] = {}
+        self._state_root: Optional[Hash32] = None
+        self._finalized_root: Optional[SigningRoot] = None
+
+    def _process_block(
+        self,
+        chain_db: BeaconChainDB,
+        state: BeaconState,
+        config: Eth2Config,
+        block_class: Type[BaseBeaconBlock],
+        block: BaseBeaconBlock,
+    ) -> None:
+        """
+        Add ``block`` to the fork choice, along with any of its ancestors which are missing
+        from it, up to the finalized slot.
+        """
+        finalized_slot = compute_start_slot_of_epoch(
+            state.finalized_checkpoint.epoch, config.SLOTS_PER_EPOCH
+        )
+        missing_blocks = []
+        while block.signing_root not in self.fork_choice.proto_array:
+            missing_blocks.append(block)
+            if block.slot <= finalized_slot or not chain_db.block_exists(
+                block.parent_root
+            ):
+                break
+            block = chain_db.get_block_by_root(block.parent_root, block_class)
+
+        for block in reversed(missing_blocks):
+            self.fork_choice.process_block(
+                block.signing_root, block.parent_root, block.slot
+            )
+
+    def _process_attestations(
+        self,
+        state: BeaconState,
+        attestations: Iterable[AttestationLike],
+        config: Eth2Config,
+    ) -> None:
+        for attestation in attestations:
+            attestation_root = attestation.hash_tree_root
+            if attestation_root in self._processed_attestations:
+                continue
+            self._processed_attestations[
+                attestation_root
+            ] = attestation.data.target.epoch
+
+            slot = get_attestation_data_slot(state, attestation.data, config)
+            for index in get_attesting_indices(
+                state,
+                attestation.data,
+                attestation.aggregation_bits,
+                CommitteeConfig(config),
+            ):
+                self.fork_choice.process_attestation(
+                    index, attestation.data.beacon_block_root, slot
+                )
+
+    def _process_state(self, state: BeaconState, config: Eth2Config) -> None:
+        state_root = state.hash_tree_root
+        if state_root == self._state_root:
+            return
+        self._state_root = state_root
+
+        epoch = compute_epoch_of_slot(state.slot, config.SLOTS_PER_EPOCH)
+        active_validator_indices = set(
+            get_active_validator_indices(state.validators, epoch)
+        )
+        self.fork_choice.update_balances(
+            tuple(
+                validator.effective_balance
+                if index in active_validator_indices
+                else Gwei(0)
+                for index, validator in enumerate(state.validators)
+            )
+        )
+        self._process_attestations(
+            state,
+            state.previous_epoch_attestations + state.current_epoch_attestations,
+            config,
+        )
+
+        finalized_root = state.finalized_checkpoint.root
+        if (
+            finalized_root != self._finalized_root
+            and finalized_root in self.fork_choice.proto_array
+        ):
+            self.fork_choice.prune(finalized_root)
+            self._finalized_root = finalized_root
+            self._prune_processed_attestations(state.finalized_checkpoint.epoch)
+
+    def _prune_processed_attestations(self, finalized_epoch: Epoch) -> None:
+        """
+        Forget the attestations targeting an epoch before ``finalized_epoch``, which can't
+        be included in blocks anymore.
+        """
+        self._processed_attestations = {
+            attestation_root: target_epoch
+            for attestation_root, target_epoch in self._processed_attestations.items()
+            if target_epoch >= finalized_epoch
+        }
+
+    def score(
+        self,
+        chain_db: BeaconChainDB,
+        attestation_pool: AttestationPool,
+        state: BeaconState,
+        config: Eth2Config,
+        block_class: Type[BaseBeaconBlock],
+        block: BaseBeaconBlock,
+    ) -> int:
+        self._process_block(chain_db, state, config, block_class, block)
+        self._process_state(state, config)
+        self._process_attestations(
+            state, (attestation for _, attestation in attestation_pool), config
+        )
+        for block_root in self.fork_choice.get_unknown_vote_roots():
+            if chain_db.block_exists(block_root):
+                self._process_block(
+                    chain_db,
+                    state,
+                    config,
+                    block_class,
+                    chain_db.get_block_by_root(block_root, block_class),
+                )
+        return self.fork_choice.get_weight(block.signing_root) + score_block_by_root(
+            block
+        )
+
+
+@curry
+def proto_array_scoring(
+    store: ProtoArrayStore,
+    chain_db: BeaconChainDB,
+    attestation_pool: AttestationPool,
+    state: BeaconState,
+    config: Eth2Config,
+    block_class: Type[BaseBeaconBlock],
+    block: BaseBeaconBlock,
+) -> int:
+    """
+    Return the score of ``block`` according to the LMD GHOST algorithm like
+    :func:`lmd_ghost_scoring`, maintaining the block weights incrementally in ``store``.
+    """
+    return store.score(chain_db, attestation_pool, state, config, block_class, block)
@@ -0,0 +1,290 @@
+"""
+An incremental implementation of the LMD GHOST fork choice, after the "proto-array" design.
+
+Blocks are kept in an array in insertion order, so that every block comes after its parent.
+Every node carries the total balance of the validators whose latest vote is for the block or
+one of its descendants, along with its best child and best descendant. When votes or balances
+change, only the resulting per-block deltas are computed and a single backwards pass over the
+array propagates them to the ancestors and updates the best children, so the head of any
+block in the tree can be looked up without walking it.
+"""
+
+from typing import Dict, List, Optional, Sequence, Set
+
+from eth2.beacon.typing import Gwei, SigningRoot, Slot, ValidatorIndex
+
+
+class ProtoNode:
+    __slots__ = ("root", "slot", "parent", "weight", "best_child", "best_descendant")
+
+    def __init__(self, root: SigningRoot, slot: Slot, parent: Optional[int]) -> None:
+        self.root = root
+        self.slot = slot
+        self.parent = parent
+        self.weight = 0
+        self.best_child: Optional[int] = None
+        self.best_descendant: Optional[int] = None
+
+
+class ProtoArray:
+    """
+    The block tree, storing the weight and best descendant of every block.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: List[ProtoNode] = []
+        self._indices: Dict[SigningRoot, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, root: SigningRoot) -> bool:
+        return root in self._indices
+
+    def get_index(self, root: SigningRoot) -> int:
+        return self._indices[root]
+
+    def get_weight(self, root: SigningRoot) -> Gwei:
+        return Gwei(self._nodes[self._indices[root]].weight)
+
+    def _is_better_child(self, index: int, other_index: int) -> bool:
+        node = self._nodes[index]
+        other = self._nodes[other_index]
+        # Ties are broken by the lexicographic ordering of the block root
+        return (node.weight, node.root) > (other.weight, other.root)
+
+    def on_block(
+        self, root: SigningRoot, parent_root: Optional[SigningRoot], slot: Slot
+    ) -> None:
+        """
+        Add a block to the tree. Blocks whose parent is unknown become the root of a new tree.
+        """
+        if root in self._indices:
+            return
+
+        index = len(self._nodes)
+        node = ProtoNode(root, slot, self._indices.get(parent_root))
+        node.best_descendant = index
+        self._nodes.append(node)
+        self._indices[root] = index
+
+        # Walk up for as long as the new block becomes the best descendant of its ancestors
+        child_index = index
+        parent_index = node.parent
+        while parent_index is not None:
+            parent = self._nodes[parent_index]
+            if parent.best_child is None or self._is_better_child(
+                child_index, parent.best_child
+            ):
+                parent.best_child = child_index
+            if parent.best_child != child_index:
+                break
+            parent.best_descendant = self._nodes[child_index].best_descendant
+            child_index = parent_index
+            parent_index = parent.parent
+
+    def apply_score_changes(self, deltas: Sequence[int]) -> None:
+        """
+        Apply the change in the weight of every block coming from its own votes, given in
+        the same order as the blocks in the tree.
+        """
+        if len(deltas) != len(self._nodes):
+            raise ValueError(
+                "Expected %d deltas, got %d" % (len(self._nodes), len(deltas))
+            )
+
+        subtree_deltas = list(deltas)
+        for index in range(len(self._nodes) - 1, -1, -1):
+            node = self._nodes[index]
+            node.weight += subtree_deltas[index]
+            if node.parent is not None:
+                subtree_deltas[node.parent] += subtree_deltas[index]
+            node.best_child = None
+
+        # Every child comes after its parent, so children are all settled by the time their
+        # parent is offered to its own parent.
+        for index in range(len(self._nodes) - 1, -1, -1):
+            node = self._nodes[index]
+            if node.best_child is None:
+                node.best_descendant = index
+            else:
+                node.best_descendant = self._nodes[node.best_child].best_descendant
+
+            if node.parent is not None:
+                parent = self._nodes[node.parent]
+                if parent.best_child is None or self._is_better_child(
+                    index, parent.best_child
+                ):
+                    parent.best_child = index
+
+    def find_head(self, justified_root: SigningRoot) -> SigningRoot:
+        """
+        Return the root of the head of the chain starting at ``justified_root``.
+        """
+        justified_node = self._nodes[self._indices[justified_root]]
+        return self._nodes[justified_node.best_descendant].root
+
+    def get_slot(self, root: SigningRoot) -> Slot:
+        return self._nodes[self._indices[root]].slot
+
+    def prune(self, finalized_root: SigningRoot) -> None:
+        """
+        Drop every block which does not descend from ``finalized_root``.
+        """
+        finalized_index = self._indices[finalized_root]
+        new_indices: Dict[int, int] = {}
+        nodes: List[ProtoNode] = []
+        for index in range(finalized_index, len(self._nodes)):
+            node = self._nodes[index]
+            if index != finalized_index and node.parent not in new_indices:
+                continue
+            new_indices[index] = len(nodes)
+            nodes.append(node)
+
+        for node in nodes:
+            node.parent = new_indices.get(node.parent)
+            node.best_child = new_indices.get(node.best_child)
+            node.best_descendant = new_indices[node.best_descendant]
+
+        self._nodes = nodes
+        self._indices = {node.root: index for index, node in enumerate(nodes)}
+
+
+class Vote:
+    __slots__ = ("current_root", "current_balance", "next_root", "slot")
+
+    def __init__(self, next_root: SigningRoot, slot: Slot) -> None:
+        # The vote, and the balance of the validator, reflected in the weights of the tree
+        self.current_root: Optional[SigningRoot] = None
+        self.current_balance = Gwei(0)
+        # The latest vote we know of
+        self.next_root = next_root
+        self.slot = slot
+
+
+class ProtoArrayForkChoice:
+    """
+    Track the latest vote and balance of every validator and keep the weights of a
+    :class:`ProtoArray` up to date with them.
+
+    Changes are only applied to the tree when a weight or a head is requested, and only the
+    validators whose vote or balance changed since are looked at.
+    """
+
+    def __init__(self) -> None:
+        self.proto_array = ProtoArray()
+        self._votes: Dict[ValidatorIndex, Vote] = {}
+        self._balances: Sequence[Gwei] = ()
+        self._dirty_validators: Set[ValidatorIndex] = set()
+        # Validators whose latest vote is for a block we don't know
+        self._pending_validators: Set[ValidatorIndex] = set()
+
+    def process_block(
+        self, root: SigningRoot, parent_root: Optional[SigningRoot], slot: Slot
+    ) -> None:
+        self.proto_array.on_block(root, parent_root, slot)
+
+    def process_attestation(
+        self, validator_index: ValidatorIndex, block_root: SigningRoot, slot: Slot
+    ) -> None:
+        """
+        Record a vote for ``block_root``, unless we know of a later vote of the validator.
+        """
+        vote = self._votes.get(validator_index)
+        if vote is None:
+            self._votes[validator_index] = Vote(block_root, slot)
+        elif slot >= vote.slot:
+            vote.next_root = block_root
+            vote.slot = slot
+        else:
+            return
+        self._dirty_validators.add(validator_index)
+
+    def update_balances(self, balances: Sequence[Gwei]) -> None:
+        """
+        Set the balance of every validator, by validator index.
+        """
+        for validator_index, vote in self._votes.items():
+            # Pending votes are looked at every time changes are applied anyway
+            if (
+                vote.current_root is not None
+                and vote.current_balance != self._get_balance(balances, validator_index)
+            ):
+                self._dirty_validators.add(validator_index)
+        self._balances = balances
+
+    @staticmethod
+    def _get_balance(balances: Sequence[Gwei], validator_index: ValidatorIndex) -> Gwei:
+        if validator_index < len(balances):
+            return balances[validator_index]
+        else:
+            return Gwei(0)
+
+    def get_unknown_vote_roots(self) -> Set[SigningRoot]:
+        """
+        Return the roots of the blocks missing from the tree which validators voted for.
+        """
+        return set(
+            self._votes[validator_index].next_root
+            for validator_index in self._dirty_validators | self._pending_validators
+            if self._votes[validator_index].next_root not in self.proto_array
+        )
+
+    def _apply_changes(self) -> None:
+        if not self._dirty_validators and not self._pending_validators:
+            return
+
+        proto_array = self.proto_array
+        deltas = [0] * len(proto_array)
+        pending_validators = set()
+        for validator_index in self._dirty_validators | self._pending_validators:
+            vote = self._votes[validator_index]
+            if vote.current_root is not None:
+                deltas[proto_array.get_index(vote.current_root)] -= vote.current_balance
+
+            if vote.next_root in proto_array:
+                vote.current_root = vote.next_root
+                vote.current_balance = self._get_balance(
+                    self._balances, validator_index
+                )
+                deltas[proto_array.get_index(vote.current_root)] += vote.current_balance
+            else:
+                vote.current_root = None
+                vote.current_balance = Gwei(0)
+                pending_validators.add(validator_index)
+
+        self._dirty_validators = set()
+        self._pending_validators = pending_validators
+        proto_array.apply_score_changes(deltas)
+
+    def get_weight(self, root: SigningRoot) -> Gwei:
+        """
+        Return the total balance of the validators voting for ``root`` or its descendants.
+        """
+        self._apply_changes()
+        return self.proto_array.get_weight(root)
+
+    def find_head(self, justified_root: SigningRoot) -> SigningRoot:
+        self._apply_changes()
+        return self.proto_array.find_head(justified_root)
+
+    def prune(self, finalized_root: SigningRoot) -> None:
+        self._apply_changes()
+        finalized_slot = self.proto_array.get_slot(finalized_root)
+        self.proto_array.prune(finalized_root)
+        # The blocks voted for by pending votes from before the finalized slot are either
+        # pruned or never imported, so these votes will never count.
+        self._pending_validators = set(
+            validator_index
+            for validator_index in self._pending_validators
+            if self._votes[validator_index].slot > finalized_slot
+        )
+        for vote in self._votes.values():
+            if (
+                vote.current_root is not None
+                and vote.current_root not in self.proto_array
+            ):
+                # The weight of the vote went away with the pruned block, which can't be
+                # imported again so the vote won't be pending either.
+                vote.current_root = None
+                vote.current_balance = Gwei(0)
@@ -3,13 +3,13 @@ from typing import Sequence, Type
 from eth_typing import Hash32
 import ssz
 
+from eth2._utils.merkle.incremental import IncrementalMerkleTree, mix_in_length
 from eth2.beacon.committee_helpers import get_compact_committees_root
 from eth2.beacon.constants import DEPOSIT_CONTRACT_TREE_DEPTH, SECONDS_PER_DAY
 from eth2.beacon.deposit_helpers import process_deposit
 from eth2.beacon.helpers import get_active_validator_indices
 from eth2.beacon.types.block_headers import BeaconBlockHeader
 from eth2.beacon.types.blocks import BaseBeaconBlock, BeaconBlockBody
-from eth2.beacon.types.deposit_data import DepositData
 from eth2.beacon.types.deposits import Deposit
 from eth2.beacon.types.eth1_data import Eth1Data
 from eth2.beacon.types.states import BeaconState
@@ -76,14 +76,12 @@ def initialize_beacon_state_from_eth1(
     )
 
     # Process genesis deposits
-    for index, deposit in enumerate(deposits):
-        deposit_data_list = tuple(deposit.data for deposit in deposits[: index + 1])
+    deposit_tree = IncrementalMerkleTree(DEPOSIT_CONTRACT_TREE_DEPTH)
+    for deposit in deposits:
+        deposit_tree.append(deposit.data.hash_tree_root)
         state = state.copy(
             eth1_data=state.eth1_data.copy(
-                deposit_root=ssz.get_hash_tree_root(
-                    deposit_data_list,
-                    ssz.List(DepositData, 2 ** DEPOSIT_CONTRACT_TREE_DEPTH),
-                )
+                deposit_root=mix_in_length(deposit_tree.get_root(), len(deposit_tree))
             )
         )
         state = process_deposit(state=state, deposit=deposit, config=config)
@@ -1,10 +1,22 @@
-from typing import TYPE_CHECKING, Callable, Sequence, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
-from eth_typing import Hash32
+from eth_typing import BLSPubkey, Hash32
 from eth_utils import ValidationError
+from lru import LRU
 from py_ecc.bls.typing import Domain
 
 from eth2._utils.hash import hash_eth2
+from eth2.beacon.constants import REGISTRY_EPOCH_CACHE_SIZE
 from eth2.beacon.signature_domain import SignatureDomain
 from eth2.beacon.types.forks import Fork
 from eth2.beacon.types.validators import Validator
@@ -23,6 +35,8 @@ from eth2.configs import CommitteeConfig
 if TYPE_CHECKING:
     from eth2.beacon.types.states import BeaconState  # noqa: F401
 
+TValue = TypeVar("TValue")
+
 
 def compute_epoch_of_slot(slot: Slot, slots_per_epoch: int) -> Epoch:
     return Epoch(slot // slots_per_epoch)
@@ -32,19 +46,126 @@ def compute_start_slot_of_epoch(epoch: Epoch, slots_per_epoch: int) -> Slot:
     return Slot(epoch * slots_per_epoch)
 
 
+def get_cached_for_registry(
+    cache: LRU,
+    validators: Sequence[Validator],
+    epoch: Epoch,
+    compute: Callable[[], TValue],
+) -> TValue:
+    """
+    Return the value ``compute`` computes from ``validators`` for ``epoch``, from
+    ``cache`` if it was computed for the very same registry already.
+
+    Registries are immutable tuples, so an updated registry never hits a stale entry:
+    entries are only shared by the computations on the same registry, e.g. the helpers
+    called on one state. ``BeaconState.copy`` copies the registry unless it is passed
+    explicitly. The entry keeps its registry alive, so its id can't be reused by
+    another registry while the entry is in ``cache``.
+    """
+    if not isinstance(validators, tuple):
+        # The registry could be updated in place
+        return compute()
+
+    key = (id(validators), epoch)
+    try:
+        cached_validators, value = cache[key]
+    except KeyError:
+        pass
+    else:
+        if cached_validators is validators:
+            return value
+
+    value = compute()
+    cache[key] = (validators, value)
+    return value
+
+
+# Maps ``(id(validators), epoch)`` to ``validators`` and its active validator indices
+_active_validator_indices_cache = LRU(REGISTRY_EPOCH_CACHE_SIZE)
+
+
 def get_active_validator_indices(
     validators: Sequence[Validator], epoch: Epoch
 ) -> Tuple[ValidatorIndex, ...]:
     """
     Get indices of active validators from ``validators``.
     """
-    return tuple(
-        ValidatorIndex(index)
-        for index, validator in enumerate(validators)
-        if validator.is_active(epoch)
+    return get_cached_for_registry(
+        _active_validator_indices_cache,
+        validators,
+        epoch,
+        lambda: tuple(
+            ValidatorIndex(index)
+            for index, validator in enumerate(validators)
+            if validator.is_active(epoch)
+        ),
     )
 
 
+class ValidatorPubkeyIndex:
+    """
+    Map the public keys of the validators in a registry to their index.
+
+    Validators are only ever appended to the registry, in the order of the deposits, so
+    the registries of the states of a chain are prefixes of one another: the index is
+    extended with the validators it hasn't seen yet rather than rebuilt, unless it is
+    used with a registry which isn't consistent with the one it was built from.
+
+    A registry other than the last one the index was used with is checked entry by
+    entry: comparing the keys is still much cheaper than rebuilding the index.
+    """
+
+    def __init__(self) -> None:
+        self._pubkeys: List[BLSPubkey] = []
+        self._indices: Dict[BLSPubkey, ValidatorIndex] = {}
+        self._validators: Sequence[Validator] = ()
+
+    def __len__(self) -> int:
+        return len(self._pubkeys)
+
+    def _is_consistent_with(self, validators: Sequence[Validator]) -> bool:
+        if validators is self._validators:
+            return True
+        return all(
+            pubkey == validator.pubkey
+            for pubkey, validator in zip(self._pubkeys, validators)
+        )
+
+    def update(self, validators: Sequence[Validator]) -> None:
+        if not self._is_consistent_with(validators):
+            self._pubkeys = []
+            self._indices = {}
+
+        for index in range(len(self._pubkeys), len(validators)):
+            pubkey = validators[index].pubkey
+            self._pubkeys.append(pubkey)
+            # Like ``tuple.index``, return the first validator with the key
+            self._indices.setdefault(pubkey, ValidatorIndex(index))
+        self._validators = validators
+
+    def get_index(
+        self, validators: Sequence[Validator], pubkey: BLSPubkey
+    ) -> Optional[ValidatorIndex]:
+        self.update(validators)
+        index = self._indices.get(pubkey)
+        if index is None or index >= len(validators):
+            return None
+        return index
+
+
+_validator_pubkey_index = ValidatorPubkeyIndex()
+
+
+def get_validator_index_by_pubkey(
+    validators: Sequence[Validator], pubkey: BLSPubkey
+) -> Optional[ValidatorIndex]:
+    """
+    Return the index of the validator with ``pubkey`` in ``validators``, or ``None`` if
+    there is no such validator.
+    """
+    return _validator_pubkey_index.get_index(validators, pubkey)
+
+
 def _get_historical_root(
     historical_roots: Sequence[SigningRoot],
     state_slot: Slot,
@@ -1,15 +1,18 @@
+import argparse
 from pathlib import Path
 import time
 
 from eth2._utils.hash import hash_eth2
 from eth2.beacon.genesis import initialize_beacon_state_from_eth1
 from eth2.beacon.tools.builder.initializer import create_mock_deposits_and_root
+from eth2.beacon.tools.builder.keys import load_or_create_keys
 from eth2.beacon.tools.fixtures.config_types import Minimal
 from eth2.beacon.tools.fixtures.loading import load_config_at_path, load_yaml_at
 from eth2.beacon.tools.misc.ssz_vector import override_lengths
 
 ROOT_DIR = Path("eth2/beacon/scripts")
 KEY_SET_FILE = Path("keygen_16_validators.yaml")
+KEYSTORE_DIR = ROOT_DIR / Path("keystore")
 
 
 def _load_config(config):
@@ -17,12 +20,23 @@ def _load_config(config):
     return load_config_at_path(config_file_name)
 
 
-def _main():
+def _load_key_set(validator_count):
+    if validator_count is None:
+        return load_yaml_at(ROOT_DIR / KEY_SET_FILE)
+
+    keymap = load_or_create_keys(KEYSTORE_DIR, validator_count)
+    return tuple(
+        {"pubkey": int.from_bytes(pubkey, byteorder="big"), "privkey": privkey}
+        for pubkey, privkey in keymap.items()
+    )
+
+
+def _main(validator_count):
     config_type = Minimal
     config = _load_config(config_type)
     override_lengths(config)
 
-    key_set = load_yaml_at(ROOT_DIR / KEY_SET_FILE)
+    key_set = _load_key_set(validator_count)
 
     pubkeys = ()
     privkeys = ()
@@ -61,5 +75,18 @@ def _main():
     print(genesis_state.hash_tree_root.hex())
 
 
+parser = argparse.ArgumentParser(description="Generate a genesis state")
+parser.add_argument(
+    "--validator-count",
+    type=int,
+    required=False,
+    help=(
+        "Number of validators with deterministic keys to start with, "
+        f"instead of the keys in {KEY_SET_FILE}"
+    ),
+)
+
+
 if __name__ == "__main__":
-    _main()
+    args = parser.parse_args()
+    _main(args.validator_count)
@@ -5,6 +5,7 @@ from typing import Tuple, Type
 from eth._utils.datatypes import Configurable
 
 from eth2.beacon.db.chain import BaseBeaconChainDB
+from eth2.beacon.fork_choice.lmd_ghost import ProtoArrayStore
 from eth2.beacon.fork_choice.scoring import ScoringFn as ForkChoiceScoringFn
 from eth2.beacon.operations.attestation_pool import AttestationPool
 from eth2.beacon.types.blocks import BaseBeaconBlock
@@ -30,7 +31,10 @@ class BaseBeaconStateMachine(Configurable, ABC):
 
     @abstractmethod
     def __init__(
-        self, chaindb: BaseBeaconChainDB, attestation_pool: AttestationPool
+        self,
+        chaindb: BaseBeaconChainDB,
+        attestation_pool: AttestationPool,
+        fork_choice_store: ProtoArrayStore = None,
     ) -> None:
         ...
 
@@ -80,10 +84,18 @@ class BaseBeaconStateMachine(Configurable, ABC):
 
 class BeaconStateMachine(BaseBeaconStateMachine):
     def __init__(
-        self, chaindb: BaseBeaconChainDB, attestation_pool: AttestationPool
+        self,
+        chaindb: BaseBeaconChainDB,
+        attestation_pool: AttestationPool,
+        fork_choice_store: ProtoArrayStore = None,
     ) -> None:
         self.chaindb = chaindb
         self.attestation_pool = attestation_pool
+        if fork_choice_store is None:
+            # The store is rebuilt from the database, but can't be kept up to date
+            # unless it is shared by the state machines used to import blocks.
+            fork_choice_store = ProtoArrayStore()
+        self.fork_choice_store = fork_choice_store
 
     @classmethod
     def get_block_class(cls) -> Type[BaseBeaconBlock]:
@@ -1,6 +1,6 @@
 from typing import Type  # noqa: F401
 
-from eth2.beacon.fork_choice.lmd_ghost import lmd_ghost_scoring
+from eth2.beacon.fork_choice.lmd_ghost import proto_array_scoring
 from eth2.beacon.fork_choice.scoring import ScoringFn as ForkChoiceScoringFn
 from eth2.beacon.state_machines.base import BeaconStateMachine
 from eth2.beacon.state_machines.state_transitions import (  # noqa: F401
@@ -41,6 +41,11 @@ class SerenityStateMachine(BeaconStateMachine):
 
     def get_fork_choice_scoring(self) -> ForkChoiceScoringFn:
         state = self._get_justified_head_state()
-        return lmd_ghost_scoring(
-            self.chaindb, self.attestation_pool, state, self.config, self.block_class
+        return proto_array_scoring(
+            self.fork_choice_store,
+            self.chaindb,
+            self.attestation_pool,
+            state,
+            self.config,
+            self.block_class,
         )
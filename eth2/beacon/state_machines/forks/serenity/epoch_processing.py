@@ -1,4 +1,5 @@
-from typing import Sequence, Set, Tuple
+import operator
+from typing import Dict, Sequence, Set, Tuple
 
 from eth_typing import Hash32
 from eth_utils.toolz import curry
@@ -18,7 +19,7 @@ from eth2.beacon.epoch_processing_helpers import (
     decrease_balance,
     get_attesting_balance,
     get_attesting_indices,
-    get_base_reward,
+    get_base_rewards,
     get_matching_head_attestations,
     get_matching_source_attestations,
     get_matching_target_attestations,
@@ -27,7 +28,6 @@ from eth2.beacon.epoch_processing_helpers import (
     get_unslashed_attesting_indices,
     get_validator_churn_limit,
     get_winning_crosslink_and_attesting_indices,
-    increase_balance,
 )
 from eth2.beacon.helpers import (
     get_active_validator_indices,
@@ -305,14 +305,36 @@ def process_crosslinks(state: BeaconState, config: Eth2Config) -> BeaconState:
     return state
 
 
+def _get_earliest_inclusions(
+    state: BeaconState,
+    attestations: Sequence[PendingAttestation],
+    config: CommitteeConfig,
+) -> Dict[ValidatorIndex, PendingAttestation]:
+    """
+    Map every attesting validator to the attestation with the lowest inclusion
+    delay it takes part in, resolving ties in favor of the attestation which
+    comes first in ``attestations``.
+    """
+    earliest_inclusions: Dict[ValidatorIndex, PendingAttestation] = {}
+    # `sorted` is stable so the first of the attestations sharing the lowest
+    # inclusion delay wins, the same as with `min`.
+    for attestation in sorted(attestations, key=lambda a: a.inclusion_delay):
+        for index in get_attesting_indices(
+            state, attestation.data, attestation.aggregation_bits, config
+        ):
+            earliest_inclusions.setdefault(index, attestation)
+    return earliest_inclusions
+
+
 def get_attestation_deltas(
     state: BeaconState, config: Eth2Config
 ) -> Tuple[Sequence[Gwei], Sequence[Gwei]]:
     committee_config = CommitteeConfig(config)
-    rewards = tuple(0 for _ in range(len(state.validators)))
-    penalties = tuple(0 for _ in range(len(state.validators)))
+    rewards = [0] * len(state.validators)
+    penalties = [0] * len(state.validators)
     previous_epoch = state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH)
     total_balance = get_total_active_balance(state, config)
+    base_rewards = get_base_rewards(state, total_balance, config)
     eligible_validator_indices = tuple(
         ValidatorIndex(index)
         for index, v in enumerate(state.validators)
@@ -341,58 +363,31 @@ def get_attestation_deltas(
         attesting_balance = get_total_balance(state, unslashed_attesting_indices)
         for index in eligible_validator_indices:
             if index in unslashed_attesting_indices:
-                rewards = update_tuple_item_with_fn(
-                    rewards,
-                    index,
-                    lambda balance, delta: balance + delta,
-                    get_base_reward(state, index, config)
-                    * attesting_balance
-                    // total_balance,
+                rewards[index] += (
+                    base_rewards[index] * attesting_balance // total_balance
                 )
             else:
-                penalties = update_tuple_item_with_fn(
-                    penalties,
-                    index,
-                    lambda balance, delta: balance + delta,
-                    get_base_reward(state, index, config),
-                )
+                penalties[index] += base_rewards[index]
 
+    earliest_inclusions = _get_earliest_inclusions(
+        state, matching_source_attestations, committee_config
+    )
     for index in get_unslashed_attesting_indices(
         state, matching_source_attestations, committee_config
     ):
-        attestation = min(
-            (
-                a
-                for a in matching_source_attestations
-                if index
-                in get_attesting_indices(
-                    state, a.data, a.aggregation_bits, committee_config
-                )
-            ),
-            key=lambda a: a.inclusion_delay,
-        )
-        base_reward = get_base_reward(state, index, config)
+        attestation = earliest_inclusions[index]
+        base_reward = base_rewards[index]
         proposer_reward = base_reward // config.PROPOSER_REWARD_QUOTIENT
-        rewards = update_tuple_item_with_fn(
-            rewards,
-            attestation.proposer_index,
-            lambda balance, delta: balance + delta,
-            proposer_reward,
-        )
+        rewards[attestation.proposer_index] += proposer_reward
         max_attester_reward = base_reward - proposer_reward
-        rewards = update_tuple_item_with_fn(
-            rewards,
-            index,
-            lambda balance, delta: balance + delta,
-            (
-                max_attester_reward
-                * (
-                    config.SLOTS_PER_EPOCH
-                    + config.MIN_ATTESTATION_INCLUSION_DELAY
-                    - attestation.inclusion_delay
-                )
-                // config.SLOTS_PER_EPOCH
-            ),
+        rewards[index] += (
+            max_attester_reward
+            * (
+                config.SLOTS_PER_EPOCH
+                + config.MIN_ATTESTATION_INCLUSION_DELAY
+                - attestation.inclusion_delay
+            )
+            // config.SLOTS_PER_EPOCH
         )
 
     finality_delay = previous_epoch - state.finalized_checkpoint.epoch
@@ -401,21 +396,13 @@ def get_attestation_deltas(
             state, matching_target_attestations, committee_config
         )
         for index in eligible_validator_indices:
-            penalties = update_tuple_item_with_fn(
-                penalties,
-                index,
-                lambda balance, delta: balance + delta,
-                BASE_REWARDS_PER_EPOCH * get_base_reward(state, index, config),
-            )
+            penalties[index] += BASE_REWARDS_PER_EPOCH * base_rewards[index]
             if index not in matching_target_attesting_indices:
                 effective_balance = state.validators[index].effective_balance
-                penalties = update_tuple_item_with_fn(
-                    penalties,
-                    index,
-                    lambda balance, delta: balance + delta,
+                penalties[index] += (
                     effective_balance
                     * finality_delay
-                    // config.INACTIVITY_PENALTY_QUOTIENT,
+                    // config.INACTIVITY_PENALTY_QUOTIENT
                 )
     return (
         tuple(Gwei(reward) for reward in rewards),
@@ -426,8 +413,8 @@ def get_attestation_deltas(
 def get_crosslink_deltas(
     state: BeaconState, config: Eth2Config
 ) -> Tuple[Sequence[Gwei], Sequence[Gwei]]:
-    rewards = tuple(0 for _ in range(len(state.validators)))
-    penalties = tuple(0 for _ in range(len(state.validators)))
+    rewards = [0] * len(state.validators)
+    penalties = [0] * len(state.validators)
     epoch = state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH)
     active_validators_indices = get_active_validator_indices(state.validators, epoch)
     epoch_committee_count = get_committee_count(
@@ -437,6 +424,9 @@ def get_crosslink_deltas(
         config.TARGET_COMMITTEE_SIZE,
     )
     epoch_start_shard = get_start_shard(state, epoch, CommitteeConfig(config))
+    base_rewards = get_base_rewards(
+        state, get_total_active_balance(state, config), config
+    )
     for shard_offset in range(epoch_committee_count):
         shard = Shard((epoch_start_shard + shard_offset) % config.SHARD_COUNT)
         crosslink_committee = set(
@@ -448,21 +438,13 @@ def get_crosslink_deltas(
         total_attesting_balance = get_total_balance(state, attesting_indices)
         total_committee_balance = get_total_balance(state, crosslink_committee)
         for index in crosslink_committee:
-            base_reward = get_base_reward(state, index, config)
+            base_reward = base_rewards[index]
             if index in attesting_indices:
-                rewards = update_tuple_item_with_fn(
-                    rewards,
-                    index,
-                    lambda balance, delta: balance + delta,
-                    base_reward * total_attesting_balance // total_committee_balance,
+                rewards[index] += (
+                    base_reward * total_attesting_balance // total_committee_balance
                 )
             else:
-                penalties = update_tuple_item_with_fn(
-                    penalties,
-                    index,
-                    lambda balance, delta: balance + delta,
-                    base_reward,
-                )
+                penalties[index] += base_reward
     return (
         tuple(Gwei(reward) for reward in rewards),
         tuple(Gwei(penalty) for penalty in penalties),
@@ -483,20 +465,18 @@ def process_rewards_and_penalties(
         state, config
     )
 
-    for index in range(len(state.validators)):
-        index = ValidatorIndex(index)
-        state = increase_balance(
-            state,
-            index,
-            Gwei(rewards_for_attestations[index] + rewards_for_crosslinks[index]),
-        )
-        state = decrease_balance(
-            state,
-            index,
-            Gwei(penalties_for_attestations[index] + penalties_for_crosslinks[index]),
+    # Equivalent to `increase_balance` followed by `decrease_balance` for every
+    # validator, but builds the new balances in a single pass.
+    return state.copy(
+        balances=tuple(
+            Gwei(max(0, balance + reward - penalty))
+            for balance, reward, penalty in zip(
+                state.balances,
+                map(operator.add, rewards_for_attestations, rewards_for_crosslinks),
+                map(operator.add, penalties_for_attestations, penalties_for_crosslinks),
+            )
         )
-
-    return state
+    )
 
 
 @curry
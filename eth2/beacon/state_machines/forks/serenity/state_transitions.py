@@ -1,3 +1,7 @@
+from eth_utils import ValidationError, encode_hex
+
+from eth2._utils.bls import bls
+from eth2.beacon.exceptions import SignatureError
 from eth2.beacon.state_machines.state_transitions import BaseStateTransition
 from eth2.beacon.types.blocks import BaseBeaconBlock
 from eth2.beacon.types.states import BeaconState
@@ -30,6 +34,17 @@ class SerenityStateTransition(BaseStateTransition):
         state = process_slots(state, target_slot, self.config)
 
         if block:
-            state = process_block(state, block, self.config, check_proposer_signature)
+            # All the signatures in the block are checked at once, once the block has
+            # otherwise been found valid.
+            try:
+                with bls.batch_validation():
+                    state = process_block(
+                        state, block, self.config, check_proposer_signature
+                    )
+            except SignatureError as error:
+                raise ValidationError(
+                    f"Invalid signature in block {encode_hex(block.signing_root)}",
+                    error,
+                )
 
         return state
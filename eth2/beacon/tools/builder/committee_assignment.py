@@ -1,4 +1,4 @@
-from typing import NamedTuple, Tuple
+from typing import Collection, Dict, Iterable, NamedTuple, Tuple
 
 from eth_utils import ValidationError
 
@@ -14,7 +14,7 @@ from eth2.beacon.helpers import (
     get_active_validator_indices,
 )
 from eth2.beacon.types.states import BeaconState
-from eth2.beacon.typing import Epoch, Shard, Slot, ValidatorIndex
+from eth2.beacon.typing import CommitteeIndex, Epoch, Shard, Slot, ValidatorIndex
 from eth2.configs import CommitteeConfig, Eth2Config
 
 CommitteeAssignment = NamedTuple(
@@ -28,27 +28,31 @@ CommitteeAssignment = NamedTuple(
 )
 
 
-# TODO(ralexstokes) refactor using other helpers, also likely to have duplicated in tests
-def get_committee_assignment(
-    state: BeaconState,
-    config: Eth2Config,
-    epoch: Epoch,
-    validator_index: ValidatorIndex,
-) -> CommitteeAssignment:
-    """
-    Return the ``CommitteeAssignment`` in the ``epoch`` for ``validator_index``.
-    ``CommitteeAssignment.committee`` is the tuple array of validators in the committee
-    ``CommitteeAssignment.shard`` is the shard to which the committee is assigned
-    ``CommitteeAssignment.slot`` is the slot at which the committee is assigned
-    ``CommitteeAssignment.is_proposer`` is a bool signalling if the validator is expected to
-        propose a beacon block at the assigned slot.
-    """
+class ValidatorDuty(NamedTuple):
+    committee: Tuple[ValidatorIndex, ...]
+    shard: Shard
+    slot: Slot
+    # The position of the validator in ``committee``
+    committee_index: CommitteeIndex
+    is_proposer: bool
+
+
+def _validate_assignment_epoch(
+    state: BeaconState, config: Eth2Config, epoch: Epoch
+) -> None:
     next_epoch = state.next_epoch(config.SLOTS_PER_EPOCH)
     if epoch > next_epoch:
         raise ValidationError(
             f"Epoch for committee assignment ({epoch}) must not be after next epoch {next_epoch}."
         )
 
+
+def _iterate_committees(
+    state: BeaconState, config: Eth2Config, epoch: Epoch
+) -> Iterable[Tuple[Slot, Shard, Tuple[ValidatorIndex, ...]]]:
+    """
+    Yield the slot, shard and members of every crosslink committee in ``epoch``.
+    """
     active_validators = get_active_validator_indices(state.validators, epoch)
     committees_per_slot = (
         get_committee_count(
@@ -70,12 +74,68 @@ def get_committee_assignment(
             committee = get_crosslink_committee(
                 state, epoch, shard, CommitteeConfig(config)
             )
-            if validator_index in committee:
-                is_proposer = validator_index == get_beacon_proposer_index(
-                    state.copy(slot=slot), CommitteeConfig(config)
-                )
-                return CommitteeAssignment(
-                    committee, Shard(shard), Slot(slot), is_proposer
-                )
+            yield Slot(slot), shard, committee
+
+
+def _get_proposer_at_slot(
+    state: BeaconState, config: Eth2Config, slot: Slot
+) -> ValidatorIndex:
+    return get_beacon_proposer_index(state.copy(slot=slot), CommitteeConfig(config))
+
+
+# TODO(ralexstokes) refactor using other helpers, also likely to have duplicated in tests
+def get_committee_assignment(
+    state: BeaconState,
+    config: Eth2Config,
+    epoch: Epoch,
+    validator_index: ValidatorIndex,
+) -> CommitteeAssignment:
+    """
+    Return the ``CommitteeAssignment`` in the ``epoch`` for ``validator_index``.
+    ``CommitteeAssignment.committee`` is the tuple array of validators in the committee
+    ``CommitteeAssignment.shard`` is the shard to which the committee is assigned
+    ``CommitteeAssignment.slot`` is the slot at which the committee is assigned
+    ``CommitteeAssignment.is_proposer`` is a bool signalling if the validator is expected to
+        propose a beacon block at the assigned slot.
+    """
+    _validate_assignment_epoch(state, config, epoch)
+
+    for slot, shard, committee in _iterate_committees(state, config, epoch):
+        if validator_index in committee:
+            is_proposer = validator_index == _get_proposer_at_slot(state, config, slot)
+            return CommitteeAssignment(committee, shard, slot, is_proposer)
 
     raise NoCommitteeAssignment
+
+
+def get_validator_duties(
+    state: BeaconState,
+    config: Eth2Config,
+    epoch: Epoch,
+    validator_indices: Collection[ValidatorIndex],
+) -> Dict[ValidatorIndex, ValidatorDuty]:
+    """
+    Return the ``ValidatorDuty`` in the ``epoch`` of each of ``validator_indices``.
+
+    Every committee of the epoch is computed once, instead of once per validator like
+    ``get_committee_assignment`` does. Validators without an assignment are left out.
+    """
+    _validate_assignment_epoch(state, config, epoch)
+
+    validator_indices = set(validator_indices)
+    proposers: Dict[Slot, ValidatorIndex] = {}
+    duties: Dict[ValidatorIndex, ValidatorDuty] = {}
+    for slot, shard, committee in _iterate_committees(state, config, epoch):
+        for committee_index, validator_index in enumerate(committee):
+            if validator_index not in validator_indices:
+                continue
+            if slot not in proposers:
+                proposers[slot] = _get_proposer_at_slot(state, config, slot)
+            duties[validator_index] = ValidatorDuty(
+                committee,
+                shard,
+                slot,
+                CommitteeIndex(committee_index),
+                validator_index == proposers[slot],
+            )
+    return duties
@@ -1,16 +1,13 @@
-from typing import Dict, Sequence, Tuple, Type, cast
+from typing import Dict, Sequence, Tuple, Type
 
 from eth.constants import ZERO_HASH32
 from eth_typing import BLSPubkey, Hash32
 
-from eth2._utils.hash import hash_eth2
-from eth2._utils.merkle.common import get_merkle_proof
-from eth2._utils.merkle.sparse import calc_merkle_tree_from_leaves, get_root
-from eth2.beacon.constants import ZERO_TIMESTAMP
+from eth2._utils.merkle.incremental import IncrementalMerkleTree, mix_in_length
+from eth2.beacon.constants import DEPOSIT_CONTRACT_TREE_DEPTH, ZERO_TIMESTAMP
 from eth2.beacon.genesis import get_genesis_block, initialize_beacon_state_from_eth1
-from eth2.beacon.tools.builder.validator import create_mock_deposit_data
+from eth2.beacon.tools.builder.validator import create_mock_deposit_datas
 from eth2.beacon.types.blocks import BaseBeaconBlock
-from eth2.beacon.types.deposit_data import DepositData  # noqa: F401
 from eth2.beacon.types.deposits import Deposit
 from eth2.beacon.types.eth1_data import Eth1Data
 from eth2.beacon.types.states import BeaconState
@@ -45,34 +42,30 @@ def create_mock_deposits_and_root(
     if not leaves:
         leaves = tuple()
 
-    deposit_datas = tuple()  # type: Tuple[DepositData, ...]
-    deposit_data_leaves = cast(Tuple[Hash32, ...], leaves)  # type: Tuple[Hash32, ...]
-    for key, credentials in zip(pubkeys, withdrawal_credentials):
-        privkey = keymap[key]
-        deposit_data = create_mock_deposit_data(
-            config=config,
-            pubkey=key,
-            privkey=privkey,
-            withdrawal_credentials=credentials,
-        )
-        item = deposit_data.hash_tree_root
-        deposit_data_leaves += (item,)
-        deposit_datas += (deposit_data,)
+    deposit_tree = IncrementalMerkleTree(DEPOSIT_CONTRACT_TREE_DEPTH)
+    for leaf in leaves:
+        deposit_tree.append(leaf)
+
+    deposit_datas = create_mock_deposit_datas(
+        config=config,
+        pubkeys=pubkeys,
+        privkeys=tuple(keymap[key] for key in pubkeys),
+        withdrawal_credentials=withdrawal_credentials,
+    )
 
     deposits: Tuple[Deposit, ...] = tuple()
-    for index, data in enumerate(deposit_datas):
-        length_mix_in = Hash32((index + 1).to_bytes(32, byteorder="little"))
-        tree = calc_merkle_tree_from_leaves(deposit_data_leaves[: index + 1])
+    for deposit_data in deposit_datas:
+        deposit_tree.append(deposit_data.hash_tree_root)
+        length_mix_in = Hash32(len(deposit_tree).to_bytes(32, byteorder="little"))
 
         deposit = Deposit(
-            proof=(get_merkle_proof(tree, item_index=index) + (length_mix_in,)),
-            data=data,
+            proof=tuple(deposit_tree.get_last_proof()) + (length_mix_in,),
+            data=deposit_data,
         )
         deposits += (deposit,)
 
-    if len(deposit_data_leaves) > 0:
-        tree_root = get_root(tree)
-        return deposits, hash_eth2(tree_root + length_mix_in)
+    if len(deposit_tree) > 0:
+        return deposits, mix_in_length(deposit_tree.get_root(), len(deposit_tree))
     else:
         return tuple(), ZERO_HASH32
 
@@ -0,0 +1,128 @@
+import functools
+import json
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Callable, Dict, Sequence, Tuple, Type, TypeVar
+
+from eth_typing import BLSPubkey, BLSSignature, Hash32
+
+from eth2._utils.bls import Domain, bls
+from eth2._utils.bls.backends.base import BaseBLSBackend
+from eth2._utils.hash import hash_eth2
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
+
+# Below this many keys, starting the worker processes costs more than it saves
+MIN_PARALLEL_KEY_COUNT = 64
+
+KEYSTORE_FILE_NAME = "keystore.json"
+
+
+def map_in_process_pool(
+    fn: Callable[[TItem], TResult], items: Sequence[TItem]
+) -> Tuple[TResult, ...]:
+    """
+    Apply ``fn`` to every item in ``items``, across all CPUs if there are enough of them.
+
+    The results are in the order of ``items``. ``fn`` and the items must be picklable.
+
+    The worker processes only live for the duration of the call. They are spawned
+    rather than forked: forking a process with other threads running, like the beacon
+    node, can leave locks held forever in the children.
+    """
+    if len(items) < MIN_PARALLEL_KEY_COUNT:
+        return tuple(map(fn, items))
+
+    process_count = min(os.cpu_count() or 1, len(items) // MIN_PARALLEL_KEY_COUNT)
+    chunk_size = max(1, len(items) // (process_count * 4))
+    with multiprocessing.get_context("spawn").Pool(process_count) as pool:
+        return tuple(pool.map(fn, items, chunksize=chunk_size))
+
+
+def _use_backend(backend: Type[BaseBLSBackend]) -> None:
+    # Spawned worker processes start out with the default backend
+    if bls.backend is not backend:
+        bls.use(backend)
+
+
+def _privtopub(backend: Type[BaseBLSBackend], privkey: int) -> BLSPubkey:
+    _use_backend(backend)
+    return bls.privtopub(privkey)
+
+
+def _sign(
+    backend: Type[BaseBLSBackend],
+    domain: Domain,
+    message_hash_and_privkey: Tuple[Hash32, int],
+) -> BLSSignature:
+    _use_backend(backend)
+    message_hash, privkey = message_hash_and_privkey
+    return bls.sign(message_hash, privkey, domain)
+
+
+def privtopubs(privkeys: Sequence[int]) -> Tuple[BLSPubkey, ...]:
+    """
+    Derive the public keys of ``privkeys`` in parallel.
+    """
+    return map_in_process_pool(functools.partial(_privtopub, bls.backend), privkeys)
+
+
+def sign_many(
+    message_hashes: Sequence[Hash32], privkeys: Sequence[int], domain: Domain
+) -> Tuple[BLSSignature, ...]:
+    """
+    Sign each message hash with the private key at the same position, in parallel.
+    """
+    return map_in_process_pool(
+        functools.partial(_sign, bls.backend, domain),
+        tuple(zip(message_hashes, privkeys)),
+    )
+
+
+def create_privkey(index: int) -> int:
+    """
+    Return the private key of the validator at ``index`` in a deterministic key set.
+    """
+    # An integer slightly less than the curve order
+    return int.from_bytes(hash_eth2(index.to_bytes(32, "little")), "little") % 2 ** 254
+
+
+def _read_keystore(keystore_path: Path) -> Dict[BLSPubkey, int]:
+    try:
+        with keystore_path.open("r") as f:
+            key_pairs = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {
+        BLSPubkey(bytes.fromhex(key_pair["pubkey"])): int(key_pair["privkey"], 16)
+        for key_pair in key_pairs
+    }
+
+
+def _write_keystore(keystore_path: Path, keymap: Dict[BLSPubkey, int]) -> None:
+    keystore_path.parent.mkdir(parents=True, exist_ok=True)
+    key_pairs = [
+        {"pubkey": pubkey.hex(), "privkey": hex(privkey)}
+        for pubkey, privkey in keymap.items()
+    ]
+    with keystore_path.open("w") as f:
+        json.dump(key_pairs, f, indent=2)
+
+
+def load_or_create_keys(keystore_dir: Path, count: int) -> Dict[BLSPubkey, int]:
+    """
+    Return the first ``count`` key pairs of the deterministic key set, in order.
+
+    Key pairs are read from the keystore in ``keystore_dir`` and the missing ones are
+    derived and added to it, so that only the first run with a given ``count`` is slow.
+    """
+    keystore_path = keystore_dir / KEYSTORE_FILE_NAME
+    keymap = _read_keystore(keystore_path)
+    if len(keymap) < count:
+        privkeys = tuple(create_privkey(index) for index in range(len(keymap), count))
+        keymap.update(zip(privtopubs(privkeys), privkeys))
+        _write_keystore(keystore_path, keymap)
+
+    return dict(tuple(keymap.items())[:count])
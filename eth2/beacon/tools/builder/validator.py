@@ -5,7 +5,6 @@ from typing import Dict, Iterable, Sequence, Tuple
 from eth.constants import ZERO_HASH32
 from eth_typing import BLSPubkey, BLSSignature, Hash32
 from eth_utils import to_tuple
-from eth_utils.toolz import keymap as keymapper
 from eth_utils.toolz import pipe
 
 from eth2._utils.bitfield import get_empty_bitfield, set_voted
@@ -28,6 +27,7 @@ from eth2.beacon.helpers import (
 )
 from eth2.beacon.signature_domain import SignatureDomain
 from eth2.beacon.state_machines.base import BaseBeaconStateMachine
+from eth2.beacon.tools.builder.keys import sign_many
 from eth2.beacon.types.attestation_data import AttestationData
 from eth2.beacon.types.attestation_data_and_custody_bits import (
     AttestationDataAndCustodyBit,
@@ -576,30 +576,18 @@ def get_crosslink_committees_at_slot(
     return tuple(results)
 
 
-def create_signed_attestation_at_slot(
+def _create_attestation_data(
     state: BeaconState,
     config: Eth2Config,
-    state_machine: BaseBeaconStateMachine,
     attestation_slot: Slot,
     beacon_block_root: SigningRoot,
-    validator_privkeys: Dict[ValidatorIndex, int],
-    committee: Tuple[ValidatorIndex, ...],
+    target_root: SigningRoot,
     shard: Shard,
-    attesting_indices: Sequence[CommitteeIndex],
-) -> Attestation:
-    """
-    Create the attestations of the given ``attestation_slot`` slot with ``validator_privkeys``.
-    """
-    state_transition = state_machine.state_transition
-    state = state_transition.apply_state_transition(state, future_slot=attestation_slot)
-
+) -> AttestationData:
     target_epoch = compute_epoch_of_slot(attestation_slot, config.SLOTS_PER_EPOCH)
-
-    target_root = _get_target_root(state, config, beacon_block_root)
-
     parent_crosslink = state.current_crosslinks[shard]
 
-    attestation_data = AttestationData(
+    return AttestationData(
         beacon_block_root=beacon_block_root,
         source=Checkpoint(
             epoch=state.current_justified_checkpoint.epoch,
@@ -614,17 +602,116 @@ def create_signed_attestation_at_slot(
         ),
     )
 
-    return _create_mock_signed_attestation(
+
+CommitteeAttesters = Tuple[Tuple[ValidatorIndex, ...], Shard, Sequence[CommitteeIndex]]
+
+
+def create_signed_attestations_on_state(
+    state: BeaconState,
+    config: Eth2Config,
+    beacon_block_root: SigningRoot,
+    validator_privkeys: Dict[ValidatorIndex, int],
+    committee_attesters: Sequence[CommitteeAttesters],
+) -> Tuple[Attestation, ...]:
+    """
+    Create one aggregate attestation of the slot of ``state`` for each committee in
+    ``committee_attesters``, which holds the committee, its shard and the positions of
+    the attesters in it.
+
+    The signatures of all the attesters are computed in one batch, across processes.
+    """
+    attestation_slot = state.slot
+    target_root = _get_target_root(state, config, beacon_block_root)
+    attestation_datas = tuple(
+        _create_attestation_data(
+            state, config, attestation_slot, beacon_block_root, target_root, shard
+        )
+        for _, shard, _ in committee_attesters
+    )
+
+    message_hashes: Tuple[Hash32, ...] = ()
+    privkeys: Tuple[int, ...] = ()
+    for attestation_data, (committee, _, attesting_indices) in zip(
+        attestation_datas, committee_attesters
+    ):
+        message_hash = _get_mock_message(attestation_data)
+        for committee_index in attesting_indices:
+            message_hashes += (message_hash,)
+            privkeys += (validator_privkeys[committee[committee_index]],)
+
+    domain = get_domain(
         state,
-        attestation_data,
-        attestation_slot,
-        committee,
-        len(committee),
-        keymapper(lambda index: state.validators[index].pubkey, validator_privkeys),
+        SignatureDomain.DOMAIN_ATTESTATION,
         config.SLOTS_PER_EPOCH,
-        is_for_simulation=False,
-        attesting_indices=attesting_indices,
+        message_epoch=compute_epoch_of_slot(attestation_slot, config.SLOTS_PER_EPOCH),
     )
+    signatures = iter(sign_many(message_hashes, privkeys, domain))
+
+    attestations: Tuple[Attestation, ...] = ()
+    for attestation_data, (committee, _, attesting_indices) in zip(
+        attestation_datas, committee_attesters
+    ):
+        aggregation_bits, aggregate_signature = aggregate_votes(
+            bitfield=get_empty_bitfield(len(committee)),
+            sigs=(),
+            voting_sigs=tuple(next(signatures) for _ in attesting_indices),
+            attesting_indices=attesting_indices,
+        )
+        attestations += (
+            Attestation(
+                aggregation_bits=aggregation_bits,
+                data=attestation_data,
+                custody_bits=Bitfield((False,) * len(aggregation_bits)),
+                signature=aggregate_signature,
+            ),
+        )
+    return attestations
+
+
+def create_signed_attestations_at_slot(
+    state: BeaconState,
+    config: Eth2Config,
+    state_machine: BaseBeaconStateMachine,
+    attestation_slot: Slot,
+    beacon_block_root: SigningRoot,
+    validator_privkeys: Dict[ValidatorIndex, int],
+    committee_attesters: Sequence[CommitteeAttesters],
+) -> Tuple[Attestation, ...]:
+    """
+    Create one aggregate attestation of the given ``attestation_slot`` slot for each
+    committee in ``committee_attesters``, on ``state`` advanced to that slot.
+    """
+    state_transition = state_machine.state_transition
+    state = state_transition.apply_state_transition(state, future_slot=attestation_slot)
+    return create_signed_attestations_on_state(
+        state, config, beacon_block_root, validator_privkeys, committee_attesters
+    )
+
+
+def create_signed_attestation_at_slot(
+    state: BeaconState,
+    config: Eth2Config,
+    state_machine: BaseBeaconStateMachine,
+    attestation_slot: Slot,
+    beacon_block_root: SigningRoot,
+    validator_privkeys: Dict[ValidatorIndex, int],
+    committee: Tuple[ValidatorIndex, ...],
+    shard: Shard,
+    attesting_indices: Sequence[CommitteeIndex],
+) -> Attestation:
+    """
+    Create the attestations of the given ``attestation_slot`` slot with ``validator_privkeys``.
+    """
+    (attestation,) = create_signed_attestations_at_slot(
+        state,
+        config,
+        state_machine,
+        attestation_slot,
+        beacon_block_root,
+        validator_privkeys,
+        ((committee, shard, attesting_indices),),
+    )
+    return attestation
 
 
 @to_tuple
@@ -728,3 +815,31 @@ def create_mock_deposit_data(
     )
     signature = sign_proof_of_possession(deposit_data=data, privkey=privkey)
     return data.copy(signature=signature)
+
+
+def create_mock_deposit_datas(
+    *,
+    config: Eth2Config,
+    pubkeys: Sequence[BLSPubkey],
+    privkeys: Sequence[int],
+    withdrawal_credentials: Sequence[Hash32],
+    amount: Gwei = None
+) -> Tuple[DepositData, ...]:
+    """
+    Like ``create_mock_deposit_data`` for many validators at once, signing in parallel.
+    """
+    if amount is None:
+        amount = config.MAX_EFFECTIVE_BALANCE
+
+    datas = tuple(
+        DepositData(pubkey=pubkey, withdrawal_credentials=credentials, amount=amount)
+        for pubkey, credentials in zip(pubkeys, withdrawal_credentials)
+    )
+    signatures = sign_many(
+        tuple(data.signing_root for data in datas),
+        privkeys,
+        compute_domain(SignatureDomain.DOMAIN_DEPOSIT),
+    )
+    return tuple(
+        data.copy(signature=signature) for data, signature in zip(datas, signatures)
+    )
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Sequence
+from typing import Any, Callable, Optional, Sequence, Tuple
 
 from eth.constants import ZERO_HASH32
 from eth_typing import Hash32
@@ -6,6 +6,11 @@ from eth_utils import humanize_hash
 import ssz
 from ssz.sedes import Bitvector, List, Vector, bytes32, uint64
 
+from eth2._utils.merkle.ssz_cache import (
+    FieldRootCache,
+    get_container_root_from_caches,
+    get_field_root_cache,
+)
 from eth2._utils.tuple import update_tuple_item, update_tuple_item_with_fn
 from eth2.beacon.constants import JUSTIFICATION_BITS_LENGTH, ZERO_SIGNING_ROOT
 from eth2.beacon.helpers import compute_epoch_of_slot
@@ -191,6 +196,41 @@ class BeaconState(ssz.Serializable):
             finalized_checkpoint=finalized_checkpoint,
         )
 
+    # The Merkle caches of the fields of this state, or of its closest ancestor
+    # (see ``copy``) whose root was computed.
+    _field_root_caches: Optional[Tuple[FieldRootCache, ...]] = None
+    _cached_hash_tree_root: Optional[Hash32] = None
+
+    @property
+    def hash_tree_root(self) -> Hash32:
+        """
+        Compute the root from per-field Merkle caches, only rehashing the parts
+        of the fields which differ from the state these caches were built for.
+        """
+        if self._cached_hash_tree_root is None:
+            if self._field_root_caches is None:
+                previous_caches: Sequence[Optional[FieldRootCache]] = (None,) * len(
+                    self._meta.fields
+                )
+            else:
+                previous_caches = self._field_root_caches
+
+            self._field_root_caches = tuple(
+                get_field_root_cache(sedes, value, previous_cache)
+                for (_, sedes), value, previous_cache in zip(
+                    self._meta.fields, self, previous_caches
+                )
+            )
+            self._cached_hash_tree_root = get_container_root_from_caches(
+                self._field_root_caches
+            )
+        return self._cached_hash_tree_root
+
+    def copy(self, *args: Any, **kwargs: Any) -> "BeaconState":
+        result = super().copy(*args, **kwargs)
+        result._field_root_caches = self._field_root_caches
+        return result
+
     def __str__(self) -> str:
         return (
             f"[hash_tree_root]={humanize_hash(self.hash_tree_root)}, slot={self.slot}"
@@ -62,3 +62,63 @@ def duplicates(elements: Sequence[TValue]) -> Tuple[TValue, ...]:
         collections.Counter(elements).items()
         if count > 1
     )
+
+
+def _get_rlp_item_bounds(data: bytes, offset: int) -> Tuple[int, int]:
+    """
+    Return the ``(payload_start, end)`` offsets of the RLP item starting at
+    ``offset`` within ``data``.
+    """
+    prefix = data[offset]
+    if prefix < 0x80:
+        # single byte
+        return offset, offset + 1
+    elif prefix < 0xb8:
+        # short string
+        length = prefix - 0x80
+        payload_start = offset + 1
+    elif prefix < 0xc0:
+        # long string
+        length_of_length = prefix - 0xb7
+        payload_start = offset + 1 + length_of_length
+        length = int.from_bytes(data[offset + 1:payload_start], 'big')
+    elif prefix < 0xf8:
+        # short list
+        length = prefix - 0xc0
+        payload_start = offset + 1
+    else:
+        # long list
+        length_of_length = prefix - 0xf7
+        payload_start = offset + 1 + length_of_length
+        length = int.from_bytes(data[offset + 1:payload_start], 'big')
+
+    end = payload_start + length
+    if end > len(data):
+        raise ValueError(f"RLP item at offset {offset} extends past the end of the data")
+    return payload_start, end
+
+
+def split_rlp_list(data: bytes) -> Tuple[bytes, ...]:
+    """
+    Return the still encoded items of the RLP list ``data`` without decoding
+    them.  This is considerably cheaper than ``rlp.decode`` when only the raw
+    items are needed, e.g. to compute their hashes.
+
+    Raises ``ValueError`` if ``data`` is not a well formed RLP list.
+    """
+    if not data or data[0] < 0xc0:
+        raise ValueError("RLP data is not a list")
+
+    payload_start, end = _get_rlp_item_bounds(data, 0)
+    if end != len(data):
+        raise ValueError("Trailing bytes after RLP list")
+
+    items = []
+    offset = payload_start
+    while offset < end:
+        _, item_end = _get_rlp_item_bounds(data, offset)
+        if item_end > end:
+            raise ValueError(f"RLP item at offset {offset} extends past the end of the list")
+        items.append(data[offset:item_end])
+        offset = item_end
+    return tuple(items)
@@ -30,6 +30,7 @@ from eth_utils import ExtendedDebugLogger
 
 from eth_keys import keys
 
+from p2p.priority import CommandPriority
 from p2p.typing import Capability, Capabilities, Payload, Structure, TRequestPayload
 from p2p.transport_state import TransportState
 
@@ -144,6 +145,7 @@ class SessionAPI(ABC, Hashable):
 
 class CommandAPI(ABC):
     structure: Structure
+    priority: ClassVar[CommandPriority]
 
     cmd_id: int
     cmd_id_offset: int
@@ -174,6 +176,10 @@ class CommandAPI(ABC):
     def decode(self, data: bytes) -> Payload:
         ...
 
+    @abstractmethod
+    def get_encoded_payload(self, data: bytes) -> bytes:
+        ...
+
     @abstractmethod
     def decompress_payload(self, raw_payload: bytes) -> bytes:
         ...
@@ -221,6 +227,15 @@ class TransportAPI(ABC):
     def write(self, data: bytes) -> None:
         ...
 
+    @abstractmethod
+    async def drain(self) -> None:
+        ...
+
+    @property
+    @abstractmethod
+    def write_buffer_size(self) -> int:
+        ...
+
     @abstractmethod
     async def recv(self, token: CancelToken) -> bytes:
         ...
@@ -286,6 +301,42 @@ class MultiplexerAPI(ABC):
     def get_total_msg_count(self) -> int:
         ...
 
+    @abstractmethod
+    def get_total_dropped_msg_count(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_dropped_msg_counts(self) -> Dict[Type[CommandAPI], int]:
+        ...
+
+    @abstractmethod
+    def get_filtered_msg_counts(self) -> Dict[Type[CommandAPI], int]:
+        ...
+
+    @abstractmethod
+    def get_decode_times(self) -> Dict[Type[CommandAPI], float]:
+        ...
+
+    #
+    # Message Filters
+    #
+    @abstractmethod
+    def add_msg_filter(self,
+                       command_type: Type[CommandAPI],
+                       filter_fn: Callable[[bytes], bool]) -> 'SubscriptionAPI':
+        ...
+
+    #
+    # Outgoing Backpressure
+    #
+    @abstractmethod
+    def get_write_buffer_size(self) -> int:
+        ...
+
+    @abstractmethod
+    async def drain(self) -> None:
+        ...
+
     #
     # Proxy Transport properties and methods
     #
@@ -1,9 +1,17 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
 import os
 import random
 import struct
-from typing import Tuple
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 import sha3
 
@@ -21,7 +29,10 @@ from cancel_token import CancelToken
 
 from p2p import ecies
 from p2p.abc import NodeAPI
-from p2p.constants import REPLY_TIMEOUT
+from p2p.constants import (
+    HANDSHAKE_CRYPTO_WORKERS,
+    REPLY_TIMEOUT,
+)
 from p2p.exceptions import (
     BadAckMessage,
     DecryptionError,
@@ -44,6 +55,40 @@ from .constants import (
 )
 
 
+TReturn = TypeVar('TReturn')
+
+
+_crypto_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_crypto_executor() -> ThreadPoolExecutor:
+    global _crypto_executor
+    if _crypto_executor is None:
+        _crypto_executor = ThreadPoolExecutor(
+            max_workers=HANDSHAKE_CRYPTO_WORKERS,
+            thread_name_prefix='p2p-handshake-crypto',
+        )
+    return _crypto_executor
+
+
+async def run_in_crypto_executor(token: CancelToken,
+                                 fn: Callable[..., TReturn],
+                                 *args: Any) -> TReturn:
+    """
+    Run the (CPU bound) handshake crypto ``fn(*args)`` in a worker thread so
+    that a burst of incoming or outgoing connections does not block the event
+    loop.  The handshakes only run in parallel with each other if the eth_keys
+    backend in use releases the GIL, which the pure python one does not.
+
+    A thread pool is used rather than a process pool because the handshake
+    objects hold on to a :class:`~cancel_token.CancelToken` and cannot be pickled.
+    """
+    loop = asyncio.get_event_loop()
+    return await token.cancellable_wait(
+        loop.run_in_executor(_get_crypto_executor(), functools.partial(fn, *args)),
+    )
+
+
 async def handshake(
         remote: NodeAPI,
         privkey: datatypes.PrivateKey,
@@ -83,8 +128,11 @@ async def _handshake(initiator: 'HandshakeInitiator', reader: asyncio.StreamRead
     connected readers/writers for our tests.
     """
     initiator_nonce = keccak(os.urandom(HASH_LEN))
-    auth_msg = initiator.create_auth_message(initiator_nonce)
-    auth_init = initiator.encrypt_auth_message(auth_msg)
+    auth_init = await run_in_crypto_executor(
+        token,
+        initiator.create_encrypted_auth_message,
+        initiator_nonce,
+    )
 
     if writer.transport.is_closing():
         raise HandshakeFailure("Error during handshake with {initiator.remote!r}. Writer closed.")
@@ -100,17 +148,14 @@ async def _handshake(initiator: 'HandshakeInitiator', reader: asyncio.StreamRead
         # (https://github.com/ethereum/py-evm/issues/901).
         raise HandshakeFailure(f"{initiator.remote!r} disconnected before sending auth ack")
 
-    ephemeral_pubkey, responder_nonce = initiator.decode_auth_ack_message(auth_ack)
-    aes_secret, mac_secret, egress_mac, ingress_mac = initiator.derive_secrets(
+    return await run_in_crypto_executor(
+        token,
+        initiator.derive_secrets_from_auth_ack,
         initiator_nonce,
-        responder_nonce,
-        ephemeral_pubkey,
         auth_init,
-        auth_ack
+        auth_ack,
     )
 
-    return aes_secret, mac_secret, egress_mac, ingress_mac
-
 
 class HandshakeBase:
     logger = logging.getLogger("p2p.peer.Handshake")
@@ -188,6 +233,9 @@ class HandshakeInitiator(HandshakeBase):
             auth_msg = ecies.encrypt(auth_message, self.remote.pubkey)
         return auth_msg
 
+    def create_encrypted_auth_message(self, nonce: bytes) -> bytes:
+        return self.encrypt_auth_message(self.create_auth_message(nonce))
+
     def create_auth_message(self, nonce: bytes) -> bytes:
         ecdh_shared_secret = ecies.ecdh_agree(self.privkey, self.remote.pubkey)
         secret_xor_nonce = sxor(ecdh_shared_secret, nonce)
@@ -216,6 +264,20 @@ class HandshakeInitiator(HandshakeBase):
             eph_pubkey, nonce, _ = decode_ack_eip8(ciphertext, self.privkey)
         return eph_pubkey, nonce
 
+    def derive_secrets_from_auth_ack(self,
+                                     initiator_nonce: bytes,
+                                     auth_init_ciphertext: bytes,
+                                     auth_ack_ciphertext: bytes,
+                                     ) -> Tuple[bytes, bytes, sha3.keccak_256, sha3.keccak_256]:
+        ephemeral_pubkey, responder_nonce = self.decode_auth_ack_message(auth_ack_ciphertext)
+        return self.derive_secrets(
+            initiator_nonce,
+            responder_nonce,
+            ephemeral_pubkey,
+            auth_init_ciphertext,
+            auth_ack_ciphertext,
+        )
+
 
 class HandshakeResponder(HandshakeBase):
 
@@ -238,6 +300,9 @@ class HandshakeResponder(HandshakeBase):
             auth_ack = ecies.encrypt(ack_message, self.remote.pubkey)
         return auth_ack
 
+    def create_encrypted_auth_ack_message(self, nonce: bytes) -> bytes:
+        return self.encrypt_auth_ack_message(self.create_auth_ack_message(nonce))
+
 
 eip8_ack_sedes = sedes.List(
     [
@@ -139,6 +139,20 @@ class Connection(ConnectionAPI, BaseService):
                 "`Connection.start_protocol_streams()` is being called"
             ) from err
 
+        try:
+            await self._feed_protocol_messages(protocol)
+        except MalformedMessage as err:
+            # Payloads are decoded lazily by the multiplexer so decoding
+            # errors surface here rather than in `_run`.
+            self.logger.debug(
+                "Disconnecting peer %s for sending MalformedMessage: %s",
+                self.remote,
+                err,
+            )
+            self.get_base_protocol().send_disconnect(DisconnectReason.bad_protocol)
+            self.cancel_nowait()
+
+    async def _feed_protocol_messages(self, protocol: ProtocolAPI) -> None:
         # we don't need to use wait_iter here because the multiplexer does it
         # for us.
         async for cmd, msg in self._multiplexer.stream_protocol_messages(protocol):
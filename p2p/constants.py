@@ -38,6 +38,20 @@ CONN_IDLE_TIMEOUT = 30
 # The amount of seconds a connection can be idle.
 HANDSHAKE_TIMEOUT = 10
 
+# Outgoing messages are coalesced into a single write to the socket. The
+# pending data is flushed as soon as it reaches this size (in bytes)...
+TRANSPORT_WRITE_COALESCE_SIZE = 64 * 1024
+
+# ...or after this many seconds have passed since the first buffered message.
+TRANSPORT_WRITE_COALESCE_DELAY = 0.001
+
+# Write buffer water marks (in bytes) for a single connection.  Once the
+# amount of data which has not yet been handed to the socket goes above the
+# high water mark, `TransportAPI.drain()` blocks until it drops below the low
+# water mark.
+TRANSPORT_WRITE_HIGH_WATER = 4 * 1024 * 1024
+TRANSPORT_WRITE_LOW_WATER = 1024 * 1024
+
 # Timeout used when waiting for a reply from a remote node.
 REPLY_TIMEOUT = 3
 MAX_REQUEST_ATTEMPTS = 3
@@ -135,6 +149,31 @@ REQUEST_PEER_CANDIDATE_TIMEOUT = 1
 # The maximum number of concurrent attempts to establis new peer connections
 MAX_CONCURRENT_CONNECTION_ATTEMPTS = 10
 
+# The initial and maximum amount of time we wait before dialing a node again
+# after a failed connection attempt.  The wait doubles with every consecutive
+# failure.
+DIAL_BACKOFF_INITIAL = 4
+DIAL_BACKOFF_MAX = 60 * 30  # 30 minutes
+
+# Maximum number of nodes for which we keep dialing history
+MAX_TRACKED_DIAL_CANDIDATES = 4096
+
+# Number of worker threads used to perform the ECIES/ECDH operations of the
+# RLPx auth handshake off of the event loop.
+HANDSHAKE_CRYPTO_WORKERS = 4
+
+# The maximum number of inbound handshakes we will be processing at any given
+# time.  Connections received while at this limit are dropped immediately.
+MAX_CONCURRENT_INBOUND_HANDSHAKES = 32
+
+# Rate (per second) and burst size at which a single IP address may start new
+# inbound handshakes with us.
+INBOUND_HANDSHAKE_RATE_PER_IP = 0.5
+INBOUND_HANDSHAKE_BURST_PER_IP = 5
+
+# Maximum number of IP addresses for which we track the inbound handshake rate.
+MAX_TRACKED_HANDSHAKE_IPS = 4096
+
 # Amount of time a peer will be blacklisted when they are disconnected as
 # `DisconnectReason.bad_protocol`
 BLACKLIST_SECONDS_BAD_PROTOCOL = 60 * 10  # 10 minutes
@@ -0,0 +1,181 @@
+import collections
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from p2p.abc import NodeAPI
+from p2p.constants import (
+    DIAL_BACKOFF_INITIAL,
+    DIAL_BACKOFF_MAX,
+    HANDSHAKE_TIMEOUT,
+    MAX_TRACKED_DIAL_CANDIDATES,
+)
+from p2p.stats.ema import EMA
+
+
+# Scores are multiplied by this when the last attempt to connect to a node
+# failed because we don't share any protocol/network with it.
+PROTOCOL_MISMATCH_PENALTY = 0.01
+
+
+class DialHistory:
+    """
+    The outcome of our past attempts to connect to a single node.
+    """
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.successes = 0
+        self.consecutive_failures = 0
+        self.next_dial_at = 0.0
+        self.protocol_mismatch = False
+
+        self.handshake_latency: Optional[EMA] = None
+
+        # 0-100, derived from the performance trackers of our past connections
+        # to this node, see `p2p.exchange.BasePerformanceTracker`.
+        self.response_quality: Optional[float] = None
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing so that nodes we know nothing about sit halfway
+        # between nodes which always and never work.
+        return (self.successes + 1) / (self.attempts + 2)
+
+    @property
+    def score(self) -> float:
+        if self.handshake_latency is None:
+            latency_factor = 0.5
+        else:
+            latency_factor = 1 - min(1.0, self.handshake_latency.value / HANDSHAKE_TIMEOUT)
+
+        if self.response_quality is None:
+            quality_factor = 0.5
+        else:
+            quality_factor = self.response_quality / 100
+
+        score = self.success_rate * (1 + latency_factor) * (1 + quality_factor)
+        if self.protocol_mismatch:
+            return score * PROTOCOL_MISMATCH_PENALTY
+        else:
+            return score
+
+
+class DialScheduler:
+    """
+    Decide which peer candidates should be dialed, and in which order, based
+    on the outcome of past connection attempts.
+
+    Nodes which failed to connect are backed off exponentially, starting at
+    ``backoff_initial`` seconds and up to ``backoff_max``.  The remaining
+    candidates are ordered by a score combining the success rate and handshake
+    latency of past dials, the response quality of past connections and
+    whether they share a protocol with us.
+
+    Also keeps track of how long it took for the pool to reach a number of
+    connected peers.
+    """
+    def __init__(self,
+                 peer_count_targets: Iterable[int] = (),
+                 backoff_initial: float = DIAL_BACKOFF_INITIAL,
+                 backoff_max: float = DIAL_BACKOFF_MAX,
+                 max_tracked_nodes: int = MAX_TRACKED_DIAL_CANDIDATES,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._max_tracked_nodes = max_tracked_nodes
+        self._clock = clock
+
+        self._history: 'collections.OrderedDict[NodeAPI, DialHistory]' = collections.OrderedDict()
+
+        self._started_at = clock()
+        self._peer_count_targets = tuple(sorted(set(
+            target for target in peer_count_targets if target > 0
+        )))
+        self._time_to_peers: Dict[int, float] = {}
+
+    def get_history(self, remote: NodeAPI) -> DialHistory:
+        try:
+            history = self._history[remote]
+        except KeyError:
+            history = self._history[remote] = DialHistory()
+            if len(self._history) > self._max_tracked_nodes:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(remote)
+        return history
+
+    def score(self, remote: NodeAPI) -> float:
+        if remote in self._history:
+            return self._history[remote].score
+        else:
+            return DialHistory().score
+
+    def is_backing_off(self, remote: NodeAPI) -> bool:
+        if remote not in self._history:
+            return False
+        return self._history[remote].next_dial_at > self._clock()
+
+    def prioritize(self, candidates: Iterable[NodeAPI]) -> Tuple[NodeAPI, ...]:
+        """
+        Return the candidates which are not being backed off, best first.
+        """
+        eligible = tuple(
+            candidate for candidate in candidates
+            if not self.is_backing_off(candidate)
+        )
+        # `sorted` is stable so candidates with equal scores keep the order in
+        # which the backend returned them.
+        return tuple(sorted(eligible, key=self.score, reverse=True))
+
+    def record_success(self, remote: NodeAPI, handshake_latency: float) -> None:
+        history = self.get_history(remote)
+        history.attempts += 1
+        history.successes += 1
+        history.consecutive_failures = 0
+        history.next_dial_at = 0.0
+        history.protocol_mismatch = False
+        if history.handshake_latency is None:
+            history.handshake_latency = EMA(handshake_latency, smoothing_factor=0.5)
+        else:
+            history.handshake_latency.update(handshake_latency)
+
+    def record_failure(self, remote: NodeAPI, protocol_mismatch: bool = False) -> None:
+        history = self.get_history(remote)
+        history.attempts += 1
+        history.consecutive_failures += 1
+        history.protocol_mismatch = protocol_mismatch
+
+        if protocol_mismatch:
+            backoff = self._backoff_max
+        else:
+            backoff = min(
+                self._backoff_max,
+                self._backoff_initial * 2 ** (history.consecutive_failures - 1),
+            )
+        history.next_dial_at = self._clock() + backoff
+
+    def record_response_quality(self, remote: NodeAPI, response_quality: float) -> None:
+        self.get_history(remote).response_quality = response_quality
+
+    def record_peer_count(self, peer_count: int) -> Tuple[Tuple[int, float], ...]:
+        """
+        Record the current number of connected peers, returning the
+        ``(target, elapsed_seconds)`` pairs of the peer count targets which
+        were reached for the first time.
+        """
+        elapsed = self._clock() - self._started_at
+        newly_reached = tuple(
+            (target, elapsed)
+            for target in self._peer_count_targets
+            if target <= peer_count and target not in self._time_to_peers
+        )
+        self._time_to_peers.update(newly_reached)
+        return newly_reached
+
+    def get_time_to_peers(self) -> Dict[int, float]:
+        return dict(self._time_to_peers)
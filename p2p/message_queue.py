@@ -0,0 +1,98 @@
+import asyncio
+import collections
+from typing import (
+    Deque,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from p2p.abc import CommandAPI
+from p2p.priority import CommandPriority, DropPolicy
+
+
+class PriorityClass(NamedTuple):
+    max_size: int
+    drop_policy: DropPolicy
+
+
+def get_default_priority_classes(max_queue_size: int) -> Dict[CommandPriority, PriorityClass]:
+    return {
+        CommandPriority.RESPONSE: PriorityClass(max_queue_size, DropPolicy.DROP_NEWEST),
+        CommandPriority.DEFAULT: PriorityClass(max_queue_size, DropPolicy.DROP_NEWEST),
+        # Newer gossip is more relevant than older gossip so we make room for
+        # it instead of discarding it.
+        CommandPriority.GOSSIP: PriorityClass(max_queue_size, DropPolicy.DROP_OLDEST),
+    }
+
+
+TMessage = Tuple[CommandAPI, bytes]
+
+
+class PriorityMessageQueue:
+    """
+    A queue of ``(command, encoded_payload)`` pairs with one bounded FIFO for each
+    :class:`~p2p.priority.CommandPriority`.  Messages are always handed out
+    from the highest priority (lowest value) class which is not empty, so a
+    flood of gossip can never delay replies to our own requests.
+
+    This queue only supports a single consumer.
+    """
+    def __init__(self, priority_classes: Mapping[CommandPriority, PriorityClass]) -> None:
+        missing = set(CommandPriority).difference(priority_classes)
+        if missing:
+            raise ValueError(f"Missing configuration for priority classes: {missing}")
+
+        self._priority_classes = priority_classes
+        self._queues: Dict[CommandPriority, Deque[TMessage]] = {
+            priority: collections.deque()
+            for priority in sorted(CommandPriority)
+        }
+        self._not_empty = asyncio.Event()
+
+    def qsize(self, priority: CommandPriority = None) -> int:
+        if priority is None:
+            return sum(len(queue) for queue in self._queues.values())
+        else:
+            return len(self._queues[priority])
+
+    def empty(self) -> bool:
+        return not any(self._queues.values())
+
+    def put_nowait(self, cmd: CommandAPI, encoded_payload: bytes) -> Optional[CommandAPI]:
+        """
+        Add a message to the queue of its command's priority class.
+
+        If that queue is full a message is dropped according to the class's
+        :class:`~p2p.priority.DropPolicy`, and the command of the dropped
+        message is returned.  Otherwise return ``None``.
+        """
+        priority_class = self._priority_classes[cmd.priority]
+        queue = self._queues[cmd.priority]
+
+        dropped: Optional[CommandAPI] = None
+        if len(queue) >= priority_class.max_size:
+            if priority_class.drop_policy is DropPolicy.DROP_NEWEST:
+                return cmd
+            elif priority_class.drop_policy is DropPolicy.DROP_OLDEST:
+                dropped, _ = queue.popleft()
+            else:
+                raise Exception(f"Invariant: unknown drop policy {priority_class.drop_policy}")
+
+        queue.append((cmd, encoded_payload))
+        self._not_empty.set()
+        return dropped
+
+    def get_nowait(self) -> TMessage:
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()
+        raise asyncio.QueueEmpty
+
+    async def get(self) -> TMessage:
+        while self.empty():
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
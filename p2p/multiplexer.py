@@ -1,10 +1,15 @@
 import asyncio
 import collections
+import functools
+import time
 from typing import (
     AsyncIterator,
+    Callable,
     cast,
     DefaultDict,
     Dict,
+    List,
+    Mapping,
     Sequence,
     Tuple,
     Type,
@@ -29,6 +34,7 @@ from p2p.abc import (
     NodeAPI,
     ProtocolAPI,
     SessionAPI,
+    SubscriptionAPI,
     TransportAPI,
     TProtocol,
 )
@@ -37,9 +43,16 @@ from p2p.exceptions import (
     UnknownProtocol,
     UnknownProtocolCommand,
 )
+from p2p.message_queue import (
+    get_default_priority_classes,
+    PriorityClass,
+    PriorityMessageQueue,
+)
 from p2p.p2p_proto import BaseP2PProtocol
+from p2p.priority import CommandPriority
 from p2p.protocol import Protocol
 from p2p.resource_lock import ResourceLock
+from p2p.subscription import Subscription
 from p2p.transport_state import TransportState
 from p2p.typing import Payload
 
@@ -52,6 +65,25 @@ async def stream_transport_messages(transport: TransportAPI,
     """
     Streams 3-tuples of (Protocol, Command, Payload) over the provided `Transport`
     """
+    raw_msg_stream = stream_raw_transport_messages(
+        transport,
+        base_protocol,
+        *protocols,
+        token=token,
+    )
+    async for msg_proto, cmd, raw_msg in raw_msg_stream:
+        yield msg_proto, cmd, cmd.decode(raw_msg)
+
+
+async def stream_raw_transport_messages(transport: TransportAPI,
+                                        base_protocol: BaseP2PProtocol,
+                                        *protocols: ProtocolAPI,
+                                        token: CancelToken = None,
+                                        ) -> AsyncIterator[Tuple[ProtocolAPI, CommandAPI, bytes]]:
+    """
+    Streams 3-tuples of (Protocol, Command, raw message) over the provided
+    `Transport` without decoding the message payloads.
+    """
     # A cache for looking up the proper protocol instance for a given command
     # id.
     cmd_id_cache: Dict[int, ProtocolAPI] = {}
@@ -81,9 +113,8 @@ async def stream_transport_messages(transport: TransportAPI,
 
         msg_proto = cmd_id_cache[cmd_id]
         cmd = msg_proto.cmd_by_id[cmd_id]
-        msg = cmd.decode(raw_msg)
 
-        yield msg_proto, cmd, msg
+        yield msg_proto, cmd, raw_msg
 
         # yield to the event loop for a moment to allow `transport.is_closing`
         # a chance to update.
@@ -97,16 +128,21 @@ class Multiplexer(CancellableMixin, MultiplexerAPI):
 
     _transport: TransportAPI
     _msg_counts: DefaultDict[Type[CommandAPI], int]
+    _dropped_msg_counts: DefaultDict[Type[CommandAPI], int]
+    _filtered_msg_counts: DefaultDict[Type[CommandAPI], int]
+    _decode_times: DefaultDict[Type[CommandAPI], float]
+    _msg_filters: DefaultDict[Type[CommandAPI], List[Callable[[bytes], bool]]]
 
     _protocol_locks: ResourceLock
-    _protocol_queues: Dict[Type[ProtocolAPI], 'asyncio.Queue[Tuple[CommandAPI, Payload]]']
+    _protocol_queues: Dict[Type[ProtocolAPI], PriorityMessageQueue]
 
     def __init__(self,
                  transport: TransportAPI,
                  base_protocol: BaseP2PProtocol,
                  protocols: Sequence[ProtocolAPI],
                  token: CancelToken = None,
-                 max_queue_size: int = 4096) -> None:
+                 max_queue_size: int = 4096,
+                 priority_classes: Mapping[CommandPriority, PriorityClass] = None) -> None:
         if token is None:
             loop = None
         else:
@@ -134,14 +170,23 @@ class Multiplexer(CancellableMixin, MultiplexerAPI):
         self._protocol_locks = ResourceLock()
 
         # Each protocol gets a queue where messages for the individual protocol
-        # are placed when streamed from the transport
+        # are placed when streamed from the transport.  Each queue is split
+        # into separately bounded priority classes so that replies to our own
+        # requests are never stuck behind (or dropped because of) gossip.
+        if priority_classes is None:
+            priority_classes = get_default_priority_classes(max_queue_size)
         self._protocol_queues = {
-            type(protocol): asyncio.Queue(max_queue_size)
+            type(protocol): PriorityMessageQueue(priority_classes)
             for protocol
             in self.get_protocols()
         }
 
         self._msg_counts = collections.defaultdict(int)
+        self._dropped_msg_counts = collections.defaultdict(int)
+        self._filtered_msg_counts = collections.defaultdict(int)
+        self._decode_times = collections.defaultdict(float)
+
+        self._msg_filters = collections.defaultdict(list)
 
     def __str__(self) -> str:
         protocol_infos = ','.join(tuple(
@@ -166,6 +211,72 @@ class Multiplexer(CancellableMixin, MultiplexerAPI):
     def get_total_msg_count(self) -> int:
         return sum(self._msg_counts.values())
 
+    def get_total_dropped_msg_count(self) -> int:
+        return sum(self._dropped_msg_counts.values())
+
+    def get_dropped_msg_counts(self) -> Dict[Type[CommandAPI], int]:
+        return dict(self._dropped_msg_counts)
+
+    def get_filtered_msg_counts(self) -> Dict[Type[CommandAPI], int]:
+        return dict(self._filtered_msg_counts)
+
+    def get_decode_times(self) -> Dict[Type[CommandAPI], float]:
+        """
+        Return the total number of seconds spent decoding the payloads of each
+        command type.
+        """
+        return dict(self._decode_times)
+
+    #
+    # Message Filters
+    #
+    def add_msg_filter(self,
+                       command_type: Type[CommandAPI],
+                       filter_fn: Callable[[bytes], bool]) -> SubscriptionAPI:
+        """
+        Register a cheap pre-filter for messages of the given command type.
+
+        The ``filter_fn`` is called with the RLP encoded payload of every
+        incoming message of that type *before* it is decoded.  Messages for
+        which it returns ``False`` are discarded without ever being decoded.
+        """
+        if not any(protocol.supports_command(command_type) for protocol in self.get_protocols()):
+            raise UnknownProtocolCommand(
+                f"Command {command_type} was not found in the connected "
+                f"protocols: {self.get_protocols()}"
+            )
+        self._msg_filters[command_type].append(filter_fn)
+        cancel_fn = functools.partial(self._msg_filters[command_type].remove, filter_fn)
+        return Subscription(cancel_fn)
+
+    def _should_queue(self, cmd: CommandAPI, encoded_payload: bytes) -> bool:
+        return all(
+            filter_fn(encoded_payload)
+            for filter_fn
+            in self._msg_filters.get(type(cmd), ())
+        )
+
+    def _decode_payload(self, cmd: CommandAPI, encoded_payload: bytes) -> Payload:
+        start_at = time.perf_counter()
+        try:
+            return cmd.decode_payload(encoded_payload)
+        finally:
+            self._decode_times[type(cmd)] += time.perf_counter() - start_at
+
+    #
+    # Outgoing Backpressure
+    #
+    def get_write_buffer_size(self) -> int:
+        return self._transport.write_buffer_size
+
+    async def drain(self) -> None:
+        """
+        Wait until the outgoing data buffered for this connection is below the
+        transport's low water mark.  Callers which send large amounts of data
+        (e.g. request servers) should await this before producing more.
+        """
+        await self.wait(self._transport.drain())
+
     #
     # Proxy Transport methods
     #
@@ -298,9 +409,13 @@ class Multiplexer(CancellableMixin, MultiplexerAPI):
                     # the event loop.  Since this is an async generator it will
                     # yield to the loop each time it returns a value so we
                     # don't have to worry about this blocking other processes.
-                    yield msg_queue.get_nowait()
+                    cmd, encoded_payload = msg_queue.get_nowait()
                 except asyncio.QueueEmpty:
-                    yield await self.wait(msg_queue.get(), token=token)
+                    cmd, encoded_payload = await self.wait(msg_queue.get(), token=token)
+
+                # Payloads are only decoded once they are consumed so that we
+                # never pay for deserializing messages which end up dropped.
+                yield cmd, self._decode_payload(cmd, encoded_payload)
 
     #
     # Message reading and streaming API
@@ -384,31 +499,45 @@ class Multiplexer(CancellableMixin, MultiplexerAPI):
         Background task that reads messages from the transport and feeds them
         into individual queues for each of the protocols.
         """
-        msg_stream = self.wait_iter(stream_transport_messages(
+        msg_stream = self.wait_iter(stream_raw_transport_messages(
             self._transport,
             self._base_protocol,
             *self._protocols,
             token=token,
         ), token=token)
-        async for protocol, cmd, msg in msg_stream:
+        async for protocol, cmd, raw_msg in msg_stream:
             # track total number of messages received for each command type.
             self._msg_counts[type(cmd)] += 1
 
-            queue = self._protocol_queues[type(protocol)]
-            try:
-                # We must use `put_nowait` here to ensure that in the event
-                # that a single protocol queue is full that we don't block
-                # other protocol messages getting through.
-                queue.put_nowait((cmd, msg))
-            except asyncio.QueueFull:
-                self.logger.error(
-                    (
-                        "Multiplexing queue for protocol '%s' full. "
-                        "discarding message: %s"
-                    ),
-                    protocol,
-                    cmd,
-                )
+            encoded_payload = cmd.get_encoded_payload(raw_msg)
+            if self._should_queue(cmd, encoded_payload):
+                self._queue_msg(protocol, cmd, encoded_payload)
+            else:
+                self._filtered_msg_counts[type(cmd)] += 1
 
             if stop.is_set():
                 break
+
+    def _queue_msg(self, protocol: ProtocolAPI, cmd: CommandAPI, encoded_payload: bytes) -> None:
+        queue = self._protocol_queues[type(protocol)]
+        # We must use `put_nowait` here to ensure that in the event
+        # that a single protocol queue is full that we don't block
+        # other protocol messages getting through.
+        dropped_cmd = queue.put_nowait(cmd, encoded_payload)
+        if dropped_cmd is None:
+            return
+
+        self._dropped_msg_counts[type(dropped_cmd)] += 1
+        if dropped_cmd.priority is CommandPriority.GOSSIP:
+            log_fn = self.logger.debug
+        else:
+            log_fn = self.logger.error
+        log_fn(
+            (
+                "Multiplexing queue for protocol '%s' full (priority=%s). "
+                "discarding message: %s"
+            ),
+            protocol,
+            dropped_cmd.priority.name,
+            dropped_cmd,
+        )
@@ -41,6 +41,7 @@ from p2p.abc import (
 )
 from p2p.constants import BLACKLIST_SECONDS_BAD_PROTOCOL
 from p2p.disconnect import DisconnectReason
+from p2p.exchange.abc import PerformanceAPI
 from p2p.exceptions import (
     UnknownProtocol,
 )
@@ -203,6 +204,13 @@ class BasePeer(BaseService):
     def get_extra_stats(self) -> Tuple[str, ...]:
         return tuple()
 
+    def get_performance_trackers(self) -> Tuple[PerformanceAPI, ...]:
+        """
+        Return the performance trackers of the request/response exchanges we
+        have with this peer.
+        """
+        return tuple()
+
     boot_manager_class: Type[BasePeerBootManager] = BasePeerBootManager
 
     def get_boot_manager(self) -> BasePeerBootManager:
@@ -212,6 +220,21 @@ class BasePeer(BaseService):
     def received_msgs_count(self) -> int:
         return self.connection.get_multiplexer().get_total_msg_count()
 
+    @property
+    def dropped_msgs_count(self) -> int:
+        return self.connection.get_multiplexer().get_total_dropped_msg_count()
+
+    @property
+    def write_buffer_size(self) -> int:
+        return self.connection.get_multiplexer().get_write_buffer_size()
+
+    async def drain(self) -> None:
+        """
+        Wait until the outgoing data buffered for this peer is below the low
+        water mark of its transport.
+        """
+        await self.connection.get_multiplexer().drain()
+
     def add_subscriber(self, subscriber: 'PeerSubscriber') -> None:
         self._subscribers.append(subscriber)
 
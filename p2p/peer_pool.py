@@ -1,6 +1,8 @@
 from abc import abstractmethod
 import asyncio
 import operator
+import statistics
+import time
 from typing import (
     AsyncIterator,
     AsyncIterable,
@@ -67,6 +69,7 @@ from p2p.peer_backend import (
     DiscoveryPeerBackend,
     BootnodesPeerBackend,
 )
+from p2p.dialing import DialScheduler
 from p2p.disconnect import (
     DisconnectReason,
 )
@@ -76,6 +79,7 @@ from p2p.resource_lock import (
 from p2p.service import (
     BaseService,
 )
+from p2p.stats.rate import RateMeter
 from p2p.token_bucket import TokenBucket
 from p2p.tracking.connection import (
     BaseConnectionTracker,
@@ -111,17 +115,25 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
     _peer_boot_timeout = DEFAULT_PEER_BOOT_TIMEOUT
     _event_bus: EndpointAPI = None
 
+    # Connection failures which indicate that we don't share a protocol or
+    # network with the remote, and so should not retry it any time soon.
+    protocol_mismatch_exceptions: Tuple[Type[BaseException], ...] = (
+        NoMatchingPeerCapabilities,
+    )
+
     def __init__(self,
                  privkey: datatypes.PrivateKey,
                  context: BasePeerContext,
                  max_peers: int = DEFAULT_MAX_PEERS,
                  token: CancelToken = None,
                  event_bus: EndpointAPI = None,
+                 max_dials_in_flight: int = MAX_CONCURRENT_CONNECTION_ATTEMPTS,
                  ) -> None:
         super().__init__(token)
 
         self.privkey = privkey
         self.max_peers = max_peers
+        self.max_dials_in_flight = max_dials_in_flight
         self.context = context
 
         self.connected_nodes: Dict[SessionAPI, BasePeer] = {}
@@ -130,11 +142,21 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         self._event_bus = event_bus
 
         # Restricts the number of concurrent connection attempts can be made
-        self._connection_attempt_lock = asyncio.BoundedSemaphore(MAX_CONCURRENT_CONNECTION_ATTEMPTS)
+        self._connection_attempt_lock = asyncio.BoundedSemaphore(max_dials_in_flight)
+
+        # Decides which candidates to dial first, and which to back off from.
+        self.dial_scheduler = DialScheduler(
+            peer_count_targets=(1, max_peers // 4, max_peers // 2, max_peers),
+        )
 
         # Ensure we can only have a single concurrent handshake in flight per remote
         self._handshake_locks = ResourceLock()
 
+        # Track the rate of successfully completed handshakes.  Inbound
+        # handshakes are recorded by the server that accepts the connection.
+        self.outbound_handshake_rate = RateMeter()
+        self.inbound_handshake_rate = RateMeter()
+
         self.peer_backends = self.setup_peer_backends()
         self.connection_tracker = self.setup_connection_tracker()
 
@@ -298,6 +320,8 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         """
         self.logger.info('Adding %s to pool', peer)
         self.connected_nodes[peer.session] = peer
+        for target, elapsed in self.dial_scheduler.record_peer_count(len(self)):
+            self.logger.info("Reached %d peers after %s", target, humanize_seconds(elapsed))
         peer.add_finished_callback(self._peer_finished)
         for subscriber in self._subscribers:
             subscriber.register_peer(peer)
@@ -356,10 +380,12 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
 
             try:
                 self.logger.debug2("Connecting to %s...", remote)
-                return await self.wait(
+                peer = await self.wait(
                     self.get_peer_factory().handshake(remote),
                     timeout=HANDSHAKE_TIMEOUT,
                 )
+                self.outbound_handshake_rate.record()
+                return peer
             except OperationCancelled:
                 # Pass it on to instruct our main loop to stop.
                 raise
@@ -394,8 +420,9 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                 raise
 
     async def connect_to_nodes(self, nodes: Iterator[NodeAPI]) -> None:
-        # create an generator for the nodes
-        nodes_iter = iter(nodes)
+        # dial the most promising nodes first, skipping those we are backing
+        # off from.
+        nodes_iter = iter(self.dial_scheduler.prioritize(nodes))
 
         while True:
             if self.is_full or not self.is_operational:
@@ -404,7 +431,7 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
             # only attempt to connect to up to the maximum number of available
             # peer slots that are open.
             available_peer_slots = self.max_peers - len(self)
-            batch_size = clamp(1, 10, available_peer_slots)
+            batch_size = clamp(1, self.max_dials_in_flight, available_peer_slots)
             batch = tuple(take(batch_size, nodes_iter))
 
             # There are no more *known* nodes to connect to.
@@ -433,9 +460,18 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
 
         try:
             async with self._connection_attempt_lock:
+                started_at = time.monotonic()
                 peer = await self.connect(node)
-        except ALLOWED_PEER_CONNECTION_EXCEPTIONS:
+        except IneligiblePeer:
+            return
+        except ALLOWED_PEER_CONNECTION_EXCEPTIONS as err:
+            self.dial_scheduler.record_failure(
+                node,
+                protocol_mismatch=isinstance(err, self.protocol_mismatch_exceptions),
+            )
             return
+        else:
+            self.dial_scheduler.record_success(node, time.monotonic() - started_at)
 
         # Check again to see if we have *become* full since the previous
         # check.
@@ -480,6 +516,17 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         for subscriber in self._subscribers:
             subscriber.deregister_peer(peer)
 
+    def _record_response_quality(self, peer: BasePeer) -> None:
+        trackers = tuple(
+            tracker for tracker in peer.get_performance_trackers()
+            if tracker.total_msgs
+        )
+        if trackers:
+            response_quality = statistics.mean(
+                tracker.response_quality_ema.value for tracker in trackers
+            )
+            self.dial_scheduler.record_response_quality(peer.remote, response_quality)
+
     async def __aiter__(self) -> AsyncIterator[BasePeer]:
         for peer in tuple(self.connected_nodes.values()):
             # Yield control to ensure we process any disconnection requests from peers. Otherwise
@@ -494,6 +541,13 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                 [peer for peer in self.connected_nodes.values() if peer.inbound])
             self.logger.info("Connected peers: %d inbound, %d outbound",
                              inbound_peers, (len(self.connected_nodes) - inbound_peers))
+            self.logger.debug(
+                "Handshakes/sec: %.2f inbound (total=%d), %.2f outbound (total=%d)",
+                self.inbound_handshake_rate.pop_rate(),
+                self.inbound_handshake_rate.total,
+                self.outbound_handshake_rate.pop_rate(),
+                self.outbound_handshake_rate.total,
+            )
             subscribers = len(self._subscribers)
             if subscribers:
                 longest_queue = max(
@@ -510,11 +564,14 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                     self.logger.debug(
                         "%s is no longer alive but had not been removed from pool", peer)
                     continue
+                self._record_response_quality(peer)
                 self.logger.debug(
-                    "%s: uptime=%s, received_msgs=%d",
+                    "%s: uptime=%s, received_msgs=%d, dropped_msgs=%d, write_buffer=%d bytes",
                     peer,
                     humanize_seconds(peer.uptime),
                     peer.received_msgs_count,
+                    peer.dropped_msgs_count,
+                    peer.write_buffer_size,
                 )
                 self.logger.debug(
                     "client_version_string='%s'",
@@ -0,0 +1,22 @@
+import enum
+
+
+class CommandPriority(enum.IntEnum):
+    """
+    Priority class of an incoming command.  When a protocol has several
+    messages waiting to be consumed, those with the lowest value are handed
+    out first.
+    """
+    # Replies to requests we made.  Sync is usually blocked waiting on these.
+    RESPONSE = 0
+    # Requests from the remote and protocol control messages.
+    DEFAULT = 1
+    # Unsolicited broadcasts which can be dropped without much harm.
+    GOSSIP = 2
+
+
+class DropPolicy(enum.Enum):
+    # Discard the incoming message when the queue is full.
+    DROP_NEWEST = enum.auto()
+    # Evict the oldest queued message to make room for the incoming one.
+    DROP_OLDEST = enum.auto()
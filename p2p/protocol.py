@@ -21,6 +21,7 @@ from p2p._utils import get_devp2p_cmd_id
 from p2p.abc import CommandAPI, ProtocolAPI, RequestAPI, TransportAPI
 from p2p.constants import P2P_PROTOCOL_COMMAND_LENGTH
 from p2p.exceptions import MalformedMessage
+from p2p.priority import CommandPriority
 from p2p.typing import Capability, Payload, Structure
 
 
@@ -28,6 +29,7 @@ class Command(CommandAPI):
     _cmd_id: int = None
     decode_strict = True
     structure: Structure
+    priority: ClassVar[CommandPriority] = CommandPriority.DEFAULT
 
     _logger: logging.Logger = None
 
@@ -90,14 +92,19 @@ class Command(CommandAPI):
         }
 
     def decode(self, data: bytes) -> Payload:
+        return self.decode_payload(self.get_encoded_payload(data))
+
+    def get_encoded_payload(self, data: bytes) -> bytes:
+        """
+        Strip the command id from the raw message and decompress it, returning
+        the RLP encoded payload without deserializing it.
+        """
         packet_type = get_devp2p_cmd_id(data)
         if packet_type != self.cmd_id:
             raise MalformedMessage(f"Wrong packet type: {packet_type}, expected {self.cmd_id}")
 
         compressed_payload = data[1:]
-        encoded_payload = self.decompress_payload(compressed_payload)
-
-        return self.decode_payload(encoded_payload)
+        return self.decompress_payload(compressed_payload)
 
     def decompress_payload(self, raw_payload: bytes) -> bytes:
         # Do the Snappy Decompression only if Snappy Compression is supported by the protocol
@@ -0,0 +1,33 @@
+import time
+from typing import Callable
+
+
+class RateMeter:
+    """
+    Count occurrences of an event and report the rate (events per second) at
+    which they happened since the rate was last read.
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.total = 0
+        self._count_since_pop = 0
+        self._last_pop_at = clock()
+
+    def record(self, num: int = 1) -> None:
+        self.total += num
+        self._count_since_pop += num
+
+    def pop_rate(self) -> float:
+        """
+        Return the average rate since the last call and start over.
+        """
+        now = self._clock()
+        elapsed = now - self._last_pop_at
+        count = self._count_since_pop
+
+        self._last_pop_at = now
+        self._count_since_pop = 0
+
+        if elapsed <= 0:
+            return 0.0
+        return count / elapsed
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 import struct
-from typing import Tuple
+from typing import Tuple, cast
 
 from cached_property import cached_property
 
@@ -75,6 +75,16 @@ class MemoryTransport(TransportAPI):
     def write(self, data: bytes) -> None:
         self._writer.write(data)
 
+    async def drain(self) -> None:
+        try:
+            await self._writer.drain()
+        except CONNECTION_LOST_ERRORS as err:
+            raise PeerConnectionLost from err
+
+    @property
+    def write_buffer_size(self) -> int:
+        return cast(asyncio.WriteTransport, self._writer.transport).get_write_buffer_size()
+
     async def recv(self, token: CancelToken) -> bytes:
         self.read_state = TransportState.HEADER
         try:
@@ -1,7 +1,9 @@
 import asyncio
+import functools
 import hmac
 import secrets
 import struct
+from typing import List, cast
 
 import sha3
 
@@ -29,6 +31,7 @@ from p2p.abc import NodeAPI, TransportAPI
 from p2p.auth import (
     decode_authentication,
     HandshakeResponder,
+    run_in_crypto_executor,
 )
 from p2p.constants import (
     CONN_IDLE_TIMEOUT,
@@ -37,6 +40,10 @@ from p2p.constants import (
     HEADER_LEN,
     MAC_LEN,
     REPLY_TIMEOUT,
+    TRANSPORT_WRITE_COALESCE_DELAY,
+    TRANSPORT_WRITE_COALESCE_SIZE,
+    TRANSPORT_WRITE_HIGH_WATER,
+    TRANSPORT_WRITE_LOW_WATER,
 )
 from p2p.exceptions import (
     HandshakeFailure,
@@ -80,6 +87,17 @@ class Transport(TransportAPI):
         self._reader = reader
         self._writer = writer
 
+        # Outgoing messages are encrypted as soon as they are sent (the egress
+        # MAC is stateful so they must be encrypted in order) but are only
+        # handed over to the socket in batches. See `flush()`.
+        self._write_buffer: List[bytes] = []
+        self._write_buffer_size = 0
+        self._flush_handle: asyncio.TimerHandle = None
+        cast(asyncio.WriteTransport, self._writer.transport).set_write_buffer_limits(
+            high=TRANSPORT_WRITE_HIGH_WATER,
+            low=TRANSPORT_WRITE_LOW_WATER,
+        )
+
         # FIXME: Insecure Encryption: https://github.com/ethereum/devp2p/issues/32
         iv = b"\x00" * 16
         aes_secret = aes_secret
@@ -146,7 +164,9 @@ class Transport(TransportAPI):
             raise HandshakeFailure from err
 
         try:
-            ephem_pubkey, initiator_nonce, initiator_pubkey = decode_authentication(
+            ephem_pubkey, initiator_nonce, initiator_pubkey = await run_in_crypto_executor(
+                token,
+                decode_authentication,
                 msg,
                 private_key,
             )
@@ -164,7 +184,9 @@ class Transport(TransportAPI):
                 raise HandshakeFailure from err
 
             try:
-                ephem_pubkey, initiator_nonce, initiator_pubkey = decode_authentication(
+                ephem_pubkey, initiator_nonce, initiator_pubkey = await run_in_crypto_executor(
+                    token,
+                    decode_authentication,
                     msg,
                     private_key,
                 )
@@ -198,8 +220,11 @@ class Transport(TransportAPI):
 
         responder_nonce = secrets.token_bytes(HASH_LEN)
 
-        auth_ack_msg = responder.create_auth_ack_message(responder_nonce)
-        auth_ack_ciphertext = responder.encrypt_auth_ack_message(auth_ack_msg)
+        auth_ack_ciphertext = await run_in_crypto_executor(
+            token,
+            responder.create_encrypted_auth_ack_message,
+            responder_nonce,
+        )
 
         if writer.transport.is_closing() or reader.at_eof():
             raise HandshakeFailure(f"Connection to {initiator_remote} is closing")
@@ -209,12 +234,16 @@ class Transport(TransportAPI):
         await token.cancellable_wait(writer.drain())
 
         # Call `HandshakeResponder.derive_shared_secrets()` and use return values to create `Peer`
-        aes_secret, mac_secret, egress_mac, ingress_mac = responder.derive_secrets(
-            initiator_nonce=initiator_nonce,
-            responder_nonce=responder_nonce,
-            remote_ephemeral_pubkey=ephem_pubkey,
-            auth_init_ciphertext=msg,
-            auth_ack_ciphertext=auth_ack_ciphertext
+        aes_secret, mac_secret, egress_mac, ingress_mac = await run_in_crypto_executor(
+            token,
+            functools.partial(
+                responder.derive_secrets,
+                initiator_nonce=initiator_nonce,
+                responder_nonce=responder_nonce,
+                remote_ephemeral_pubkey=ephem_pubkey,
+                auth_init_ciphertext=msg,
+                auth_ack_ciphertext=auth_ack_ciphertext,
+            ),
         )
 
         transport = cls(
@@ -246,6 +275,44 @@ class Transport(TransportAPI):
     def write(self, data: bytes) -> None:
         self._writer.write(data)
 
+    def flush(self) -> None:
+        """
+        Hand all buffered outgoing messages over to the socket in a single write.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._write_buffer:
+            return
+
+        data = b''.join(self._write_buffer)
+        self._write_buffer.clear()
+        self._write_buffer_size = 0
+
+        if self.is_closing:
+            self.logger.debug(
+                "Discarding %d buffered bytes for disconnected peer %s", len(data), self)
+        else:
+            self.write(data)
+
+    async def drain(self) -> None:
+        """
+        Flush any buffered messages and, if the amount of data waiting to be
+        written to the socket is above the high water mark, wait until it drops
+        below the low water mark.
+        """
+        self.flush()
+        try:
+            await self._writer.drain()
+        except (ConnectionResetError, BrokenPipeError) as err:
+            raise PeerConnectionLost(f"Lost connection to {self.remote}") from err
+
+    @property
+    def write_buffer_size(self) -> int:
+        transport = cast(asyncio.WriteTransport, self._writer.transport)
+        return self._write_buffer_size + transport.get_write_buffer_size()
+
     async def recv(self, token: CancelToken) -> bytes:
         # Check that Transport read state is IDLE.
         if self.read_state is not TransportState.IDLE:
@@ -304,7 +371,15 @@ class Transport(TransportAPI):
             raise PeerConnectionLost(
                 "Attempted to send msg with cmd id %d to disconnected peer %s", cmd_id, self)
 
-        self.write(self._encrypt(header, body))
+        data = self._encrypt(header, body)
+        self._write_buffer.append(data)
+        self._write_buffer_size += len(data)
+
+        if self._write_buffer_size >= TRANSPORT_WRITE_COALESCE_SIZE:
+            self.flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_event_loop()
+            self._flush_handle = loop.call_later(TRANSPORT_WRITE_COALESCE_DELAY, self.flush)
 
     def close(self) -> None:
         """Close this peer's reader/writer streams.
@@ -313,6 +388,9 @@ class Transport(TransportAPI):
 
         If the streams have already been closed, do nothing.
         """
+        # Make sure messages sent right before closing (e.g. `Disconnect`)
+        # still make it to the remote.
+        self.flush()
         if not self._reader.at_eof():
             self._reader.feed_eof()
         self._writer.close()
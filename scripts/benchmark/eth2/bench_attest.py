@@ -0,0 +1,124 @@
+import argparse
+from collections import Counter
+import logging
+import sys
+import time
+
+from eth2.beacon.state_machines.forks.serenity.blocks import SerenityBeaconBlock
+from eth2.beacon.state_machines.forks.xiao_long_bao import XiaoLongBaoStateMachine
+from eth2.beacon.state_machines.forks.xiao_long_bao.configs import XIAO_LONG_BAO_CONFIG
+from eth2.beacon.tools.builder.committee_assignment import get_validator_duties
+from eth2.beacon.tools.builder.initializer import create_mock_genesis
+from eth2.beacon.tools.builder.keys import create_privkey, privtopubs
+from eth2.beacon.tools.builder.validator import (
+    create_signed_attestation_at_slot,
+    create_signed_attestations_at_slot,
+)
+from eth2.beacon.tools.misc.ssz_vector import override_lengths
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def mk_genesis(validator_count, config):
+    privkeys = tuple(create_privkey(index) for index in range(validator_count))
+    keymap = dict(zip(privtopubs(privkeys), privkeys))
+    state, block = create_mock_genesis(
+        pubkeys=tuple(keymap.keys()),
+        config=config,
+        keymap=keymap,
+        genesis_block_class=SerenityBeaconBlock,
+    )
+    return state, block, privkeys
+
+
+def bench_attest(state, block, privkeys, local_validator_count, config):
+    state_machine = XiaoLongBaoStateMachine(chaindb=None, attestation_pool=None)
+    validator_privkeys = dict(enumerate(privkeys[:local_validator_count]))
+    duties = get_validator_duties(
+        state,
+        config,
+        state.current_epoch(config.SLOTS_PER_EPOCH),
+        tuple(validator_privkeys.keys()),
+    )
+    # The slot with the most local attesters
+    slot, _ = Counter(duty.slot for duty in duties.values()).most_common(1)[0]
+
+    committee_attesters = {}
+    for _validator_index, duty in duties.items():
+        if duty.slot == slot:
+            _, _, attesting_indices = committee_attesters.get(
+                duty.shard, (duty.committee, duty.shard, ()),
+            )
+            committee_attesters[duty.shard] = (
+                duty.committee,
+                duty.shard,
+                attesting_indices + (duty.committee_index,),
+            )
+    committee_attesters = tuple(committee_attesters.values())
+    attester_count = sum(len(attesters[2]) for attesters in committee_attesters)
+
+    start = time.perf_counter()
+    for committee, shard, attesting_indices in committee_attesters:
+        create_signed_attestation_at_slot(
+            state,
+            config,
+            state_machine,
+            slot,
+            block.signing_root,
+            validator_privkeys,
+            committee,
+            shard,
+            attesting_indices,
+        )
+    per_committee_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    create_signed_attestations_at_slot(
+        state,
+        config,
+        state_machine,
+        slot,
+        block.signing_root,
+        validator_privkeys,
+        committee_attesters,
+    )
+    batch_duration = time.perf_counter() - start
+
+    logger.info(
+        "%4d local validators (%3d attesting in %2d committees): "
+        "per committee %8.3fs  batch %8.3fs",
+        local_validator_count,
+        attester_count,
+        len(committee_attesters),
+        per_committee_duration,
+        batch_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Attestation Production Benchmark')
+parser.add_argument(
+    '--local-validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(1, 64, 512),
+    help=(
+        "Numbers of validators attesting from this node"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    config = XIAO_LONG_BAO_CONFIG
+    override_lengths(config)
+    logger.info("Running attestation benchmark\n*****************************\n")
+    state, block, privkeys = mk_genesis(max(args.local_validator_counts), config)
+    for local_validator_count in args.local_validator_counts:
+        bench_attest(state, block, privkeys, local_validator_count, config)
@@ -0,0 +1,104 @@
+import argparse
+import logging
+import sys
+import time
+
+from eth2._utils.bls import bls
+from eth2._utils.bls.backends import AVAILABLE_BACKENDS, NoOpBackend
+from eth2._utils.bls.backends.base import SignatureSet
+from eth2.beacon.constants import EMPTY_PUBKEY
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+DOMAIN = (1).to_bytes(8, 'little')
+
+
+def mk_signature_set(privkey, message_hash):
+    return SignatureSet(
+        (bls.privtopub(privkey),),
+        (message_hash,),
+        bls.sign(message_hash, privkey, DOMAIN),
+        DOMAIN,
+    )
+
+
+def mk_attestation_signature_set(committee_privkey, message_hash):
+    # A committee signing the same data is no different from a single key
+    # being the sum of their private keys, so only one signature is made.
+    custody_bit_1_message_hash = bytes(31) + b'\x01'
+    return SignatureSet(
+        (bls.privtopub(committee_privkey), EMPTY_PUBKEY),
+        (message_hash, custody_bit_1_message_hash),
+        bls.sign(message_hash, committee_privkey, DOMAIN),
+        DOMAIN,
+    )
+
+
+def mk_block_signature_sets(attestation_count):
+    """
+    Return the signature sets of a block with ``attestation_count`` attestations, along
+    with its proposer signature and RANDAO reveal.
+    """
+    proposer_signature_sets = (
+        mk_signature_set(1, b'\x01' * 32),
+        mk_signature_set(1, b'\x02' * 32),
+    )
+    attestation_signature_sets = tuple(
+        mk_attestation_signature_set(index + 2, index.to_bytes(32, 'big'))
+        for index in range(attestation_count)
+    )
+    return proposer_signature_sets + attestation_signature_sets
+
+
+def bench_batch_verification(backend, attestation_count):
+    bls.use(backend)
+    signature_sets = mk_block_signature_sets(attestation_count)
+
+    start = time.perf_counter()
+    assert all(
+        backend.verify_signature_set(signature_set)
+        for signature_set in signature_sets
+    )
+    individual_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert backend.verify_signature_sets(signature_sets)
+    batch_duration = time.perf_counter() - start
+
+    logger.info(
+        "%-14s %4d attestations: individual %8.2fs  batch %8.2fs  speedup x%.1f",
+        backend.__name__,
+        attestation_count,
+        individual_duration,
+        batch_duration,
+        individual_duration / batch_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Batch BLS Verification Benchmark')
+parser.add_argument(
+    '--attestation-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(16, 64, 128),
+    help=(
+        "Numbers of attestations in the block"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    logger.info("Running batch BLS verification benchmark\n*****************************\n")
+    for backend in AVAILABLE_BACKENDS:
+        if backend == NoOpBackend:
+            continue
+        for attestation_count in args.attestation_counts:
+            bench_batch_verification(backend, attestation_count)
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import sys
+import time
+
+from eth2._utils.hash import hash_eth2
+from eth2._utils.merkle.common import get_merkle_proof
+from eth2._utils.merkle.incremental import IncrementalMerkleTree
+from eth2._utils.merkle.sparse import calc_merkle_tree_from_leaves, get_root
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def bench_deposit_tree(deposit_count, rebuild_count):
+    leaves = tuple(
+        hash_eth2(index.to_bytes(32, 'little')) for index in range(deposit_count)
+    )
+
+    # Rebuilding the tree for every deposit is quadratic, so only time the last
+    # ``rebuild_count`` deposits and extrapolate.
+    start = time.perf_counter()
+    for index in range(deposit_count - rebuild_count, deposit_count):
+        tree = calc_merkle_tree_from_leaves(leaves[:index + 1])
+        naive_root = get_root(tree)
+        naive_proof = get_merkle_proof(tree, index)
+    rebuild_duration = time.perf_counter() - start
+
+    deposit_tree = IncrementalMerkleTree()
+    start = time.perf_counter()
+    for leaf in leaves:
+        deposit_tree.append(leaf)
+        root = deposit_tree.get_root()
+        proof = deposit_tree.get_last_proof()
+    incremental_duration = time.perf_counter() - start
+    assert root == naive_root
+    assert proof == naive_proof
+
+    logger.info(
+        "%7d deposits: rebuild %10.3fms per deposit  incremental %8.4fms per deposit "
+        "(%6.3fs in total)",
+        deposit_count,
+        rebuild_duration / rebuild_count * 1000,
+        incremental_duration / deposit_count * 1000,
+        incremental_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Deposit Tree Benchmark')
+parser.add_argument(
+    '--deposit-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(16384, 65536),
+    help=(
+        "Numbers of deposits to build the tree from"
+    ),
+)
+parser.add_argument(
+    '--rebuild-count',
+    type=int,
+    required=False,
+    default=8,
+    help=(
+        "Number of deposits to time rebuilding the whole tree for"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    logger.info("Running deposit tree benchmark\n*****************************\n")
+    for deposit_count in args.deposit_counts:
+        bench_deposit_tree(deposit_count, args.rebuild_count)
@@ -0,0 +1,142 @@
+import argparse
+import logging
+import random
+import sys
+import time
+
+from eth2.beacon.fork_choice.proto_array import ProtoArrayForkChoice
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def mk_block_tree(slot_count, fork_probability):
+    """
+    Return a list of ``(root, parent_root, slot)``, with one block per slot and, now and
+    then, a sibling forking off the chain.
+    """
+    genesis_root = (0).to_bytes(32, 'big')
+    blocks = [(genesis_root, None, 0)]
+    heads = [genesis_root]
+    for slot in range(1, slot_count):
+        parent_roots = [random.choice(heads)]
+        if random.random() < fork_probability:
+            parent_roots.append(random.choice(heads))
+        for parent_root in parent_roots:
+            root = len(blocks).to_bytes(32, 'big')
+            blocks.append((root, parent_root, slot))
+            heads.append(root)
+        heads = heads[-8:]
+    return blocks
+
+
+def naive_weight(root, slots, parents, votes, balances):
+    """
+    Weigh a block like ``lmd_ghost_scoring`` does, walking up from the target of every vote.
+    """
+    weight = 0
+    for validator_index, target in votes.items():
+        while target is not None and slots[target] > slots[root]:
+            target = parents[target]
+        if target == root:
+            weight += balances[validator_index]
+    return weight
+
+
+def bench_fork_choice(validator_count, slot_count, fork_probability, config):
+    blocks = mk_block_tree(slot_count, fork_probability)
+    balances = (config.MAX_EFFECTIVE_BALANCE,) * validator_count
+    validators_per_slot = max(1, validator_count // config.SLOTS_PER_EPOCH)
+
+    fork_choice = ProtoArrayForkChoice()
+    fork_choice.update_balances(balances)
+    slots = {}
+    parents = {}
+    votes = {}
+
+    proto_array_duration = 0.0
+    naive_duration = 0.0
+    for root, parent_root, slot in blocks:
+        # A slot's worth of validators vote for the new block
+        attesters = tuple(
+            (slot * validators_per_slot + offset) % validator_count
+            for offset in range(validators_per_slot)
+        )
+
+        start = time.perf_counter()
+        fork_choice.process_block(root, parent_root, slot)
+        for validator_index in attesters:
+            fork_choice.process_attestation(validator_index, root, slot)
+        proto_array_weight = fork_choice.get_weight(root)
+        fork_choice.find_head(blocks[0][0])
+        proto_array_duration += time.perf_counter() - start
+
+        slots[root] = slot
+        parents[root] = parent_root
+        for validator_index in attesters:
+            votes[validator_index] = root
+
+        start = time.perf_counter()
+        weight = naive_weight(root, slots, parents, votes, balances)
+        naive_duration += time.perf_counter() - start
+
+        assert weight == proto_array_weight
+
+    logger.info(
+        "%7d validators, %5d blocks: proto-array %8.4fs per block  "
+        "full rescoring %8.4fs per block  speedup x%.1f",
+        validator_count,
+        len(blocks),
+        proto_array_duration / len(blocks),
+        naive_duration / len(blocks),
+        naive_duration / proto_array_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Fork Choice Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(16384, 65536),
+    help=(
+        "Numbers of validators voting"
+    ),
+)
+parser.add_argument(
+    '--slot-count',
+    type=int,
+    required=False,
+    default=256,
+    help=(
+        "Number of slots in the block tree"
+    ),
+)
+parser.add_argument(
+    '--fork-probability',
+    type=float,
+    required=False,
+    default=0.2,
+    help=(
+        "Probability of a second block forking off the chain in a slot"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    logger.info("Running fork choice benchmark\n*****************************\n")
+    for validator_count in args.validator_counts:
+        bench_fork_choice(
+            validator_count,
+            args.slot_count,
+            args.fork_probability,
+            SERENITY_CONFIG,
+        )
@@ -0,0 +1,129 @@
+import argparse
+from contextlib import ExitStack, contextmanager
+import logging
+import sys
+import time
+from unittest.mock import patch
+
+from eth.constants import ZERO_HASH32
+
+from eth2.beacon import epoch_processing_helpers, helpers
+from eth2.beacon.helpers import compute_start_slot_of_epoch
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+from eth2.beacon.state_machines.forks.serenity.epoch_processing import (
+    get_attestation_deltas,
+    get_crosslink_deltas,
+    process_epoch,
+)
+from eth2.beacon.tools.builder.initializer import create_mock_validator
+from eth2.beacon.tools.builder.state import create_mock_genesis_state_from_validators
+from eth2.beacon.tools.builder.validator import (
+    mk_all_pending_attestations_with_full_participation_in_epoch,
+)
+from eth2.beacon.types.eth1_data import Eth1Data
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def mk_state(validator_count, config):
+    validators = tuple(
+        create_mock_validator(index.to_bytes(48, 'little'), config)
+        for index in range(validator_count)
+    )
+    balances = (config.MAX_EFFECTIVE_BALANCE,) * validator_count
+    genesis_state = create_mock_genesis_state_from_validators(
+        genesis_time=0,
+        genesis_eth1_data=Eth1Data(
+            deposit_root=ZERO_HASH32,
+            deposit_count=validator_count,
+            block_hash=ZERO_HASH32,
+        ),
+        genesis_validators=validators,
+        genesis_balances=balances,
+        config=config,
+    )
+
+    # the last slot of the epoch after genesis, with everybody having
+    # attested in the previous epoch.
+    previous_epoch = config.GENESIS_EPOCH
+    state = genesis_state.copy(
+        slot=compute_start_slot_of_epoch(previous_epoch + 2, config.SLOTS_PER_EPOCH) - 1,
+    )
+    return state.copy(
+        previous_epoch_attestations=tuple(
+            attestation.copy(inclusion_delay=config.MIN_ATTESTATION_INCLUSION_DELAY)
+            for attestation in mk_all_pending_attestations_with_full_participation_in_epoch(
+                state, previous_epoch, config,
+            )
+        ),
+    )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+class NoCache(dict):
+    def __setitem__(self, key, value):
+        pass
+
+
+@contextmanager
+def registry_epoch_caches_disabled():
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(helpers, '_active_validator_indices_cache', NoCache())
+        )
+        stack.enter_context(
+            patch.object(epoch_processing_helpers, '_total_active_balance_cache', NoCache())
+        )
+        yield
+
+
+def bench_process_epoch(validator_count, config):
+    state = mk_state(validator_count, config)
+    with registry_epoch_caches_disabled():
+        # Warm up the shuffling cache, which both runs below share
+        process_epoch(state, config)
+        uncached_duration = timed(process_epoch, state, config)
+    helpers._active_validator_indices_cache.clear()
+    epoch_processing_helpers._total_active_balance_cache.clear()
+    cached_duration = timed(process_epoch, state, config)
+
+    logger.info(
+        "%7d validators: attestation deltas %6.2fs  crosslink deltas %6.2fs  "
+        "process_epoch %6.2fs  (without registry caches %6.2fs)",
+        validator_count,
+        timed(get_attestation_deltas, state, config),
+        timed(get_crosslink_deltas, state, config),
+        cached_duration,
+        uncached_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Epoch Processing Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(1024, 4096, 16384),
+    help=(
+        "Numbers of active validators in the state"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    logger.info("Running epoch processing benchmark\n*****************************\n")
+    for validator_count in args.validator_counts:
+        bench_process_epoch(validator_count, SERENITY_CONFIG)
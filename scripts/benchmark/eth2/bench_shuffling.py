@@ -0,0 +1,85 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+from eth2.beacon.committee_helpers import (
+    compute_shuffled_index,
+    compute_shuffled_indices,
+    get_shuffled_indices,
+)
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def bench_shuffling(validator_count, sample_size, shuffle_round_count):
+    indices = tuple(range(validator_count))
+    seed = os.urandom(32)
+
+    # Shuffling index by index is far too slow to do for the whole list, so
+    # time a sample and extrapolate.
+    start = time.perf_counter()
+    for index in range(sample_size):
+        compute_shuffled_index(index, validator_count, seed, shuffle_round_count)
+    per_index_duration = (time.perf_counter() - start) / sample_size * validator_count
+
+    start = time.perf_counter()
+    compute_shuffled_indices(indices, seed, shuffle_round_count)
+    whole_list_duration = time.perf_counter() - start
+
+    get_shuffled_indices(indices, seed, shuffle_round_count)
+    start = time.perf_counter()
+    get_shuffled_indices(indices, seed, shuffle_round_count)
+    cached_duration = time.perf_counter() - start
+
+    logger.info(
+        "%7d validators: per-index %8.2fs (extrapolated)  whole-list %6.2fs  "
+        "cached %.4fs  speedup x%.1f",
+        validator_count,
+        per_index_duration,
+        whole_list_duration,
+        cached_duration,
+        per_index_duration / whole_list_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Committee Shuffling Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(16384, 65536, 300000),
+    help=(
+        "Numbers of active validators to shuffle"
+    ),
+)
+parser.add_argument(
+    '--sample-size',
+    type=int,
+    required=False,
+    default=1000,
+    help=(
+        "Number of indices to shuffle one by one to estimate the cost of the "
+        "per-index shuffle"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    shuffle_round_count = SERENITY_CONFIG.SHUFFLE_ROUND_COUNT
+    logger.info(
+        "Running shuffling benchmark with %d rounds\n*****************************\n",
+        shuffle_round_count,
+    )
+    for validator_count in args.validator_counts:
+        bench_shuffling(validator_count, args.sample_size, shuffle_round_count)
@@ -0,0 +1,134 @@
+import argparse
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+from eth.constants import ZERO_HASH32
+from eth.db.atomic import AtomicDB
+import ssz
+
+from eth2._utils.ssz import SSZView
+from eth2.beacon.db.chain import BeaconChainDB
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+from eth2.beacon.tools.builder.initializer import create_mock_validator
+from eth2.beacon.tools.builder.state import create_mock_genesis_state_from_validators
+from eth2.beacon.tools.misc.ssz_vector import override_lengths
+from eth2.beacon.types.eth1_data import Eth1Data
+from eth2.configs import Eth2GenesisConfig
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def mk_genesis_state(validator_count, config):
+    validators = tuple(
+        create_mock_validator(index.to_bytes(48, 'little'), config)
+        for index in range(validator_count)
+    )
+    balances = (config.MAX_EFFECTIVE_BALANCE,) * validator_count
+    return create_mock_genesis_state_from_validators(
+        genesis_time=0,
+        genesis_eth1_data=Eth1Data(
+            deposit_root=ZERO_HASH32,
+            deposit_count=validator_count,
+            block_hash=ZERO_HASH32,
+        ),
+        genesis_validators=validators,
+        genesis_balances=balances,
+        config=config,
+    )
+
+
+def measure(get_finalized_epoch, rounds):
+    """
+    Return the mean latency of ``get_finalized_epoch`` and the peak memory allocated by
+    one call.
+    """
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        get_finalized_epoch()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    get_finalized_epoch()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.mean(latencies), peak_memory
+
+
+def bench_ssz_view(validator_count, rounds, config):
+    base_db = AtomicDB()
+    genesis_config = Eth2GenesisConfig(config)
+    state = mk_genesis_state(validator_count, config)
+    state_class = type(state)
+    state_root = state.hash_tree_root
+    BeaconChainDB(base_db, genesis_config).persist_state(state)
+    state_ssz = ssz.encode(state)
+
+    # New database instances, so that the state is read from the database every time
+    def get_finalized_epoch_decoded():
+        chaindb = BeaconChainDB(base_db, genesis_config)
+        return chaindb.get_state_by_root(state_root, state_class).finalized_checkpoint.epoch
+
+    def get_finalized_epoch_view():
+        chaindb = BeaconChainDB(base_db, genesis_config)
+        view = chaindb.get_state_view_by_root(state_root, state_class)
+        return view.finalized_checkpoint.epoch
+
+    assert isinstance(
+        BeaconChainDB(base_db, genesis_config).get_state_view_by_root(
+            state_root, state_class
+        ),
+        SSZView,
+    )
+    decoded_latency, decoded_memory = measure(get_finalized_epoch_decoded, rounds)
+    view_latency, view_memory = measure(get_finalized_epoch_view, rounds)
+
+    logger.info(
+        "%7d validators (%8.2f MB state): finalized epoch lookup "
+        "decoded %8.4fs %8.2f MB  view %8.4fs %8.2f MB",
+        validator_count,
+        len(state_ssz) / 2 ** 20,
+        decoded_latency,
+        decoded_memory / 2 ** 20,
+        view_latency,
+        view_memory / 2 ** 20,
+    )
+
+
+parser = argparse.ArgumentParser(description='Lazy SSZ State View Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(1024, 16384, 65536),
+    help=(
+        "Numbers of validators in the state"
+    ),
+)
+parser.add_argument(
+    '--rounds',
+    type=int,
+    required=False,
+    default=5,
+    help=(
+        "Number of lookups to average the latency over"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    override_lengths(SERENITY_CONFIG)
+    logger.info("Running lazy SSZ view benchmark\n*****************************\n")
+    for validator_count in args.validator_counts:
+        bench_ssz_view(validator_count, args.rounds, SERENITY_CONFIG)
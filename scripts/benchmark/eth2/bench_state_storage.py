@@ -0,0 +1,121 @@
+import argparse
+import logging
+import statistics
+import sys
+import time
+
+from eth.constants import ZERO_HASH32
+from eth.db.atomic import AtomicDB
+from eth.db.backends.memory import MemoryDB
+import ssz
+
+from eth2._utils.tuple import update_tuple_item
+from eth2.beacon.db.chain import BeaconChainDB
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+from eth2.beacon.state_machines.forks.serenity.slot_processing import process_slots
+from eth2.beacon.tools.builder.initializer import create_mock_validator
+from eth2.beacon.tools.builder.state import create_mock_genesis_state_from_validators
+from eth2.beacon.tools.misc.ssz_vector import override_lengths
+from eth2.beacon.types.eth1_data import Eth1Data
+from eth2.configs import Eth2GenesisConfig
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def mk_genesis_state(validator_count, config):
+    validators = tuple(
+        create_mock_validator(index.to_bytes(48, 'little'), config)
+        for index in range(validator_count)
+    )
+    balances = (config.MAX_EFFECTIVE_BALANCE,) * validator_count
+    return create_mock_genesis_state_from_validators(
+        genesis_time=0,
+        genesis_eth1_data=Eth1Data(
+            deposit_root=ZERO_HASH32,
+            deposit_count=validator_count,
+            block_hash=ZERO_HASH32,
+        ),
+        genesis_validators=validators,
+        genesis_balances=balances,
+        config=config,
+    )
+
+
+def get_disk_usage(memory_db):
+    return sum(len(key) + len(value) for key, value in memory_db.kv_store.items())
+
+
+def bench_state_storage(validator_count, epochs, config):
+    memory_db = MemoryDB()
+    base_db = AtomicDB(memory_db)
+    genesis_config = Eth2GenesisConfig(config)
+    chaindb = BeaconChainDB(base_db, genesis_config)
+
+    state = mk_genesis_state(validator_count, config)
+    chaindb.persist_state(state)
+    full_snapshots_size = len(ssz.encode(state))
+
+    for slot in range(1, epochs * config.SLOTS_PER_EPOCH):
+        state = process_slots(state, slot, config)
+        # Stand-in for the effects of a block
+        state = state.copy(
+            balances=update_tuple_item(state.balances, slot % validator_count, slot),
+        )
+        chaindb.persist_state(state)
+        full_snapshots_size += len(ssz.encode(state))
+
+    # A new database instance starts without any state in memory
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    latencies = []
+    for slot in range(epochs * config.SLOTS_PER_EPOCH):
+        start = time.perf_counter()
+        state_root = chaindb.get_state_root_by_slot(slot)
+        chaindb.get_state_by_root(state_root, type(state))
+        latencies.append(time.perf_counter() - start)
+
+    logger.info(
+        "%7d validators, %4d slots: disk usage %8.2f MB (%8.2f MB as full snapshots)  "
+        "get_state_by_slot mean %6.3fs  max %6.3fs",
+        validator_count,
+        len(latencies),
+        get_disk_usage(memory_db) / 2 ** 20,
+        full_snapshots_size / 2 ** 20,
+        statistics.mean(latencies),
+        max(latencies),
+    )
+
+
+parser = argparse.ArgumentParser(description='Beacon State Storage Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(1024, 4096),
+    help=(
+        "Numbers of validators in the state"
+    ),
+)
+parser.add_argument(
+    '--epochs',
+    type=int,
+    required=False,
+    default=2,
+    help=(
+        "Number of epochs of states to persist, one for every slot"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    override_lengths(SERENITY_CONFIG)
+    logger.info("Running state storage benchmark\n*****************************\n")
+    for validator_count in args.validator_counts:
+        bench_state_storage(validator_count, args.epochs, SERENITY_CONFIG)
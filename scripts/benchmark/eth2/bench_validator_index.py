@@ -0,0 +1,123 @@
+import argparse
+import logging
+import sys
+import time
+
+from eth.db.atomic import AtomicDB
+
+from eth2.beacon.db.chain import BeaconChainDB
+from eth2.beacon.helpers import ValidatorPubkeyIndex
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+from eth2.beacon.tools.builder.initializer import create_mock_validator
+from eth2.beacon.types.states import BeaconState
+from eth2.configs import Eth2GenesisConfig
+
+logger = logging.getLogger('trinity.scripts.benchmark')
+logger.setLevel(logging.INFO)
+
+handler_stream = logging.StreamHandler(sys.stderr)
+handler_stream.setLevel(logging.INFO)
+
+logger.addHandler(handler_stream)
+
+
+def naive_get_index(validators, pubkey):
+    """
+    Look a validator up like ``process_deposit`` used to, scanning the whole registry.
+    """
+    validator_pubkeys = tuple(v.pubkey for v in validators)
+    if pubkey not in validator_pubkeys:
+        return None
+    return validator_pubkeys.index(pubkey)
+
+
+def bench_validator_index(validator_count, lookup_count, config):
+    validators = tuple(
+        create_mock_validator(index.to_bytes(48, 'little'), config)
+        for index in range(validator_count)
+    )
+    # Half of the lookups are for validators of the registry, half for new ones
+    pubkeys = tuple(
+        (index * validator_count // lookup_count * 2).to_bytes(48, 'little')
+        for index in range(lookup_count)
+    )
+
+    start = time.perf_counter()
+    naive_indices = tuple(naive_get_index(validators, pubkey) for pubkey in pubkeys)
+    naive_duration = time.perf_counter() - start
+
+    pubkey_index = ValidatorPubkeyIndex()
+    start = time.perf_counter()
+    pubkey_index.update(validators)
+    build_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indices = tuple(pubkey_index.get_index(validators, pubkey) for pubkey in pubkeys)
+    index_duration = time.perf_counter() - start
+    assert indices == naive_indices
+
+    # Registry growing by one validator per lookup, like the genesis deposits
+    pubkey_index = ValidatorPubkeyIndex()
+    registry = []
+    start = time.perf_counter()
+    for validator in validators:
+        pubkey_index.get_index(registry, validator.pubkey)
+        registry.append(validator)
+    growing_duration = time.perf_counter() - start
+
+    chaindb = BeaconChainDB(AtomicDB(), Eth2GenesisConfig(config))
+    state = BeaconState(config=config).copy(
+        validators=validators,
+        balances=(config.MAX_EFFECTIVE_BALANCE,) * validator_count,
+    )
+    start = time.perf_counter()
+    chaindb.index_validators(state)
+    persist_duration = time.perf_counter() - start
+
+    registry_pubkeys = pubkeys[:lookup_count // 2]
+    start = time.perf_counter()
+    for pubkey in registry_pubkeys:
+        chaindb.get_validator_index_by_pubkey(pubkey)
+    db_duration = time.perf_counter() - start
+
+    logger.info(
+        "%7d validators: scan %10.3fms per lookup  index %8.4fms per lookup "
+        "(built in %6.3fs, %6.3fs to grow one at a time)  "
+        "database %8.4fms per lookup (persisted in %6.3fs)",
+        validator_count,
+        naive_duration / lookup_count * 1000,
+        index_duration / lookup_count * 1000,
+        build_duration,
+        growing_duration,
+        db_duration / len(registry_pubkeys) * 1000,
+        persist_duration,
+    )
+
+
+parser = argparse.ArgumentParser(description='Validator Index Benchmark')
+parser.add_argument(
+    '--validator-counts',
+    type=int,
+    nargs='+',
+    required=False,
+    default=(16384, 100000),
+    help=(
+        "Numbers of validators in the registry"
+    ),
+)
+parser.add_argument(
+    '--lookup-count',
+    type=int,
+    required=False,
+    default=64,
+    help=(
+        "Number of validators to look up"
+    ),
+)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    logger.info("Running validator index benchmark\n*****************************\n")
+    for validator_count in args.validator_counts:
+        bench_validator_index(validator_count, args.lookup_count, SERENITY_CONFIG)
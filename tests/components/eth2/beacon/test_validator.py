@@ -19,6 +19,7 @@ from eth2.beacon.attestation_helpers import (
 )
 from eth2.beacon.helpers import (
     compute_epoch_of_slot,
+    compute_start_slot_of_epoch,
 )
 from eth2.beacon.exceptions import (
     NoCommitteeAssignment,
@@ -310,9 +311,45 @@ async def test_validator_get_committee_assigment(event_loop, event_bus):
     state = alice.chain.get_head_state()
     epoch = compute_epoch_of_slot(state.slot, state_machine.config.SLOTS_PER_EPOCH)
 
-    assert alice.this_epoch_assignment[alice_indices[0]][0] == -1
-    alice._get_this_epoch_assignment(alice_indices[0], epoch)
-    assert alice.this_epoch_assignment[alice_indices[0]][0] == epoch
+    assert epoch not in alice.epoch_duties
+    duties = alice._get_epoch_duties(epoch)
+    assert alice.epoch_duties[epoch] == duties
+    assert tuple(duties.keys()) == tuple(alice_indices)
+
+    committee, shard, slot, is_proposer = get_committee_assignment(
+        state,
+        state_machine.config,
+        epoch,
+        alice_indices[0],
+    )
+    duty = duties[alice_indices[0]]
+    assert duty.committee == committee
+    assert duty.shard == shard
+    assert duty.slot == slot
+    assert duty.is_proposer == is_proposer
+    assert committee[duty.committee_index] == alice_indices[0]
+
+
+@pytest.mark.asyncio
+async def test_validator_precompute_next_epoch_duties(event_loop, event_bus):
+    alice_indices = list(range(8))
+    alice = await get_validator(event_loop=event_loop, event_bus=event_bus, indices=alice_indices)
+    state = alice.chain.get_head_state()
+    slots_per_epoch = alice.slots_per_epoch
+    epoch = compute_epoch_of_slot(state.slot, slots_per_epoch)
+
+    # Nothing is computed before the last slot of the epoch
+    await alice._precompute_next_epoch_duties(state.slot)
+    assert epoch + 1 not in alice.epoch_duties
+
+    last_slot = compute_start_slot_of_epoch(epoch + 1, slots_per_epoch) - 1
+    await alice._precompute_next_epoch_duties(last_slot)
+    assert alice.epoch_duties[epoch + 1] == alice._compute_epoch_duties(state, epoch + 1)
+
+    # Past duties are dropped once the next epoch begins
+    alice._get_epoch_duties(epoch)
+    alice._get_epoch_duties(epoch + 1)
+    assert tuple(alice.epoch_duties.keys()) == (epoch + 1,)
 
 
 @pytest.mark.asyncio
@@ -324,7 +361,7 @@ async def test_validator_attest(event_loop, event_bus, monkeypatch):
     state = alice.chain.get_head_state()
 
     epoch = compute_epoch_of_slot(state.slot, state_machine.config.SLOTS_PER_EPOCH)
-    assignment = alice._get_this_epoch_assignment(alice_indices[0], epoch)
+    assignment = alice._get_epoch_duties(epoch)[alice_indices[0]]
 
     attestations = await alice.attest(assignment.slot)
     assert len(attestations) == 1
@@ -11,6 +11,10 @@ from eth.db.chain import ChainDB
 
 from p2p.auth import HandshakeInitiator, _handshake
 from p2p.connection import Connection
+from p2p.constants import (
+    INBOUND_HANDSHAKE_BURST_PER_IP,
+    MAX_CONCURRENT_INBOUND_HANDSHAKES,
+)
 from p2p.kademlia import (
     Node,
     Address,
@@ -107,6 +111,8 @@ async def test_server_incoming_connection(monkeypatch, server, event_loop):
             reader, writer = await initiator.connect()
         except ConnectionRefusedError:
             await asyncio.sleep(0)
+        else:
+            break
     # Send auth init message to the server, then read and decode auth ack
     aes_secret, mac_secret, egress_mac, ingress_mac = await _handshake(
         initiator, reader, writer, token)
@@ -219,3 +225,75 @@ async def test_peer_pool_answers_connect_commands(event_loop, event_bus, server)
         assert len(server.peer_pool.connected_nodes) == 1
 
         await initiator_peer_pool.cancel()
+
+
+class FakeWriter:
+    def __init__(self, ip):
+        self.ip = ip
+        self.is_closed = False
+
+    def get_extra_info(self, name):
+        if name == 'peername':
+            return (self.ip, 30303)
+
+    def close(self):
+        self.is_closed = True
+
+
+@pytest.mark.asyncio
+async def test_server_drops_handshakes_over_concurrency_limit(monkeypatch, event_bus):
+    server = get_server(RECEIVER_PRIVKEY, SERVER_ADDRESS, event_bus)
+    handshaking_writers = []
+    finish_handshakes = asyncio.Event()
+
+    async def _receive_handshake(reader, writer):
+        handshaking_writers.append(writer)
+        await finish_handshakes.wait()
+
+    monkeypatch.setattr(server, '_receive_handshake', _receive_handshake)
+
+    # Each connection comes from a different IP so that they are not rate limited
+    writers = [FakeWriter(f'10.0.0.{i}') for i in range(MAX_CONCURRENT_INBOUND_HANDSHAKES + 1)]
+    handshakes = [
+        asyncio.ensure_future(server.receive_handshake(None, writer))
+        for writer in writers[:-1]
+    ]
+    await asyncio.sleep(0)
+    assert len(handshaking_writers) == MAX_CONCURRENT_INBOUND_HANDSHAKES
+
+    # test: a connection is dropped while the limit is reached
+    await server.receive_handshake(None, writers[-1])
+    assert writers[-1].is_closed
+    assert writers[-1] not in handshaking_writers
+
+    # test: connections are accepted again once the handshakes are done
+    finish_handshakes.set()
+    await asyncio.gather(*handshakes)
+    extra_writer = FakeWriter('10.0.1.0')
+    await server.receive_handshake(None, extra_writer)
+    assert not extra_writer.is_closed
+    assert handshaking_writers[-1] is extra_writer
+
+
+@pytest.mark.asyncio
+async def test_server_rate_limits_handshakes_per_ip(monkeypatch, event_bus):
+    server = get_server(RECEIVER_PRIVKEY, SERVER_ADDRESS, event_bus)
+    handshaking_writers = []
+
+    async def _receive_handshake(reader, writer):
+        handshaking_writers.append(writer)
+
+    monkeypatch.setattr(server, '_receive_handshake', _receive_handshake)
+
+    writers = [FakeWriter('10.0.0.1') for _ in range(INBOUND_HANDSHAKE_BURST_PER_IP + 1)]
+    for writer in writers:
+        await server.receive_handshake(None, writer)
+
+    # test: the handshakes from the same IP beyond the burst size are dropped
+    assert handshaking_writers == writers[:-1]
+    assert writers[-1].is_closed
+
+    # test: other IPs are not affected
+    other_writer = FakeWriter('10.0.0.2')
+    await server.receive_handshake(None, other_writer)
+    assert handshaking_writers[-1] is other_writer
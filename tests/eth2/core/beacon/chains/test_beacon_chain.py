@@ -137,6 +137,50 @@ def test_import_blocks(valid_chain, genesis_block, genesis_state, config, keymap
     ) == valid_chain_2.get_state_by_slot(blocks[-1].slot)
 
 
+@pytest.mark.parametrize(
+    ("validator_count,slots_per_epoch,target_committee_size,shard_count"),
+    [(100, 16, 10, 16)],
+)
+def test_get_pre_state(valid_chain, genesis_block, genesis_state, config, keymap):
+    slot = genesis_state.slot + 2
+    assert not valid_chain.has_pre_state(genesis_block.signing_root, slot)
+    pre_state = valid_chain.get_pre_state(genesis_block.signing_root, slot)
+    assert valid_chain.has_pre_state(genesis_block.signing_root, slot)
+    assert pre_state.slot == slot
+    assert pre_state.latest_block_header.parent_root == genesis_block.parent_root
+    assert valid_chain.get_pre_state(genesis_block.signing_root, slot) is pre_state
+
+    block = create_mock_block(
+        state=genesis_state,
+        config=config,
+        state_machine=valid_chain.get_state_machine(genesis_block.slot),
+        block_class=genesis_block.__class__,
+        parent_block=genesis_block,
+        keymap=keymap,
+        slot=slot,
+    )
+    valid_chain.import_block(block)
+    assert valid_chain.get_canonical_head() == block
+
+    next_pre_state = valid_chain.get_pre_state(block.signing_root, slot + 1)
+    assert next_pre_state.slot == slot + 1
+    assert next_pre_state.latest_block_header.signing_root != (
+        pre_state.latest_block_header.signing_root
+    )
+
+
+@pytest.mark.parametrize(
+    ("validator_count,slots_per_epoch,target_committee_size,shard_count"),
+    [(100, 16, 10, 16)],
+)
+def test_add_pre_state(valid_chain, genesis_block, genesis_state):
+    slot = genesis_state.slot + 1
+    valid_chain.add_pre_state(genesis_block.signing_root, slot, genesis_state)
+
+    assert valid_chain.has_pre_state(genesis_block.signing_root, slot)
+    assert valid_chain.get_pre_state(genesis_block.signing_root, slot) is genesis_state
+
+
 def test_from_genesis(base_db, genesis_block, genesis_state, fixture_sm_class, config):
     klass = BeaconChain.configure(
         __name__="TestChain", sm_configuration=((0, fixture_sm_class),), chain_id=5566
@@ -8,12 +8,16 @@ import pytest
 import ssz
 
 from eth2._utils.hash import hash_eth2
-from eth2._utils.ssz import validate_ssz_equal
+from eth2._utils.ssz import SSZView, validate_ssz_equal
+from eth2._utils.tuple import update_tuple_item
+from eth2.beacon.db.chain import BeaconChainDB
 from eth2.beacon.db.exceptions import (
     AttestationRootNotFound,
     FinalizedHeadNotFound,
     HeadStateSlotNotFound,
     JustifiedHeadNotFound,
+    StateNotFound,
+    ValidatorIndexNotFound,
 )
 from eth2.beacon.db.schema import SchemaV1
 from eth2.beacon.state_machines.forks.serenity.blocks import BeaconBlock
@@ -184,6 +188,51 @@ def test_chaindb_state(chaindb, state):
     assert result_state.hash_tree_root == state.hash_tree_root
 
 
+def test_chaindb_get_validator_index_by_pubkey(base_db, genesis_config, genesis_state):
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    chaindb.persist_state(genesis_state)
+
+    # The index is kept in the database
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    for index, validator in enumerate(genesis_state.validators):
+        assert chaindb.get_validator_index_by_pubkey(validator.pubkey) == index
+
+    new_pubkey = b"\xff" * 48
+    with pytest.raises(ValidatorIndexNotFound):
+        chaindb.get_validator_index_by_pubkey(new_pubkey)
+
+    new_validator = genesis_state.validators[0].copy(pubkey=new_pubkey)
+    state = genesis_state.copy(
+        slot=genesis_state.slot + 1,
+        validators=genesis_state.validators + (new_validator,),
+        balances=genesis_state.balances + (0,),
+    )
+    chaindb.persist_state(state)
+    assert chaindb.get_validator_index_by_pubkey(new_pubkey) == len(
+        genesis_state.validators
+    )
+
+
+def test_chaindb_index_validators_of_unindexed_db(
+    base_db, genesis_config, genesis_state
+):
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    chaindb.persist_state(genesis_state)
+
+    # A database written before validators were indexed
+    base_db.delete(SchemaV1.make_validator_count_lookup_key())
+    for validator in genesis_state.validators:
+        base_db.delete(
+            SchemaV1.make_validator_pubkey_to_index_lookup_key(validator.pubkey)
+        )
+    with pytest.raises(ValidatorIndexNotFound):
+        chaindb.get_validator_index_by_pubkey(genesis_state.validators[0].pubkey)
+
+    chaindb.index_validators(genesis_state)
+    for index, validator in enumerate(genesis_state.validators):
+        assert chaindb.get_validator_index_by_pubkey(validator.pubkey) == index
+
+
 def test_chaindb_get_finalized_head_at_genesis(chaindb_at_genesis, genesis_block):
     assert (
         chaindb_at_genesis.get_finalized_head(genesis_block.__class__) == genesis_block
@@ -291,6 +340,45 @@ def test_chaindb_get_canonical_head(chaindb, block, fork_choice_scoring):
     assert result_block == block_3
 
 
+def test_chaindb_get_block_ssz(
+    chaindb, sample_beacon_block_params, fork_choice_scoring
+):
+    genesis = BeaconBlock(**sample_beacon_block_params).copy(
+        parent_root=GENESIS_PARENT_HASH, slot=0
+    )
+    blocks = (genesis,)
+    # Slot 3 is skipped
+    for slot in (1, 2, 4, 5):
+        blocks += (blocks[-1].copy(parent_root=blocks[-1].signing_root, slot=slot),)
+    chaindb.persist_block_chain(
+        blocks, BeaconBlock, (fork_choice_scoring,) * len(blocks)
+    )
+
+    assert chaindb.get_block_ssz_by_root(genesis.signing_root) == ssz.encode(genesis)
+    with pytest.raises(BlockNotFound):
+        chaindb.get_block_ssz_by_root(b"\x56" * 32)
+
+    assert chaindb.get_canonical_block_ssz_by_slot_range(1, 4) == tuple(
+        ssz.encode(block) for block in blocks[1:4]
+    )
+    # Slots 0, 2 and 4
+    assert chaindb.get_canonical_block_ssz_by_slot_range(0, 3, step=2) == tuple(
+        ssz.encode(block) for block in (blocks[0], blocks[2], blocks[3])
+    )
+
+    fork_block = blocks[1].copy(
+        parent_root=blocks[1].signing_root, slot=3, state_root=b"\x11" * 32
+    )
+    chaindb.persist_block(fork_block, BeaconBlock, fork_choice_scoring)
+
+    assert chaindb.get_ancestor_block_ssz_by_slots(
+        fork_block.signing_root, (0, 2, 3)
+    ) == tuple(ssz.encode(block) for block in (blocks[0], fork_block))
+    assert chaindb.get_ancestor_block_ssz_by_slots(
+        blocks[-1].signing_root, (1, 2, 3)
+    ) == tuple(ssz.encode(block) for block in blocks[1:3])
+
+
 def test_get_slot_by_root(chaindb, block, fork_choice_scoring):
     chaindb.persist_block(block, block.__class__, fork_choice_scoring)
     block_slot = block.slot
@@ -318,3 +406,96 @@ def test_chaindb_get_attestation_key_by_root(
         block.signing_root,
         0,
     )
+
+
+def _make_child_state(state, balance):
+    history_length = len(state.state_roots)
+    return state.copy(
+        slot=state.slot + 1,
+        state_roots=update_tuple_item(
+            state.state_roots, state.slot % history_length, state.hash_tree_root
+        ),
+        balances=update_tuple_item(state.balances, 0, balance),
+    )
+
+
+def test_chaindb_persist_state_diffs(base_db, genesis_config, genesis_state):
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    chaindb.persist_state(genesis_state)
+    child_state = _make_child_state(genesis_state, 1)
+    chaindb.persist_state(child_state)
+
+    # Only the first state of the epoch is stored in full
+    assert chaindb.exists(genesis_state.hash_tree_root)
+    assert not chaindb.exists(child_state.hash_tree_root)
+    assert chaindb.exists(
+        SchemaV1.make_state_diff_lookup_key(child_state.hash_tree_root)
+    )
+
+    # No states are cached by a new instance
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    result_state = chaindb.get_state_by_root(
+        child_state.hash_tree_root, type(child_state)
+    )
+    assert result_state.hash_tree_root == child_state.hash_tree_root
+    assert result_state.balances[0] == 1
+
+
+def test_chaindb_get_state_view_by_root(base_db, genesis_config, genesis_state):
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    chaindb.persist_state(genesis_state)
+    child_state = _make_child_state(genesis_state, 1)
+    chaindb.persist_state(child_state)
+
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    # A state stored in full is only decoded lazily
+    view = chaindb.get_state_view_by_root(
+        genesis_state.hash_tree_root, type(genesis_state)
+    )
+    assert isinstance(view, SSZView)
+    assert view.slot == genesis_state.slot
+    assert view.finalized_checkpoint == genesis_state.finalized_checkpoint
+    assert view.validators == genesis_state.validators
+
+    # A state stored as a diff is decoded
+    result_state = chaindb.get_state_view_by_root(
+        child_state.hash_tree_root, type(child_state)
+    )
+    assert result_state == child_state
+
+    # A recent state is returned as it is
+    assert chaindb.get_state_view_by_root(
+        genesis_state.hash_tree_root, type(genesis_state)
+    ) is chaindb.get_state_by_root(genesis_state.hash_tree_root, type(genesis_state))
+
+
+def test_chaindb_prune_non_canonical_states(
+    base_db, genesis_config, genesis_state, config
+):
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    chaindb.persist_state(genesis_state)
+    canonical_state = _make_child_state(genesis_state, 1)
+    non_canonical_state = _make_child_state(genesis_state, 2)
+    chaindb.persist_state(canonical_state)
+    chaindb.persist_state(non_canonical_state)
+
+    state = canonical_state
+    while state.slot < config.SLOTS_PER_EPOCH + 1:
+        state = _make_child_state(state, state.slot)
+    finalizing_state = state.copy(
+        finalized_checkpoint=Checkpoint(epoch=1, root=b"\x56" * 32)
+    )
+    chaindb.persist_state(finalizing_state)
+
+    chaindb = BeaconChainDB(base_db, genesis_config)
+    assert (
+        chaindb.get_state_by_root(
+            canonical_state.hash_tree_root, type(canonical_state)
+        ).hash_tree_root
+        == canonical_state.hash_tree_root
+    )
+    assert chaindb.get_state_root_by_slot(1) == canonical_state.hash_tree_root
+    with pytest.raises(StateNotFound):
+        chaindb.get_state_by_root(
+            non_canonical_state.hash_tree_root, type(non_canonical_state)
+        )
@@ -21,9 +21,11 @@ from eth2.beacon.committee_helpers import (
 )
 from eth2.beacon.epoch_processing_helpers import get_attesting_indices
 from eth2.beacon.fork_choice.lmd_ghost import (
+    ProtoArrayStore,
     Store,
     _balance_for_validator,
     lmd_ghost_scoring,
+    proto_array_scoring,
     score_block_by_root,
 )
 from eth2.beacon.helpers import (
@@ -640,3 +642,10 @@ def test_lmd_ghost_fork_choice_scoring(
         score = scoring_fn(block)
         expected_score = score_index[block.signing_root]
         assert score == expected_score
+
+    proto_array_scoring_fn = proto_array_scoring(
+        ProtoArrayStore(), chain_db, attestation_pool, state, config, BeaconBlock
+    )
+
+    for block in _iter_block_tree_by_block(block_tree):
+        assert proto_array_scoring_fn(block) == score_index[block.signing_root]
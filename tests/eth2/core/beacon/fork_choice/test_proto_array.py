@@ -0,0 +1,126 @@
+from eth2.beacon.fork_choice.proto_array import ProtoArrayForkChoice
+
+
+def _root(name):
+    return name.encode().ljust(32, b"\x00")
+
+
+def _mk_fork_choice(tree):
+    """
+    ``tree`` is a sequence of ``(name, parent_name, slot)``, parents first.
+    """
+    fork_choice = ProtoArrayForkChoice()
+    for name, parent_name, slot in tree:
+        parent_root = _root(parent_name) if parent_name else None
+        fork_choice.process_block(_root(name), parent_root, slot)
+    return fork_choice
+
+
+#        genesis
+#        /     \
+#       a       b
+#      / \      |
+#     c   d     e
+TREE = (
+    ("genesis", None, 0),
+    ("a", "genesis", 1),
+    ("b", "genesis", 1),
+    ("c", "a", 2),
+    ("d", "a", 2),
+    ("e", "b", 2),
+)
+
+
+def test_proto_array_weights_and_head():
+    fork_choice = _mk_fork_choice(TREE)
+    fork_choice.update_balances((10, 20, 30, 40))
+
+    # Without votes, ties are broken by the greatest root
+    assert fork_choice.find_head(_root("genesis")) == _root("e")
+
+    fork_choice.process_attestation(0, _root("c"), 2)
+    fork_choice.process_attestation(1, _root("d"), 2)
+    fork_choice.process_attestation(2, _root("e"), 2)
+
+    assert fork_choice.get_weight(_root("genesis")) == 60
+    assert fork_choice.get_weight(_root("a")) == 30
+    assert fork_choice.get_weight(_root("b")) == 30
+    assert fork_choice.get_weight(_root("d")) == 20
+    assert fork_choice.find_head(_root("genesis")) == _root("e")
+
+    fork_choice.process_attestation(3, _root("c"), 2)
+    assert fork_choice.get_weight(_root("a")) == 70
+    assert fork_choice.find_head(_root("genesis")) == _root("c")
+    assert fork_choice.find_head(_root("b")) == _root("e")
+
+
+def test_proto_array_latest_votes_and_balances():
+    fork_choice = _mk_fork_choice(TREE)
+    fork_choice.update_balances((10, 20))
+
+    fork_choice.process_attestation(0, _root("c"), 2)
+    fork_choice.process_attestation(1, _root("e"), 2)
+    assert fork_choice.find_head(_root("genesis")) == _root("e")
+
+    # Only the latest vote of a validator counts
+    fork_choice.process_attestation(1, _root("d"), 3)
+    fork_choice.process_attestation(1, _root("e"), 1)
+    assert fork_choice.get_weight(_root("a")) == 30
+    assert fork_choice.get_weight(_root("b")) == 0
+    assert fork_choice.find_head(_root("genesis")) == _root("d")
+
+    fork_choice.update_balances((50, 20))
+    assert fork_choice.get_weight(_root("a")) == 70
+    assert fork_choice.find_head(_root("genesis")) == _root("c")
+
+
+def test_proto_array_votes_for_unknown_blocks():
+    fork_choice = _mk_fork_choice(TREE)
+    fork_choice.update_balances((10, 20))
+
+    fork_choice.process_attestation(0, _root("c"), 2)
+    fork_choice.process_attestation(1, _root("f"), 3)
+    assert fork_choice.get_weight(_root("genesis")) == 10
+    assert fork_choice.find_head(_root("genesis")) == _root("c")
+
+    fork_choice.process_block(_root("f"), _root("e"), 3)
+    assert fork_choice.get_weight(_root("genesis")) == 30
+    assert fork_choice.get_weight(_root("b")) == 20
+    assert fork_choice.find_head(_root("genesis")) == _root("f")
+
+
+def test_proto_array_prune():
+    fork_choice = _mk_fork_choice(TREE)
+    fork_choice.update_balances((10, 25, 30))
+
+    fork_choice.process_attestation(0, _root("c"), 2)
+    fork_choice.process_attestation(1, _root("e"), 2)
+    fork_choice.process_attestation(2, _root("d"), 2)
+    fork_choice.prune(_root("a"))
+
+    for name in ("genesis", "b", "e"):
+        assert _root(name) not in fork_choice.proto_array
+    assert fork_choice.get_weight(_root("a")) == 40
+    assert fork_choice.find_head(_root("a")) == _root("d")
+
+    fork_choice.process_block(_root("f"), _root("c"), 3)
+    fork_choice.process_attestation(1, _root("f"), 3)
+    assert fork_choice.get_weight(_root("a")) == 65
+    assert fork_choice.find_head(_root("a")) == _root("f")
+
+
+def test_proto_array_prune_pending_votes():
+    fork_choice = _mk_fork_choice(TREE)
+    fork_choice.update_balances((10, 20))
+
+    # Votes for blocks which are not in the tree
+    fork_choice.process_attestation(0, _root("x"), 1)
+    fork_choice.process_attestation(1, _root("y"), 3)
+    assert fork_choice.get_unknown_vote_roots() == {_root("x"), _root("y")}
+
+    # test: the vote from before the finalized slot is dropped
+    fork_choice.prune(_root("a"))
+    assert fork_choice.get_unknown_vote_roots() == {_root("y")}
+
+    fork_choice.process_block(_root("y"), _root("c"), 3)
+    assert fork_choice.get_weight(_root("a")) == 20
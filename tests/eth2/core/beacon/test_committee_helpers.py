@@ -6,11 +6,14 @@ import pytest
 from eth2.beacon.committee_helpers import (
     _calculate_first_committee_at_slot,
     _find_proposer_in_committee,
+    compute_shuffled_index,
+    compute_shuffled_indices,
     get_beacon_proposer_index,
     get_committee_count,
     get_committees_per_slot,
     get_crosslink_committee,
     get_shard_delta,
+    get_shuffled_indices,
     get_start_shard,
 )
 from eth2.beacon.helpers import (
@@ -249,3 +252,29 @@ def test_get_crosslink_committee(genesis_state, config):
 
     assert set(indices) == set(range(len(genesis_state.validators)))
     assert len(indices) == len(genesis_state.validators)
+
+
+@pytest.mark.parametrize("index_count", (0, 1, 2, 3, 17, 255, 256, 257, 1000))
+def test_compute_shuffled_indices(index_count):
+    seed = bytes(range(32))
+    shuffle_round_count = 10
+    indices = tuple(range(100, 100 + index_count))
+
+    expected = tuple(
+        indices[compute_shuffled_index(i, index_count, seed, shuffle_round_count)]
+        for i in range(index_count)
+    )
+    assert compute_shuffled_indices(indices, seed, shuffle_round_count) == expected
+
+
+def test_get_shuffled_indices_is_cached():
+    seed = b"\x12" * 32
+    indices = tuple(range(64))
+
+    shuffled_indices = get_shuffled_indices(indices, seed, 10)
+    assert shuffled_indices == compute_shuffled_indices(indices, seed, 10)
+    assert get_shuffled_indices(tuple(range(64)), seed, 10) is shuffled_indices
+
+    assert get_shuffled_indices(indices[1:], seed, 10) == compute_shuffled_indices(
+        indices[1:], seed, 10
+    )
@@ -15,9 +15,11 @@ from eth2.beacon.epoch_processing_helpers import (
     decrease_balance,
     get_attesting_indices,
     get_base_reward,
+    get_base_rewards,
     get_matching_head_attestations,
     get_matching_source_attestations,
     get_matching_target_attestations,
+    get_total_active_balance,
     get_unslashed_attesting_indices,
     get_validator_churn_limit,
     increase_balance,
@@ -415,3 +417,16 @@ def test_find_winning_crosslink_and_attesting_indices_from_candidates(
 
 def test_get_base_reward(genesis_state, config):
     assert get_base_reward(genesis_state, 0, config) == 724077
+
+
+def test_get_base_rewards(genesis_state, config):
+    state = genesis_state.copy(
+        validators=tuple(
+            validator.copy(effective_balance=validator.effective_balance - index)
+            for index, validator in enumerate(genesis_state.validators)
+        )
+    )
+    total_active_balance = get_total_active_balance(state, config)
+    assert get_base_rewards(state, total_active_balance, config) == tuple(
+        get_base_reward(state, index, config) for index in range(len(state.validators))
+    )
@@ -1,10 +1,19 @@
 from eth.constants import ZERO_HASH32
 from eth_utils import ValidationError, to_tuple
+from lru import LRU
 import pytest
 
 from eth2._utils.hash import hash_eth2
-from eth2.beacon.constants import FAR_FUTURE_EPOCH, GWEI_PER_ETH
+from eth2._utils.tuple import update_tuple_item
+from eth2.beacon import epoch_processing_helpers
+from eth2.beacon.constants import (
+    FAR_FUTURE_EPOCH,
+    GWEI_PER_ETH,
+    REGISTRY_EPOCH_CACHE_SIZE,
+)
+from eth2.beacon.epoch_processing_helpers import get_total_active_balance
 from eth2.beacon.helpers import (
+    ValidatorPubkeyIndex,
     _get_fork_version,
     _get_seed,
     compute_start_slot_of_epoch,
@@ -12,6 +21,7 @@ from eth2.beacon.helpers import (
     get_block_root_at_slot,
     get_domain,
     get_total_balance,
+    get_validator_index_by_pubkey,
 )
 from eth2.beacon.types.forks import Fork
 from eth2.beacon.types.states import BeaconState
@@ -108,6 +118,127 @@ def test_get_active_validator_indices(sample_validator_record_params):
     assert len(active_validator_indices) == 1
 
 
+def test_get_active_validator_indices_cache(sample_validator_record_params):
+    current_epoch = 1
+    validators = tuple(
+        Validator(**sample_validator_record_params).copy(
+            activation_epoch=0, exit_epoch=FAR_FUTURE_EPOCH
+        )
+        for i in range(3)
+    )
+    active_validator_indices = get_active_validator_indices(validators, current_epoch)
+    assert active_validator_indices == (0, 1, 2)
+    # test: the indices are computed once per registry and epoch
+    assert (
+        get_active_validator_indices(validators, current_epoch)
+        is active_validator_indices
+    )
+    assert get_active_validator_indices(validators, FAR_FUTURE_EPOCH) == ()
+
+    # test: an updated registry does not hit the entry of the previous one
+    updated_validators = update_tuple_item(
+        validators, 0, validators[0].copy(exit_epoch=current_epoch)
+    )
+    assert get_active_validator_indices(updated_validators, current_epoch) == (1, 2)
+    assert get_active_validator_indices(validators, current_epoch) == (0, 1, 2)
+
+
+@pytest.fixture
+def total_balance_computations(monkeypatch):
+    """
+    Start from an empty total active balance cache, and record the computations which
+    miss it.
+    """
+    monkeypatch.setattr(
+        epoch_processing_helpers,
+        "_total_active_balance_cache",
+        LRU(REGISTRY_EPOCH_CACHE_SIZE),
+    )
+    computations = []
+
+    def _get_total_balance(state, validator_indices):
+        computations.append(state.validators)
+        return get_total_balance(state, validator_indices)
+
+    monkeypatch.setattr(
+        epoch_processing_helpers, "get_total_balance", _get_total_balance
+    )
+    return computations
+
+
+def test_get_total_active_balance_cache_hit(
+    genesis_state, config, total_balance_computations
+):
+    total_active_balance = get_total_active_balance(genesis_state, config)
+    assert len(total_balance_computations) == 1
+
+    # test: the balance is computed once per registry and epoch, and shared by the
+    # states with the same registry
+    assert get_total_active_balance(genesis_state, config) == total_active_balance
+    next_slot_state = genesis_state.copy(
+        slot=genesis_state.slot + 1, validators=genesis_state.validators
+    )
+    assert get_total_active_balance(next_slot_state, config) == total_active_balance
+    assert len(total_balance_computations) == 1
+
+
+def test_get_total_active_balance_cache_miss(
+    genesis_state, config, total_balance_computations
+):
+    total_active_balance = get_total_active_balance(genesis_state, config)
+    validator = genesis_state.validators[0]
+    updated_state = genesis_state.update_validator(
+        0, validator.copy(effective_balance=validator.effective_balance - GWEI_PER_ETH)
+    )
+
+    # test: an updated effective balance misses the cache and is recomputed
+    assert get_total_active_balance(updated_state, config) == (
+        total_active_balance - GWEI_PER_ETH
+    )
+    assert total_balance_computations == [
+        genesis_state.validators,
+        updated_state.validators,
+    ]
+    # and the entry of the previous registry is kept
+    assert get_total_active_balance(genesis_state, config) == total_active_balance
+    assert len(total_balance_computations) == 2
+
+
+def test_validator_pubkey_index(sample_validator_record_params):
+    validators = tuple(
+        Validator(**sample_validator_record_params).copy(pubkey=bytes([i]) * 48)
+        for i in range(4)
+    )
+    pubkey_index = ValidatorPubkeyIndex()
+
+    assert pubkey_index.get_index(validators[:2], validators[1].pubkey) == 1
+    assert pubkey_index.get_index(validators[:2], validators[3].pubkey) is None
+    assert len(pubkey_index) == 2
+
+    # Validators appended to the registry are indexed incrementally
+    assert pubkey_index.get_index(validators, validators[3].pubkey) == 3
+    assert len(pubkey_index) == 4
+    # and aren't found in the registries of earlier states
+    assert pubkey_index.get_index(validators[:3], validators[3].pubkey) is None
+
+    # The index is rebuilt for an unrelated registry
+    other_validators = tuple(reversed(validators))
+    assert pubkey_index.get_index(other_validators, validators[3].pubkey) == 0
+    # even if only keys between the first and the last one differ
+    swapped_validators = (
+        other_validators[0],
+        other_validators[2],
+        other_validators[1],
+        other_validators[3],
+    )
+    assert pubkey_index.get_index(swapped_validators, validators[2].pubkey) == 2
+    assert pubkey_index.get_index(swapped_validators, validators[1].pubkey) == 1
+
+    for index, validator in enumerate(validators):
+        assert get_validator_index_by_pubkey(validators, validator.pubkey) == index
+    assert get_validator_index_by_pubkey(validators, b"\xff" * 48) is None
+
+
 @pytest.mark.parametrize(
     ("balances," "validator_indices," "expected"),
     [
@@ -2,7 +2,10 @@ import pytest
 
 from eth2.beacon.exceptions import NoCommitteeAssignment
 from eth2.beacon.helpers import compute_start_slot_of_epoch
-from eth2.beacon.tools.builder.committee_assignment import get_committee_assignment
+from eth2.beacon.tools.builder.committee_assignment import (
+    get_committee_assignment,
+    get_validator_duties,
+)
 
 
 @pytest.mark.parametrize(
@@ -69,3 +72,28 @@ def test_get_committee_assignment_no_assignment(
 
     with pytest.raises(NoCommitteeAssignment):
         get_committee_assignment(state, config, current_epoch, validator_index)
+
+
+@pytest.mark.parametrize(
+    ("validator_count," "slots_per_epoch," "target_committee_size," "shard_count,"),
+    [(40, 16, 1, 16)],
+)
+@pytest.mark.parametrize(("state_epoch," "epoch,"), [(0, 0), (1, 1), (1, 2)])
+def test_get_validator_duties(
+    genesis_state, slots_per_epoch, config, validator_count, state_epoch, epoch
+):
+    state = genesis_state.copy(
+        slot=compute_start_slot_of_epoch(state_epoch, slots_per_epoch)
+    )
+    validator_indices = range(0, validator_count, 3)
+
+    duties = get_validator_duties(state, config, epoch, validator_indices)
+
+    assert set(duties.keys()) == set(validator_indices)
+    for validator_index, duty in duties.items():
+        assignment = get_committee_assignment(state, config, epoch, validator_index)
+        assert duty.committee == assignment.committee
+        assert duty.shard == assignment.shard
+        assert duty.slot == assignment.slot
+        assert duty.is_proposer == assignment.is_proposer
+        assert duty.committee[duty.committee_index] == validator_index
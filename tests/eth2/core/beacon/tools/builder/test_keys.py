@@ -0,0 +1,57 @@
+import multiprocessing
+from pathlib import Path
+
+from eth2._utils.bls import bls
+from eth2.beacon.tools.builder.keys import (
+    MIN_PARALLEL_KEY_COUNT,
+    create_privkey,
+    load_or_create_keys,
+    map_in_process_pool,
+    privtopubs,
+)
+from eth2.beacon.tools.builder.validator import (
+    create_mock_deposit_data,
+    create_mock_deposit_datas,
+)
+
+
+def test_map_in_process_pool_keeps_order():
+    items = tuple(range(-MIN_PARALLEL_KEY_COUNT * 2, 0))
+    assert map_in_process_pool(abs, items) == tuple(abs(item) for item in items)
+    assert map_in_process_pool(abs, items[:1]) == (abs(items[0]),)
+    # The worker processes don't outlive the call
+    assert multiprocessing.active_children() == []
+
+
+def test_load_or_create_keys(tmpdir):
+    tmp_path = Path(str(tmpdir))
+    privkeys = tuple(create_privkey(index) for index in range(3))
+    pubkeys = privtopubs(privkeys)
+    assert pubkeys == tuple(bls.privtopub(privkey) for privkey in privkeys)
+
+    keymap = load_or_create_keys(tmp_path, 2)
+    assert tuple(keymap.items()) == tuple(zip(pubkeys, privkeys))[:2]
+
+    # Keys already in the keystore are read back, the others are added
+    assert load_or_create_keys(tmp_path, 1) == dict(tuple(keymap.items())[:1])
+    keymap = load_or_create_keys(tmp_path, 3)
+    assert tuple(keymap.items()) == tuple(zip(pubkeys, privkeys))
+
+
+def test_create_mock_deposit_datas(config, pubkeys, privkeys):
+    withdrawal_credentials = tuple(bytes([index]) * 32 for index in range(3))
+    deposit_datas = create_mock_deposit_datas(
+        config=config,
+        pubkeys=pubkeys[:3],
+        privkeys=tuple(privkeys[index] for index in range(3)),
+        withdrawal_credentials=withdrawal_credentials,
+    )
+    assert deposit_datas == tuple(
+        create_mock_deposit_data(
+            config=config,
+            pubkey=pubkeys[index],
+            privkey=privkeys[index],
+            withdrawal_credentials=withdrawal_credentials[index],
+        )
+        for index in range(3)
+    )
@@ -6,9 +6,17 @@ import pytest
 from eth2._utils.bitfield import get_empty_bitfield, has_voted
 from eth2._utils.bls import bls
 from eth2._utils.bls.backends.milagro import MilagroBackend
-from eth2.beacon.helpers import compute_domain
+from eth2.beacon.helpers import compute_domain, compute_epoch_of_slot, get_domain
 from eth2.beacon.signature_domain import SignatureDomain
-from eth2.beacon.tools.builder.validator import aggregate_votes, verify_votes
+from eth2.beacon.tools.builder.validator import (
+    aggregate_votes,
+    create_signed_attestations_at_slot,
+    get_crosslink_committees_at_slot,
+    verify_votes,
+)
+from eth2.beacon.types.attestation_data_and_custody_bits import (
+    AttestationDataAndCustodyBit,
+)
 
 
 @pytest.mark.slow
@@ -64,3 +72,65 @@ def test_aggregate_votes(votes_count, random, privkeys, pubkeys):
             bls.validate(message_hash, aggregated_pubs, sigs, domain)
     else:
         bls.validate(message_hash, aggregated_pubs, sigs, domain)
+
+
+@pytest.mark.parametrize(
+    ("validator_count", "slots_per_epoch", "target_committee_size", "shard_count"),
+    [(40, 4, 2, 4)],
+)
+def test_create_signed_attestations_at_slot(
+    genesis_state,
+    genesis_block,
+    config,
+    fixture_sm_class,
+    chaindb,
+    empty_attestation_pool,
+    keymap,
+):
+    state = genesis_state
+    state_machine = fixture_sm_class(chaindb, empty_attestation_pool)
+    slot = state.slot + 1
+    validator_privkeys = {
+        index: keymap[validator.pubkey]
+        for index, validator in enumerate(state.validators)
+    }
+    committee_attesters = tuple(
+        (committee, shard, tuple(range(0, len(committee), 2)))
+        for committee, shard in get_crosslink_committees_at_slot(state, slot, config)
+    )
+
+    attestations = create_signed_attestations_at_slot(
+        state,
+        config,
+        state_machine,
+        slot,
+        genesis_block.signing_root,
+        validator_privkeys,
+        committee_attesters,
+    )
+
+    domain = get_domain(
+        state,
+        SignatureDomain.DOMAIN_ATTESTATION,
+        config.SLOTS_PER_EPOCH,
+        message_epoch=compute_epoch_of_slot(slot, config.SLOTS_PER_EPOCH),
+    )
+    # One aggregate attestation per committee, signed by all of its attesters
+    assert len(attestations) == len(committee_attesters)
+    for attestation, (committee, shard, attesting_indices) in zip(
+        attestations, committee_attesters
+    ):
+        assert attestation.data.crosslink.shard == shard
+        bits = attestation.aggregation_bits
+        assert tuple(index for index in range(len(committee)) if bits[index]) == (
+            attesting_indices
+        )
+        message_hash = AttestationDataAndCustodyBit(
+            data=attestation.data, custody_bit=False
+        ).hash_tree_root
+        aggregate_pubkey = bls.aggregate_pubkeys(
+            tuple(
+                state.validators[committee[index]].pubkey for index in attesting_indices
+            )
+        )
+        bls.validate(message_hash, aggregate_pubkey, attestation.signature, domain)
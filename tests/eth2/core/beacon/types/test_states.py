@@ -1,6 +1,7 @@
 import pytest
 import ssz
 
+from eth2._utils.merkle.ssz_cache import get_node_hash_count
 from eth2.beacon.tools.builder.initializer import create_mock_validator
 from eth2.beacon.types.states import BeaconState
 
@@ -51,3 +52,34 @@ def test_update_validator(
                 validator=validator,
                 balance=new_balance,
             )
+
+
+def test_hash_tree_root_is_updated_incrementally(genesis_state, config):
+    state = genesis_state
+    assert state.hash_tree_root == ssz.get_hash_tree_root(state)
+
+    # A state decoded from scratch has no caches to start from
+    node_hash_count_before = get_node_hash_count()
+    decoded_state = ssz.decode(ssz.encode(state), type(state))
+    assert decoded_state.hash_tree_root == state.hash_tree_root
+    full_node_hash_count = get_node_hash_count() - node_hash_count_before
+
+    updated_states = (
+        state.copy(slot=state.slot + 1),
+        state.update_validator(
+            validator_index=0,
+            validator=create_mock_validator(b"\x55" * 48, config),
+            balance=100,
+        ),
+        state.copy(
+            validators=state.validators
+            + (create_mock_validator(b"\x66" * 48, config),),
+            balances=state.balances + (1,),
+        ),
+        state.copy(current_epoch_attestations=()),
+    )
+    for updated_state in updated_states:
+        node_hash_count_before = get_node_hash_count()
+        assert updated_state.hash_tree_root == ssz.get_hash_tree_root(updated_state)
+        # Only a few branches of the state tree are rehashed
+        assert get_node_hash_count() - node_hash_count_before < full_node_hash_count / 2
@@ -1,10 +1,15 @@
+import re
+import threading
+
 from eth_utils import ValidationError
 from py_ecc.optimized_bls12_381 import curve_order
 import pytest
 
 from eth2._utils.bls import bls
 from eth2._utils.bls.backends import AVAILABLE_BACKENDS, NoOpBackend
+from eth2._utils.bls.backends.base import SignatureSet
 from eth2.beacon.constants import EMPTY_PUBKEY, EMPTY_SIGNATURE
+from eth2.beacon.exceptions import SignatureError
 
 
 def assert_pubkey(obj):
@@ -192,3 +197,177 @@ def test_multi_aggregation(backend, msg_1, msg_2, privkeys_1, privkeys_2, domain
     assert bls.verify_multiple(
         pubkeys=pubs, message_hashes=message_hashes, signature=aggsig, domain=domain
     )
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_verify_signature_sets(backend, domain):
+    bls.use(backend)
+    other_domain = (456).to_bytes(8, "big")
+    msg_1 = b"\x12" * 32
+    msg_2 = b"\x34" * 32
+
+    signature_sets = (
+        SignatureSet(
+            (bls.privtopub(1),), (msg_1,), bls.sign(msg_1, 1, domain=domain), domain
+        ),
+        # Same message and domain as the first set
+        SignatureSet(
+            (bls.privtopub(2),), (msg_1,), bls.sign(msg_1, 2, domain=domain), domain
+        ),
+        SignatureSet(
+            (bls.privtopub(3),),
+            (msg_1,),
+            bls.sign(msg_1, 3, domain=other_domain),
+            other_domain,
+        ),
+        SignatureSet(
+            (bls.aggregate_pubkeys((bls.privtopub(4), bls.privtopub(5))), EMPTY_PUBKEY),
+            (msg_1, msg_2),
+            bls.aggregate_signatures(
+                (bls.sign(msg_1, 4, domain=domain), bls.sign(msg_1, 5, domain=domain))
+            ),
+            domain,
+        ),
+    )
+    assert backend.verify_signature_sets(signature_sets)
+    assert backend.verify_signature_sets(())
+
+    if backend == NoOpBackend:
+        return
+
+    # Swapping the signatures of two sets which are each valid
+    invalid_signature_sets = (
+        signature_sets[0]._replace(signature=signature_sets[1].signature),
+        signature_sets[1]._replace(signature=signature_sets[0].signature),
+    ) + signature_sets[2:]
+    assert not backend.verify_signature_sets(invalid_signature_sets)
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_batch_validation(backend, domain):
+    bls.use(backend)
+    msg = b"\x12" * 32
+    pubkeys = tuple(bls.privtopub(k) for k in (1, 2, 3))
+    signatures = tuple(bls.sign(msg, k, domain=domain) for k in (1, 2, 3))
+
+    with bls.batch_validation():
+        bls.validate(msg, pubkeys[0], signatures[0], domain)
+        with bls.batch_validation():
+            bls.validate_multiple(
+                (bls.aggregate_pubkeys(pubkeys[1:]),),
+                (msg,),
+                bls.aggregate_signatures(signatures[1:]),
+                domain,
+            )
+
+    if backend == NoOpBackend:
+        return
+
+    with pytest.raises(SignatureError, match=re.escape(str(pubkeys[2]))):
+        with bls.batch_validation():
+            bls.validate(msg, pubkeys[0], signatures[0], domain)
+            bls.validate(msg, pubkeys[2], signatures[1], domain)
+            bls.validate(msg, pubkeys[1], signatures[1], domain)
+
+    # Signatures are checked right away outside of a batch
+    with pytest.raises(SignatureError):
+        bls.validate(msg, pubkeys[2], signatures[1], domain)
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_batch_validation_is_per_thread(backend, domain):
+    bls.use(backend)
+    msg = b"\x12" * 32
+    pubkeys = tuple(bls.privtopub(k) for k in (1, 2))
+    signatures = tuple(bls.sign(msg, k, domain=domain) for k in (1, 2))
+
+    batch_entered = threading.Event()
+    batch_released = threading.Event()
+    batch_errors = []
+
+    def validate_in_batch():
+        try:
+            with bls.batch_validation():
+                bls.validate(msg, pubkeys[0], signatures[0], domain)
+                batch_entered.set()
+                batch_released.wait()
+        except SignatureError as err:
+            batch_errors.append(err)
+
+    thread = threading.Thread(target=validate_in_batch)
+    thread.start()
+    batch_entered.wait()
+    try:
+        if backend == NoOpBackend:
+            bls.validate(msg, pubkeys[1], signatures[0], domain)
+        else:
+            # Not deferred to the batch of the other thread
+            with pytest.raises(SignatureError):
+                bls.validate(msg, pubkeys[1], signatures[0], domain)
+    finally:
+        batch_released.set()
+        thread.join()
+    assert batch_errors == []
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_signature_cache(backend, domain, monkeypatch):
+    bls.use(backend)
+    msg = b"\x12" * 32
+    pubkey = bls.privtopub(1)
+    signature = bls.sign(msg, 1, domain=domain)
+    other_signature = bls.sign(msg, 2, domain=domain)
+
+    verified_signatures = []
+    verify = backend.verify
+
+    def _verify(message_hash, pubkey, signature, domain):
+        verified_signatures.append(signature)
+        return verify(message_hash, pubkey, signature, domain)
+
+    monkeypatch.setattr(backend, "verify", staticmethod(_verify))
+
+    bls.validate(msg, pubkey, signature, domain)
+    bls.validate(msg, pubkey, signature, domain)
+    with bls.batch_validation():
+        bls.validate(msg, pubkey, signature, domain)
+    assert verified_signatures == [signature]
+
+    cache_info = bls.signature_cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 1
+    assert cache_info.currsize == 1
+    assert cache_info.hit_rate == 2 / 3
+
+    if backend != NoOpBackend:
+        # Invalid signatures are not cached
+        for _ in range(2):
+            with pytest.raises(SignatureError):
+                bls.validate(msg, pubkey, other_signature, domain)
+        assert bls.signature_cache_info().currsize == 1
+
+    bls.use(backend)
+    assert bls.signature_cache_info() == (0, 0, cache_info.maxsize, 0)
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_aggregate_pubkeys_cache(backend, monkeypatch):
+    bls.use(backend)
+    pubkeys = tuple(bls.privtopub(k) for k in range(1, 6))
+
+    if backend != NoOpBackend:
+        assert bls.aggregate_pubkeys(pubkeys) == bls.privtopub(sum(range(1, 6)))
+
+    aggregated = []
+    aggregate_pubkeys = backend.aggregate_pubkeys
+
+    def _aggregate_pubkeys(pubkeys):
+        aggregated.append(pubkeys)
+        return aggregate_pubkeys(pubkeys)
+
+    monkeypatch.setattr(backend, "aggregate_pubkeys", staticmethod(_aggregate_pubkeys))
+
+    aggregate_pubkey = bls.aggregate_pubkeys(pubkeys[:3])
+    assert bls.aggregate_pubkeys(list(pubkeys[:3])) == aggregate_pubkey
+    bls.aggregate_pubkeys(pubkeys[1:4])
+    assert aggregated == [pubkeys[:3], pubkeys[1:4]]
@@ -0,0 +1,52 @@
+import pytest
+
+from eth2._utils.hash import hash_eth2
+from eth2._utils.merkle.common import get_merkle_proof, verify_merkle_branch
+from eth2._utils.merkle.incremental import IncrementalMerkleTree, mix_in_length
+from eth2._utils.merkle.sparse import (
+    EmptyNodeHashes,
+    TreeDepth,
+    calc_merkle_tree_from_leaves,
+    get_root,
+)
+
+
+def test_empty_incremental_merkle_tree():
+    tree = IncrementalMerkleTree()
+    assert len(tree) == 0
+    assert tree.get_root() == hash_eth2(EmptyNodeHashes[-1] + EmptyNodeHashes[-1])
+    with pytest.raises(ValueError):
+        tree.get_last_proof()
+
+
+@pytest.mark.parametrize("leaf_count", (1, 2, 3, 4, 5, 8, 13))
+def test_incremental_merkle_tree_matches_full_tree(leaf_count):
+    leaves = tuple(hash_eth2(bytes([index])) for index in range(leaf_count))
+    tree = IncrementalMerkleTree()
+    for index, leaf in enumerate(leaves):
+        tree.append(leaf)
+        assert len(tree) == index + 1
+
+        full_tree = calc_merkle_tree_from_leaves(leaves[: index + 1])
+        assert tree.get_root() == get_root(full_tree)
+
+        proof = tree.get_last_proof()
+        assert proof == get_merkle_proof(full_tree, index)
+        assert verify_merkle_branch(leaf, proof, TreeDepth, index, tree.get_root())
+
+
+def test_incremental_merkle_tree_is_bounded():
+    depth = 3
+    tree = IncrementalMerkleTree(depth)
+    for index in range(2 ** depth - 1):
+        tree.append(hash_eth2(bytes([index])))
+    with pytest.raises(ValueError):
+        tree.append(hash_eth2(b"one too many"))
+
+    with pytest.raises(ValueError):
+        IncrementalMerkleTree(TreeDepth + 1)
+
+
+def test_mix_in_length():
+    root = hash_eth2(b"root")
+    assert mix_in_length(root, 3) == hash_eth2(root + (3).to_bytes(32, "little"))
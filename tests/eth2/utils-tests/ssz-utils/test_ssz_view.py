@@ -0,0 +1,46 @@
+import pytest
+import ssz
+
+from eth2._utils.ssz import SSZView
+from eth2.beacon.types.blocks import BeaconBlock, BeaconBlockBody
+from eth2.beacon.types.checkpoints import Checkpoint
+
+
+@pytest.mark.parametrize(
+    "value",
+    (
+        Checkpoint(epoch=3, root=b"\x12" * 32),
+        BeaconBlock(slot=5, parent_root=b"\x34" * 32),
+        BeaconBlock(
+            slot=5, body=BeaconBlockBody(graffiti=b"\x56" * 32), signature=b"\x78" * 96
+        ),
+    ),
+)
+def test_ssz_view(value):
+    view = SSZView(type(value), ssz.encode(value))
+    for field_name in type(value)._meta.field_names:
+        assert getattr(view, field_name) == getattr(value, field_name)
+    assert view.materialize() == value
+
+    with pytest.raises(AttributeError):
+        view.unknown_field
+
+
+@pytest.mark.parametrize(
+    "serializable_class, data",
+    (
+        (Checkpoint, ssz.encode(Checkpoint())[:-1]),
+        (Checkpoint, ssz.encode(Checkpoint()) + b"\x00"),
+        (BeaconBlock, ssz.encode(BeaconBlock())[:10]),
+        # The offset of `body` does not follow the fixed-size fields
+        (
+            BeaconBlock,
+            ssz.encode(BeaconBlock())[:72]
+            + b"\xff" * 4
+            + ssz.encode(BeaconBlock())[76:],
+        ),
+    ),
+)
+def test_ssz_view_invalid_data(serializable_class, data):
+    with pytest.raises(ssz.DeserializationError):
+        SSZView(serializable_class, data)
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Tuple
 
 from eth.exceptions import BlockNotFound
@@ -7,6 +8,7 @@ from libp2p.pubsub.pb import rpc_pb2
 import pytest
 import ssz
 
+from eth2._utils.bls import bls
 from eth2.beacon.chains.base import BaseBeaconChain
 from eth2.beacon.chains.testnet import TestnetChain as _TestnetChain
 from eth2.beacon.fork_choice.higher_slot import higher_slot_scoring
@@ -16,6 +18,7 @@ from eth2.beacon.state_machines.forks.xiao_long_bao.configs import XIAO_LONG_BAO
 from eth2.beacon.types.attestation_data import AttestationData
 from eth2.beacon.types.attestations import Attestation
 from eth2.beacon.types.blocks import BaseBeaconBlock, BeaconBlock
+from eth2.beacon.types.checkpoints import Checkpoint
 from eth2.beacon.typing import FromBlockParams
 from eth2.configs import Eth2GenesisConfig
 from trinity.db.beacon.chain import AsyncBeaconChainDB
@@ -113,7 +116,7 @@ async def receive_server_with_mock_process_orphan_blocks_period(
 
 
 def test_attestation_pool():
-    pool = AttestationPool()
+    pool = AttestationPool(lambda data: 0)
     a1 = Attestation()
     a2 = Attestation(data=a1.data.copy(beacon_block_root=b"\x55" * 32))
     a3 = Attestation(data=a1.data.copy(beacon_block_root=b"\x66" * 32))
@@ -147,6 +150,90 @@ def test_attestation_pool():
     assert len(pool) == 0
 
 
+def _mk_attestation(data, bits, privkeys):
+    return Attestation(
+        aggregation_bits=bits,
+        data=data,
+        custody_bits=(False,) * len(bits),
+        signature=bls.aggregate_signatures(
+            tuple(
+                bls.sign(data.hash_tree_root, privkey, b"\x00" * 8)
+                for privkey in privkeys
+            )
+        ),
+    )
+
+
+def test_attestation_pool_aggregation():
+    pool = AttestationPool(lambda data: 0)
+    data = AttestationData()
+    a1 = _mk_attestation(data, (True, False, False), (1,))
+    a2 = _mk_attestation(data, (False, True, False), (2,))
+    a12 = _mk_attestation(data, (True, True, False), (1, 2))
+    a3 = _mk_attestation(data, (False, True, True), (2, 3))
+
+    pool.add(a1, is_signature_verified=True)
+    # test: disjoint votes for the same data are aggregated
+    pool.add(a2, is_signature_verified=True)
+    assert len(pool) == 1
+    assert pool.get_all() == (a12,)
+    # test: attestations whose votes are all in the pool are not new
+    assert a1 in pool
+    assert a2 in pool
+    # test: overlapping votes are kept apart
+    pool.add(a3, is_signature_verified=True)
+    assert len(pool) == 2
+    # test: including an aggregate on chain removes the attestations it covers
+    pool.remove(_mk_attestation(data, (True, True, True), (1, 2, 3)))
+    assert len(pool) == 0
+
+    # test: attestations whose signature is not verified are not aggregated
+    invalid_a2 = a2.copy(signature=a3.signature)
+    pool.add(a1, is_signature_verified=True)
+    pool.add(invalid_a2)
+    assert set(pool.get_all()) == {a1, invalid_a2}
+    pool.add(
+        _mk_attestation(data, (False, False, True), (3,)), is_signature_verified=True
+    )
+    a13 = _mk_attestation(data, (True, False, True), (1, 3))
+    assert set(pool.get_all()) == {a13, invalid_a2}
+
+
+def test_attestation_pool_get_attestations_for_block():
+    slots_per_epoch = 4
+    min_attestation_inclusion_delay = 1
+    pool = AttestationPool(lambda data: data.target.epoch * slots_per_epoch)
+    data_0 = AttestationData()
+    data_1 = AttestationData(target=Checkpoint(epoch=1))
+    a1 = _mk_attestation(data_0, (True, True, False), (1, 2))
+    a2 = _mk_attestation(data_0, (False, False, True), (3,))
+    a3 = _mk_attestation(data_0, (True, False, False), (1,))
+    a4 = _mk_attestation(data_1, (True, False, False), (1,))
+    a5 = _mk_attestation(data_1, (False, False, False), ())
+    pool.batch_add((a1, a2, a3, a4, a5))
+    # `a3` is covered by `a1`
+    assert len(pool) == 4
+
+    def get_attestations_for_block(slot, max_attestations=10):
+        return pool.get_attestations_for_block(
+            slot, slots_per_epoch, min_attestation_inclusion_delay, max_attestations
+        )
+
+    # test: too early for any attestation
+    assert get_attestations_for_block(0) == ()
+    # test: attestations with more votes come first
+    assert get_attestations_for_block(1) == (a1, a2)
+    assert get_attestations_for_block(1, max_attestations=1) == (a1,)
+    assert get_attestations_for_block(4) == (a1, a2)
+    # test: attestations which can't be included anymore are skipped, but only pruned
+    # explicitly; attestations without votes are never picked
+    assert get_attestations_for_block(5) == (a4,)
+    assert len(pool) == 4
+    pool.prune(5, slots_per_epoch)
+    assert len(pool) == 2
+    assert get_attestations_for_block(5) == (a4,)
+
+
 def test_orphan_block_pool():
     pool = OrphanBlockPool()
     b0 = BeaconBlockFactory()
@@ -154,7 +241,7 @@ def test_orphan_block_pool():
     b2 = BeaconBlockFactory(parent=b0, state_root=b"\x11" * 32)
     # test: add
     pool.add(b1)
-    assert b1 in pool._pool
+    assert b1.signing_root in pool._pool
     assert len(pool._pool) == 1
     # test: add: no side effect for adding twice
     pool.add(b1)
@@ -179,6 +266,64 @@ def test_orphan_block_pool():
     assert len(pool._pool) == 0
 
 
+def test_orphan_block_pool_descendants():
+    pool = OrphanBlockPool()
+    b0 = BeaconBlockFactory()
+    b1 = BeaconBlockFactory(parent=b0)
+    b2 = BeaconBlockFactory(parent=b1)
+    b3 = BeaconBlockFactory(parent=b0, state_root=b"\x11" * 32)
+    for block in (b1, b2, b3):
+        pool.add(block)
+    # test: only `b0` is missing, the other parents are in the pool
+    assert pool.get_missing_parent_roots() == (b0.signing_root,)
+    # test: remove_descendants
+    assert pool.remove_descendants(b1.signing_root) == (b2,)
+    assert b2 not in pool
+    assert len(pool) == 2
+
+
+def test_orphan_block_pool_max_size():
+    pool = OrphanBlockPool(max_size=2)
+    b0 = BeaconBlockFactory()
+    b1 = BeaconBlockFactory(parent=b0)
+    b2 = BeaconBlockFactory(parent=b1)
+    b3 = BeaconBlockFactory(parent=b0, state_root=b"\x11" * 32)
+    pool.add(b1)
+    pool.add(b2)
+    # test: the oldest block is evicted along with its descendants
+    pool.add(b3)
+    assert b1 not in pool
+    assert b2 not in pool
+    assert b3 in pool
+    assert len(pool) == 1
+    assert pool.get_missing_parent_roots() == (b0.signing_root,)
+
+
+def test_orphan_block_pool_max_age(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    pool = OrphanBlockPool(max_age=10)
+    b0 = BeaconBlockFactory()
+    b1 = BeaconBlockFactory(parent=b0)
+    b2 = BeaconBlockFactory(parent=b1)
+    b3 = BeaconBlockFactory(parent=b0, state_root=b"\x11" * 32)
+    pool.add(b1)
+    now += 5
+    pool.add(b3)
+    pool.add(b2)
+    # test: nothing expires before `max_age`
+    assert pool.prune_expired() == ()
+    assert len(pool) == 3
+    # test: expired blocks are dropped along with their descendants
+    now += 6
+    assert pool.prune_expired() == (b1.signing_root,)
+    assert b2 not in pool
+    assert b3 in pool
+    now += 5
+    assert pool.prune_expired() == (b3.signing_root,)
+    assert len(pool) == 0
+
+
 @pytest.mark.asyncio
 async def test_bcc_receive_server_try_import_orphan_blocks(receive_server):
     blocks = get_blocks(receive_server.chain, num_blocks=4)
@@ -249,12 +394,20 @@ async def test_bcc_receive_server_process_received_block(receive_server, monkeyp
     def _try_import_orphan_blocks(parent_root):
         event.set()
 
+    pruned_slots = []
+
+    def prune(slot, slots_per_epoch):
+        pruned_slots.append(slot)
+
     with monkeypatch.context() as m:
         m.setattr(
             receive_server, "_try_import_orphan_blocks", _try_import_orphan_blocks
         )
+        m.setattr(receive_server.attestation_pool, "prune", prune)
         receive_server._process_received_block(block_not_orphan)
         assert event.is_set()
+        # test: the attestation pool is pruned once the block is imported
+        assert pruned_slots == [block_not_orphan.slot]
 
 
 @pytest.mark.asyncio
@@ -278,7 +431,15 @@ async def test_bcc_receive_server_handle_beacon_blocks(receive_server):
 
 
 @pytest.mark.asyncio
-async def test_bcc_receive_server_handle_beacon_attestations(receive_server):
+async def test_bcc_receive_server_handle_beacon_attestations(
+    receive_server, monkeypatch
+):
+    # `FakeChain` keeps no state to compute the slot of the attestation data from
+    monkeypatch.setattr(
+        receive_server.attestation_pool,
+        "_get_attestation_slot",
+        lambda data: XIAO_LONG_BAO_CONFIG.GENESIS_SLOT,
+    )
     attestation = Attestation()
     encoded_attestation = ssz.encode(attestation)
     msg = rpc_pb2.Message(
@@ -403,11 +564,17 @@ async def test_bcc_receive_server_get_ready_attestations(receive_server, monkeyp
         servers, "get_attestation_data_slot", mock_get_attestation_data_slot
     )
     attesting_slot = XIAO_LONG_BAO_CONFIG.GENESIS_SLOT
-    a1 = Attestation(data=AttestationData())
+    a1 = Attestation(aggregation_bits=(True, False), data=AttestationData())
     a1.data.slot = attesting_slot
-    a2 = Attestation(signature=b"\x56" * 96, data=AttestationData())
+    a2 = Attestation(
+        aggregation_bits=(False, True), signature=b"\x56" * 96, data=AttestationData()
+    )
     a2.data.slot = attesting_slot
-    a3 = Attestation(signature=b"\x78" * 96, data=AttestationData())
+    a3 = Attestation(
+        aggregation_bits=(True,),
+        signature=b"\x78" * 96,
+        data=AttestationData(beacon_block_root=b"\x78" * 32),
+    )
     a3.data.slot = attesting_slot + 1
     receive_server.attestation_pool.batch_add([a1, a2, a3])
 
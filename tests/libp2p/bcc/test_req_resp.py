@@ -4,15 +4,20 @@ from eth.constants import ZERO_HASH32
 from eth.exceptions import BlockNotFound
 from eth.validation import validate_word
 import pytest
+import ssz
 
 from eth2.beacon.constants import EMPTY_SIGNATURE
 from eth2.beacon.types.blocks import BeaconBlock, BeaconBlockBody
 from trinity.protocol.bcc_libp2p.configs import GoodbyeReasonCode, ResponseCode
 from trinity.protocol.bcc_libp2p.exceptions import HandshakeFailure, RequestFailure
-from trinity.protocol.bcc_libp2p.messages import HelloRequest
+from trinity.protocol.bcc_libp2p.messages import BeaconBlocksRequest, HelloRequest
 from trinity.protocol.bcc_libp2p.node import REQ_RESP_HELLO_SSZ
 from trinity.protocol.bcc_libp2p.utils import read_req, write_resp
-from trinity.tools.bcc_factories import ConnectionPairFactory, NodeFactory
+from trinity.tools.bcc_factories import (
+    AsyncBeaconChainDBFactory,
+    ConnectionPairFactory,
+    NodeFactory,
+)
 
 
 @pytest.mark.asyncio
@@ -107,50 +112,55 @@ async def test_request_beacon_blocks_fail():
             )
 
 
+def _make_mock_chain(block_slots):
+    mock_block = BeaconBlock(
+        slot=0,
+        parent_root=ZERO_HASH32,
+        state_root=ZERO_HASH32,
+        signature=EMPTY_SIGNATURE,
+        body=BeaconBlockBody(),
+    )
+    blocks = []
+    for slot in block_slots:
+        if len(blocks) == 0:
+            blocks.append(mock_block.copy(slot=slot))
+        else:
+            blocks.append(
+                mock_block.copy(slot=slot, parent_root=blocks[-1].signing_root)
+            )
+    return blocks
+
+
 @pytest.mark.parametrize(
-    "db_block_slots, slot_of_requested_blocks, expected_block_slots",
+    "db_block_slots, start_slot, count, step, expected_block_slots",
     (
-        (range(5), [0, 2, 4], [0, 2, 4]),
-        ([1, 3, 5], [0, 2, 4], []),
-        ([2, 4], range(5), [2, 4]),
+        (range(5), 0, 3, 2, [0, 2, 4]),
+        ([1, 3, 5], 0, 3, 2, []),
+        ([2, 4], 0, 5, 1, [2, 4]),
     ),
 )
 @pytest.mark.asyncio
-async def test_get_blocks_from_canonical_chain_by_slot(
-    monkeypatch, db_block_slots, slot_of_requested_blocks, expected_block_slots
+async def test_get_requested_beacon_blocks_ssz_from_canonical_chain(
+    monkeypatch, db_block_slots, start_slot, count, step, expected_block_slots
 ):
     node = NodeFactory()
 
     # Mock up block database
-    mock_slot_to_block_db = {
-        slot: BeaconBlock(
-            slot=slot,
-            parent_root=ZERO_HASH32,
-            state_root=ZERO_HASH32,
-            signature=EMPTY_SIGNATURE,
-            body=BeaconBlockBody(),
-        )
-        for slot in db_block_slots
-    }
-
-    def get_canonical_block_by_slot(slot):
-        if slot in mock_slot_to_block_db:
-            return mock_slot_to_block_db[slot]
-        else:
-            raise BlockNotFound
-
-    monkeypatch.setattr(
-        node.chain, "get_canonical_block_by_slot", get_canonical_block_by_slot
+    blocks = _make_mock_chain(db_block_slots)
+    monkeypatch.setattr(node.chain, "chaindb", AsyncBeaconChainDBFactory(blocks=blocks))
+
+    request = BeaconBlocksRequest(
+        head_block_root=blocks[-1].hash_tree_root,
+        start_slot=start_slot,
+        count=count,
+        step=step,
     )
+    result_blocks_ssz = node._get_requested_beacon_blocks_ssz(request, blocks[-1])
 
-    result_blocks = node._get_blocks_from_canonical_chain_by_slot(
-        slot_of_requested_blocks=slot_of_requested_blocks
+    assert result_blocks_ssz == tuple(
+        ssz.encode(block) for block in blocks if block.slot in expected_block_slots
     )
 
-    expected_blocks = [mock_slot_to_block_db[slot] for slot in expected_block_slots]
-    assert len(result_blocks) == len(expected_blocks)
-    assert set(result_blocks) == set(expected_blocks)
-
 
 @pytest.mark.asyncio
 async def test_request_beacon_blocks_invalid_request(monkeypatch):
@@ -196,11 +206,11 @@ async def test_request_beacon_blocks_invalid_request(monkeypatch):
             epoch=old_state.finalized_checkpoint.epoch + 1
         )
 
-        def get_canonical_block_by_slot(slot):
+        def get_canonical_block_root(slot):
             raise BlockNotFound
 
         monkeypatch.setattr(
-            bob.chain, "get_canonical_block_by_slot", get_canonical_block_by_slot
+            bob.chain, "get_canonical_block_root", get_canonical_block_root
         )
 
         def get_state_machine(at_slot=None):
@@ -210,11 +220,11 @@ async def test_request_beacon_blocks_invalid_request(monkeypatch):
 
             return MockStateMachine()
 
-        def get_head_state():
+        def get_head_state_view():
             return old_state.copy(finalized_checkpoint=new_checkpoint)
 
         monkeypatch.setattr(bob.chain, "get_state_machine", get_state_machine)
-        monkeypatch.setattr(bob.chain, "get_head_state", get_head_state)
+        monkeypatch.setattr(bob.chain, "get_head_state_view", get_head_state_view)
 
         with pytest.raises(RequestFailure):
             await alice.request_beacon_blocks(
@@ -227,60 +237,48 @@ async def test_request_beacon_blocks_invalid_request(monkeypatch):
 
 
 @pytest.mark.parametrize(
-    "fork_chain_block_slots, slot_of_requested_blocks, expected_block_slots",
+    "fork_chain_block_slots, start_slot, count, step, expected_block_slots",
     (
-        (range(10), [1, 4], [1, 4]),
-        ([0, 2, 3, 7, 8], list(range(1, 9, 2)), [3, 7]),
-        ([0, 2, 5], list(range(1, 6)), [2, 5]),
-        ([0, 4, 5], [2, 3], []),
+        (range(10), 1, 2, 3, [1, 4]),
+        ([0, 2, 3, 7, 8], 1, 4, 2, [3, 7]),
+        ([0, 2, 5], 1, 5, 1, [2, 5]),
+        ([0, 4, 5], 2, 2, 1, []),
     ),
 )
 @pytest.mark.asyncio
-async def test_get_blocks_from_fork_chain_by_root(
-    monkeypatch, fork_chain_block_slots, slot_of_requested_blocks, expected_block_slots
+async def test_get_requested_beacon_blocks_ssz_from_fork_chain(
+    monkeypatch, fork_chain_block_slots, start_slot, count, step, expected_block_slots
 ):
     node = NodeFactory()
 
-    mock_block = BeaconBlock(
-        slot=0,
-        parent_root=ZERO_HASH32,
-        state_root=ZERO_HASH32,
-        signature=EMPTY_SIGNATURE,
-        body=BeaconBlockBody(),
-    )
-
     # Mock up fork chain block database
-    fork_chain_blocks = []
-    for slot in fork_chain_block_slots:
-        if len(fork_chain_blocks) == 0:
-            fork_chain_blocks.append(mock_block.copy(slot=slot))
-        else:
-            fork_chain_blocks.append(
-                mock_block.copy(
-                    slot=slot, parent_root=fork_chain_blocks[-1].signing_root
-                )
-            )
-    mock_root_to_block_db = {block.signing_root: block for block in fork_chain_blocks}
+    fork_chain_blocks = _make_mock_chain(fork_chain_block_slots)
+    monkeypatch.setattr(
+        node.chain, "chaindb", AsyncBeaconChainDBFactory(blocks=fork_chain_blocks)
+    )
 
-    def get_block_by_root(root):
-        if root in mock_root_to_block_db:
-            return mock_root_to_block_db[root]
-        else:
-            raise BlockNotFound
+    def get_canonical_block_root(slot):
+        raise BlockNotFound
 
-    monkeypatch.setattr(node.chain, "get_block_by_root", get_block_by_root)
+    monkeypatch.setattr(
+        node.chain, "get_canonical_block_root", get_canonical_block_root
+    )
 
-    requested_blocks = node._get_blocks_from_fork_chain_by_root(
-        start_slot=slot_of_requested_blocks[0],
-        peer_head_block=fork_chain_blocks[-1],
-        slot_of_requested_blocks=slot_of_requested_blocks,
+    request = BeaconBlocksRequest(
+        head_block_root=fork_chain_blocks[-1].hash_tree_root,
+        start_slot=start_slot,
+        count=count,
+        step=step,
+    )
+    requested_blocks_ssz = node._get_requested_beacon_blocks_ssz(
+        request, fork_chain_blocks[-1]
     )
 
-    expected_blocks = [
-        block for block in fork_chain_blocks if block.slot in expected_block_slots
-    ]
-    assert len(requested_blocks) == len(expected_blocks)
-    assert set(requested_blocks) == set(expected_blocks)
+    assert requested_blocks_ssz == tuple(
+        ssz.encode(block)
+        for block in fork_chain_blocks
+        if block.slot in expected_block_slots
+    )
 
 
 @pytest.mark.asyncio
@@ -323,25 +321,23 @@ async def test_request_recent_beacon_blocks(monkeypatch):
             body=BeaconBlockBody(),
         )
         blocks = [head_block.copy(slot=slot) for slot in range(5)]
-        mock_root_to_block_db = {block.hash_tree_root: block for block in blocks}
+        mock_root_to_block_db = {block.signing_root: block for block in blocks}
 
-        def get_block_by_hash_tree_root(root):
+        def get_block_ssz_by_root(root):
             validate_word(root)
             if root in mock_root_to_block_db:
-                return mock_root_to_block_db[root]
+                return ssz.encode(mock_root_to_block_db[root])
             else:
                 raise BlockNotFound
 
-        monkeypatch.setattr(
-            bob.chain, "get_block_by_hash_tree_root", get_block_by_hash_tree_root
-        )
+        monkeypatch.setattr(bob.chain, "get_block_ssz_by_root", get_block_ssz_by_root)
 
         requesting_block_roots = [
-            blocks[0].hash_tree_root,
+            blocks[0].signing_root,
             b"\x12" * 32,  # Unknown block root
-            blocks[1].hash_tree_root,
+            blocks[1].signing_root,
             b"\x23" * 32,  # Unknown block root
-            blocks[3].hash_tree_root,
+            blocks[3].signing_root,
         ]
         requested_blocks = await alice.request_recent_beacon_blocks(
             peer_id=bob.peer_id, block_roots=requesting_block_roots
@@ -3,6 +3,9 @@ import asyncio
 from async_generator import asynccontextmanager
 import pytest
 
+from eth2.beacon.types.blocks import BeaconBlock
+from trinity.protocol.bcc_libp2p.exceptions import RequestFailure
+from trinity.protocol.bcc_libp2p.node import PeerPool
 from trinity.tools.bcc_factories import (
     AsyncBeaconChainDBFactory,
     BeaconBlockFactory,
@@ -108,3 +111,93 @@ async def test_sync_when_already_at_best_head(request, event_loop, event_bus):
             slot = correct_block.slot
             alice_block = alice.chain.get_canonical_block_by_slot(slot)
             assert alice_block == correct_block
+
+
+class FakePeer:
+    def __init__(self, peer_id, blocks, is_failing=False, failure_delay=0):
+        self._id = peer_id
+        self.blocks = blocks
+        self.head_slot = blocks[-1].slot
+        self.head_root = blocks[-1].signing_root
+        self.is_failing = is_failing
+        self.failure_delay = failure_delay
+        self.requested_start_slots = []
+
+    async def request_beacon_blocks(self, start_slot, count, step=1):
+        self.requested_start_slots.append(start_slot)
+        if self.is_failing:
+            await asyncio.sleep(self.failure_delay)
+            raise RequestFailure("fail on purpose")
+        # Let the other peers send their requests too
+        await asyncio.sleep(0)
+        return tuple(
+            block
+            for block in self.blocks
+            if start_slot <= block.slot < start_slot + count
+        )
+
+
+@pytest.mark.asyncio
+async def test_sync_from_multiple_peers(request, event_loop):
+    genesis = BeaconBlockFactory()
+    alice_branch = (genesis,)
+    bob_branch = (genesis,) + BeaconBlockFactory.create_branch(length=299, root=genesis)
+    fork_branch = (genesis,) + BeaconBlockFactory.create_branch(
+        length=299, root=genesis, state_root=b"\x11" * 32
+    )
+    good_peers = tuple(FakePeer(peer_id, bob_branch) for peer_id in (b"bob", b"carol"))
+    failing_peer = FakePeer(b"dave", bob_branch, is_failing=True)
+    fork_peer = FakePeer(b"eve", fork_branch)
+    peer_pool = PeerPool()
+    for peer in good_peers + (failing_peer, fork_peer):
+        peer_pool.add(peer)
+
+    alice_chaindb = AsyncBeaconChainDBFactory(blocks=alice_branch)
+    alice_syncer = BeaconChainSyncerFactory(chain_db=alice_chaindb, peer_pool=peer_pool)
+    asyncio.ensure_future(alice_syncer.run())
+
+    def finalizer():
+        event_loop.run_until_complete(alice_syncer.cancel())
+
+    request.addfinalizer(finalizer)
+    await alice_syncer.events.finished.wait()
+
+    assert fork_peer not in alice_syncer.sync_peers
+    # test: the failing peer is not requested again, and its slots are requested elsewhere
+    assert len(failing_peer.requested_start_slots) == 1
+    # test: the slots are requested from all peers on the best head
+    assert all(len(peer.requested_start_slots) > 0 for peer in good_peers)
+    assert alice_chaindb.get_canonical_head(BeaconBlock) == bob_branch[-1]
+    for block in bob_branch:
+        assert (
+            alice_chaindb.get_canonical_block_by_slot(block.slot, BeaconBlock) == block
+        )
+
+
+@pytest.mark.asyncio
+async def test_sync_retries_failed_request_first(request, event_loop, monkeypatch):
+    # More requests than `MAX_PENDING_BATCHES`
+    monkeypatch.setattr("trinity.sync.beacon.chain.MAX_BLOCKS_PER_REQUEST", 4)
+    genesis = BeaconBlockFactory()
+    alice_branch = (genesis,)
+    bob_branch = (genesis,) + BeaconBlockFactory.create_branch(length=99, root=genesis)
+    # The best peer, which requests the first slots, fails after the other peer has
+    # requested as many batches as allowed
+    failing_peer = FakePeer(b"dave", bob_branch, is_failing=True, failure_delay=0.1)
+    good_peer = FakePeer(b"bob", bob_branch)
+    peer_pool = PeerPool()
+    for peer in (failing_peer, good_peer):
+        peer_pool.add(peer)
+
+    alice_chaindb = AsyncBeaconChainDBFactory(blocks=alice_branch)
+    alice_syncer = BeaconChainSyncerFactory(chain_db=alice_chaindb, peer_pool=peer_pool)
+    asyncio.ensure_future(alice_syncer.run())
+
+    def finalizer():
+        event_loop.run_until_complete(alice_syncer.cancel())
+
+    request.addfinalizer(finalizer)
+    await asyncio.wait_for(alice_syncer.events.finished.wait(), timeout=5)
+
+    assert failing_peer.requested_start_slots == [1]
+    assert alice_chaindb.get_canonical_head(BeaconBlock) == bob_branch[-1]
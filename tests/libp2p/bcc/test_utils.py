@@ -4,14 +4,17 @@ from typing import NamedTuple
 from eth_keys import datatypes
 from libp2p.peer.id import ID
 import pytest
+import ssz
 
+from eth2.beacon.types.blocks import BeaconBlock
 from trinity.protocol.bcc_libp2p.configs import ResponseCode
 from trinity.protocol.bcc_libp2p.exceptions import (
     ReadMessageFailure,
     WriteMessageFailure,
 )
-from trinity.protocol.bcc_libp2p.messages import HelloRequest
+from trinity.protocol.bcc_libp2p.messages import BeaconBlocksResponse, HelloRequest
 from trinity.protocol.bcc_libp2p.utils import (
+    encode_blocks_response,
     peer_id_from_pubkey,
     read_req,
     read_resp,
@@ -31,6 +34,15 @@ def test_peer_id_from_pubkey():
     assert peer_id_from_pubkey(pubkey) == peer_id_expected
 
 
+@pytest.mark.parametrize("block_count", (0, 1, 3))
+def test_encode_blocks_response(block_count):
+    blocks = tuple(BeaconBlock(slot=slot) for slot in range(block_count))
+    blocks_ssz = tuple(ssz.encode(block) for block in blocks)
+    assert encode_blocks_response(blocks_ssz) == ssz.encode(
+        BeaconBlocksResponse(blocks=blocks)
+    )
+
+
 class FakeNetStream:
     _queue: "asyncio.Queue[bytes]"
 
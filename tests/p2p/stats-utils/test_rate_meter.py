@@ -0,0 +1,35 @@
+from p2p.stats.rate import RateMeter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_meter():
+    clock = FakeClock()
+    meter = RateMeter(clock=clock)
+
+    meter.record()
+    meter.record(3)
+    clock.now = 2.0
+    assert meter.pop_rate() == 2.0
+    assert meter.total == 4
+
+    clock.now = 6.0
+    assert meter.pop_rate() == 0.0
+
+    meter.record(10)
+    clock.now = 11.0
+    assert meter.pop_rate() == 2.0
+    assert meter.total == 14
+
+
+def test_rate_meter_no_elapsed_time():
+    clock = FakeClock()
+    meter = RateMeter(clock=clock)
+    meter.record()
+    assert meter.pop_rate() == 0.0
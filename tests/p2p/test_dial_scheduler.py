@@ -0,0 +1,92 @@
+from p2p.dialing import DialScheduler
+from p2p.tools.factories import NodeFactory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_scheduler(**kwargs):
+    clock = FakeClock()
+    return DialScheduler(backoff_initial=4, backoff_max=60, clock=clock, **kwargs), clock
+
+
+def test_dial_scheduler_prefers_successful_nodes():
+    scheduler, _ = _make_scheduler()
+    good, unknown, bad = NodeFactory.create_batch(3)
+
+    scheduler.record_success(good, handshake_latency=0.1)
+    scheduler.record_failure(bad)
+
+    # `bad` is being backed off so it isn't returned at all
+    assert scheduler.prioritize((bad, unknown, good)) == (good, unknown)
+
+
+def test_dial_scheduler_prefers_fast_and_useful_nodes():
+    scheduler, _ = _make_scheduler()
+    fast, slow, useful = NodeFactory.create_batch(3)
+
+    scheduler.record_success(fast, handshake_latency=0.1)
+    scheduler.record_success(slow, handshake_latency=5)
+    scheduler.record_success(useful, handshake_latency=2)
+    scheduler.record_response_quality(useful, 100)
+
+    assert scheduler.prioritize((slow, fast, useful)) == (useful, fast, slow)
+
+
+def test_dial_scheduler_exponential_backoff():
+    scheduler, clock = _make_scheduler()
+    node = NodeFactory()
+
+    for expected_backoff in (4, 8, 16, 32, 60, 60):
+        scheduler.record_failure(node)
+        clock.now += expected_backoff - 0.1
+        assert scheduler.is_backing_off(node)
+        clock.now += 0.1
+        assert not scheduler.is_backing_off(node)
+
+    scheduler.record_success(node, handshake_latency=1)
+    assert not scheduler.is_backing_off(node)
+    scheduler.record_failure(node)
+    clock.now += 4
+    assert not scheduler.is_backing_off(node)
+
+
+def test_dial_scheduler_protocol_mismatch():
+    scheduler, clock = _make_scheduler()
+    node, unknown = NodeFactory.create_batch(2)
+
+    scheduler.record_failure(node, protocol_mismatch=True)
+    clock.now += 59
+    assert scheduler.is_backing_off(node)
+    clock.now += 1
+    assert scheduler.prioritize((node, unknown)) == (unknown, node)
+
+
+def test_dial_scheduler_bounds_tracked_nodes():
+    scheduler, _ = _make_scheduler(max_tracked_nodes=2)
+    first, second, third = NodeFactory.create_batch(3)
+
+    for node in (first, second, third):
+        scheduler.record_failure(node)
+
+    assert not scheduler.is_backing_off(first)
+    assert scheduler.is_backing_off(second)
+    assert scheduler.is_backing_off(third)
+
+
+def test_dial_scheduler_time_to_peers():
+    scheduler, clock = _make_scheduler(peer_count_targets=(0, 1, 5, 10))
+
+    clock.now = 2
+    assert scheduler.record_peer_count(1) == ((1, 2),)
+    clock.now = 3
+    assert scheduler.record_peer_count(1) == ()
+    clock.now = 10
+    assert scheduler.record_peer_count(6) == ((5, 10),)
+
+    assert scheduler.get_time_to_peers() == {1: 2, 5: 10}
@@ -4,7 +4,7 @@ import pytest
 
 from eth_utils import ValidationError
 
-from p2p.exceptions import UnknownProtocol
+from p2p.exceptions import UnknownProtocol, UnknownProtocolCommand
 from p2p.protocol import Command, Protocol
 from p2p.p2p_proto import Ping, Pong, P2PProtocol
 
@@ -242,3 +242,43 @@ async def test_connection_get_protocol_for_command_type():
 
     with pytest.raises(ValidationError):
         multiplexer.get_protocol_for_command_type(CommandB)
+
+
+@pytest.mark.asyncio
+async def test_multiplexer_msg_filters():
+    alice_multiplexer, bob_multiplexer = MultiplexerPairFactory(
+        protocol_types=(SecondProtocol,),
+    )
+    seen_payloads = []
+
+    def reject_all(encoded_payload):
+        seen_payloads.append(encoded_payload)
+        return False
+
+    subscription = bob_multiplexer.add_msg_filter(CommandA, reject_all)
+
+    with pytest.raises(UnknownProtocolCommand):
+        bob_multiplexer.add_msg_filter(CommandC, reject_all)
+
+    async with alice_multiplexer.multiplex():
+        async with bob_multiplexer.multiplex():
+            bob_second_stream = bob_multiplexer.stream_protocol_messages(SecondProtocol)
+            alice_second_protocol = alice_multiplexer.get_protocol_by_type(SecondProtocol)
+
+            alice_second_protocol.send_cmd(CommandA)
+            alice_second_protocol.send_cmd(CommandB)
+
+            # the filtered `CommandA` never makes it to the stream
+            cmd, _ = await asyncio.wait_for(bob_second_stream.asend(None), timeout=0.1)
+            assert isinstance(cmd, CommandB)
+            assert len(seen_payloads) == 1
+            assert bob_multiplexer.get_filtered_msg_counts() == {CommandA: 1}
+
+            # only messages which were streamed got decoded
+            assert set(bob_multiplexer.get_decode_times()) == {CommandB}
+
+            subscription.cancel()
+            alice_second_protocol.send_cmd(CommandA)
+            cmd, _ = await asyncio.wait_for(bob_second_stream.asend(None), timeout=0.1)
+            assert isinstance(cmd, CommandA)
+            assert len(seen_payloads) == 1
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from p2p.message_queue import PriorityClass, PriorityMessageQueue
+from p2p.priority import CommandPriority, DropPolicy
+from p2p.protocol import Command
+
+
+class ResponseCommand(Command):
+    _cmd_id = 0
+    priority = CommandPriority.RESPONSE
+    structure = ()
+
+
+class DefaultCommand(Command):
+    _cmd_id = 1
+    structure = ()
+
+
+class GossipCommand(Command):
+    _cmd_id = 2
+    priority = CommandPriority.GOSSIP
+    structure = ()
+
+
+RESPONSE = ResponseCommand(16, False)
+DEFAULT = DefaultCommand(16, False)
+GOSSIP = GossipCommand(16, False)
+
+
+def _make_queue(max_size=2):
+    return PriorityMessageQueue({
+        CommandPriority.RESPONSE: PriorityClass(max_size, DropPolicy.DROP_NEWEST),
+        CommandPriority.DEFAULT: PriorityClass(max_size, DropPolicy.DROP_NEWEST),
+        CommandPriority.GOSSIP: PriorityClass(max_size, DropPolicy.DROP_OLDEST),
+    })
+
+
+def test_priority_message_queue_requires_all_classes():
+    with pytest.raises(ValueError):
+        PriorityMessageQueue({
+            CommandPriority.RESPONSE: PriorityClass(1, DropPolicy.DROP_NEWEST),
+        })
+
+
+def test_priority_message_queue_serves_highest_priority_first():
+    queue = _make_queue()
+    queue.put_nowait(GOSSIP, 'g0')
+    queue.put_nowait(DEFAULT, 'd0')
+    queue.put_nowait(RESPONSE, 'r0')
+    queue.put_nowait(GOSSIP, 'g1')
+    queue.put_nowait(RESPONSE, 'r1')
+
+    assert queue.qsize() == 5
+    assert queue.qsize(CommandPriority.GOSSIP) == 2
+
+    results = tuple(queue.get_nowait() for _ in range(5))
+    assert results == (
+        (RESPONSE, 'r0'),
+        (RESPONSE, 'r1'),
+        (DEFAULT, 'd0'),
+        (GOSSIP, 'g0'),
+        (GOSSIP, 'g1'),
+    )
+    assert queue.empty()
+    with pytest.raises(asyncio.QueueEmpty):
+        queue.get_nowait()
+
+
+def test_priority_message_queue_drop_newest():
+    queue = _make_queue()
+    assert queue.put_nowait(RESPONSE, 'r0') is None
+    assert queue.put_nowait(RESPONSE, 'r1') is None
+    assert queue.put_nowait(RESPONSE, 'r2') is RESPONSE
+
+    assert queue.get_nowait() == (RESPONSE, 'r0')
+    assert queue.get_nowait() == (RESPONSE, 'r1')
+    assert queue.empty()
+
+
+def test_priority_message_queue_drop_oldest():
+    queue = _make_queue()
+    assert queue.put_nowait(GOSSIP, 'g0') is None
+    assert queue.put_nowait(GOSSIP, 'g1') is None
+    assert queue.put_nowait(GOSSIP, 'g2') is GOSSIP
+
+    assert queue.get_nowait() == (GOSSIP, 'g1')
+    assert queue.get_nowait() == (GOSSIP, 'g2')
+    assert queue.empty()
+
+
+def test_priority_message_queue_full_gossip_does_not_affect_responses():
+    queue = _make_queue()
+    for i in range(10):
+        queue.put_nowait(GOSSIP, i)
+    assert queue.put_nowait(RESPONSE, 'r0') is None
+    assert queue.get_nowait() == (RESPONSE, 'r0')
+
+
+@pytest.mark.asyncio
+async def test_priority_message_queue_get_waits_for_message():
+    queue = _make_queue()
+
+    async def put_later():
+        await asyncio.sleep(0.01)
+        queue.put_nowait(DEFAULT, 'd0')
+
+    asyncio.ensure_future(put_later())
+    result = await asyncio.wait_for(queue.get(), timeout=1)
+    assert result == (DEFAULT, 'd0')
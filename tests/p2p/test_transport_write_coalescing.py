@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+
+from rlp import sedes
+
+from p2p.constants import TRANSPORT_WRITE_COALESCE_SIZE
+from p2p.protocol import Command
+from p2p.tools.factories import (
+    TransportPairFactory,
+    CancelTokenFactory,
+)
+
+
+class CommandForTest(Command):
+    _cmd_id = 0
+    structure = (
+        ('data', sedes.binary),
+    )
+
+
+def _spy_on_writes(transport):
+    writes = []
+    original_write = transport.write
+
+    def write(data):
+        writes.append(data)
+        original_write(data)
+
+    transport.write = write
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_transport_coalesces_small_messages():
+    token = CancelTokenFactory()
+    alice_transport, bob_transport = await TransportPairFactory()
+    writes = _spy_on_writes(alice_transport)
+
+    cmd = CommandForTest(5, False)
+    messages = tuple(bytes([i]) * 16 for i in range(10))
+    for message in messages:
+        alice_transport.send(*cmd.encode({'data': message}))
+
+    # nothing has been handed over to the socket yet
+    assert len(writes) == 0
+    assert alice_transport.write_buffer_size > 0
+
+    for message in messages:
+        data = await asyncio.wait_for(bob_transport.recv(token), timeout=0.1)
+        assert cmd.decode(data) == {'data': message}
+
+    # all of the messages went out in a single write
+    assert len(writes) == 1
+    assert alice_transport.write_buffer_size == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_flushes_when_coalesce_size_reached():
+    token = CancelTokenFactory()
+    alice_transport, bob_transport = await TransportPairFactory()
+    writes = _spy_on_writes(alice_transport)
+
+    cmd = CommandForTest(5, False)
+    message = b'\x01' * TRANSPORT_WRITE_COALESCE_SIZE
+    alice_transport.send(*cmd.encode({'data': message}))
+
+    assert len(writes) == 1
+    data = await asyncio.wait_for(bob_transport.recv(token), timeout=0.1)
+    assert cmd.decode(data) == {'data': message}
+
+
+@pytest.mark.asyncio
+async def test_transport_drain_flushes_buffered_messages():
+    token = CancelTokenFactory()
+    alice_transport, bob_transport = await TransportPairFactory()
+    writes = _spy_on_writes(alice_transport)
+
+    cmd = CommandForTest(5, False)
+    alice_transport.send(*cmd.encode({'data': b'unicorns'}))
+    await asyncio.wait_for(alice_transport.drain(), timeout=0.1)
+
+    assert len(writes) == 1
+    data = await asyncio.wait_for(bob_transport.recv(token), timeout=0.1)
+    assert cmd.decode(data) == {'data': b'unicorns'}
@@ -5,7 +5,9 @@ from hypothesis import (
     strategies as st,
 )
 
-from p2p._utils import trim_middle
+import rlp
+
+from p2p._utils import split_rlp_list, trim_middle
 
 
 @pytest.mark.parametrize(
@@ -36,3 +38,32 @@ def test_trim_middle_length(in_str, max_length):
     else:
         # should always have the trim marker if the input was too long
         assert "✂✂✂" in result
+
+
+@pytest.mark.parametrize(
+    'items',
+    (
+        [],
+        [b''],
+        [b'\x01', b'\x7f', b'\x80', b'\xff'],
+        [b'a' * 55, b'b' * 56, b'c' * 1024],
+        [[], [b'nested', [b'list']], [b'x'] * 100],
+    ),
+)
+def test_split_rlp_list(items):
+    encoded = rlp.encode(items)
+    assert split_rlp_list(encoded) == tuple(rlp.encode(item) for item in items)
+
+
+@pytest.mark.parametrize(
+    'data',
+    (
+        b'',
+        rlp.encode(b'not a list'),
+        rlp.encode([b'abc'])[:-1],
+        rlp.encode([b'abc']) + b'\x00',
+    ),
+)
+def test_split_rlp_list_invalid(data):
+    with pytest.raises(ValueError):
+        split_rlp_list(data)
@@ -4,9 +4,6 @@ from argparse import (
 )
 import os
 import asyncio
-from typing import (
-    cast,
-)
 
 from lahja import EndpointAPI
 
@@ -16,10 +13,8 @@ from libp2p.crypto.secp256k1 import create_new_key_pair, Secp256k1PrivateKey
 
 from eth_utils import decode_hex
 
+from eth2.beacon.db.exceptions import ValidatorIndexNotFound
 from eth2.beacon.operations.attestation_pool import AttestationPool
-from eth2.beacon.typing import (
-    ValidatorIndex,
-)
 
 from trinity._utils.shutdown import (
     exit_with_services,
@@ -30,6 +25,9 @@ from trinity.extensibility import AsyncioIsolatedComponent
 from trinity.protocol.bcc_libp2p.node import Node
 from trinity.protocol.bcc_libp2p.servers import BCCReceiveServer
 
+from .pre_state import (
+    PreStateWarmer,
+)
 from .slot_ticker import (
     SlotTicker,
 )
@@ -120,17 +118,22 @@ class BeaconNodeComponent(AsyncioIsolatedComponent):
             cancel_token=libp2p_node.cancel_token,
         )
 
-        state = chain.get_state_by_slot(chain_config.genesis_config.GENESIS_SLOT)
-        registry_pubkeys = [v_record.pubkey for v_record in state.validators]
-
         validator_privkeys = {}
         validator_keymap = chain_config.genesis_data.validator_keymap
         for pubkey in validator_keymap:
             try:
-                validator_index = cast(ValidatorIndex, registry_pubkeys.index(pubkey))
-            except ValueError:
-                self.logger.error(f'Could not find key {pubkey.hex()} in genesis state')
-                raise
+                validator_index = chain.chaindb.get_validator_index_by_pubkey(pubkey)
+            except ValidatorIndexNotFound:
+                # The database may predate the index, so index the registry of the head
+                # state and look again
+                chain.chaindb.index_validators(chain.get_head_state())
+                try:
+                    validator_index = chain.chaindb.get_validator_index_by_pubkey(pubkey)
+                except ValidatorIndexNotFound:
+                    self.logger.error(
+                        f'Could not find key {pubkey.hex()} in the validator registry'
+                    )
+                    raise
             validator_privkeys[validator_index] = validator_keymap[pubkey]
 
         validator = Validator(
@@ -150,14 +153,22 @@ class BeaconNodeComponent(AsyncioIsolatedComponent):
             token=libp2p_node.cancel_token,
         )
 
+        pre_state_warmer = PreStateWarmer(
+            chain=chain,
+            event_bus=self.event_bus,
+            token=libp2p_node.cancel_token,
+        )
+
         asyncio.ensure_future(exit_with_services(
             self._event_bus_service,
             libp2p_node,
             receive_server,
             slot_ticker,
+            pre_state_warmer,
             validator,
         ))
         asyncio.ensure_future(libp2p_node.run())
         asyncio.ensure_future(receive_server.run())
         asyncio.ensure_future(slot_ticker.run())
+        asyncio.ensure_future(pre_state_warmer.run())
         asyncio.ensure_future(validator.run())
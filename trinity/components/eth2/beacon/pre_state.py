@@ -0,0 +1,101 @@
+import asyncio
+import functools
+
+from cancel_token import (
+    CancelToken,
+    OperationCancelled,
+)
+from eth_utils import (
+    ValidationError,
+    humanize_hash,
+)
+from lahja import EndpointAPI
+
+from eth2.beacon.chains.base import (
+    BaseBeaconChain,
+)
+from eth2.beacon.db.exceptions import (
+    StateNotFound,
+)
+from eth2.beacon.typing import (
+    Slot,
+)
+from p2p.service import (
+    BaseService,
+)
+from trinity.components.eth2.beacon.slot_ticker import (
+    SlotTickEvent,
+)
+
+
+class PreStateWarmer(BaseService):
+    """
+    Precompute the state the block of the upcoming slot will be applied to, on the second
+    tick of every slot, so that the slot (and epoch) processing is out of the way by the
+    time the block is gossiped, validated and imported.
+    """
+    chain: BaseBeaconChain
+    event_bus: EndpointAPI
+
+    def __init__(
+            self,
+            chain: BaseBeaconChain,
+            event_bus: EndpointAPI,
+            token: CancelToken = None) -> None:
+        super().__init__(token)
+        self.chain = chain
+        self.event_bus = event_bus
+
+    async def _run(self) -> None:
+        self.run_daemon_task(self.handle_slot_tick())
+        await self.cancellation()
+
+    async def handle_slot_tick(self) -> None:
+        async for event in self.event_bus.stream(SlotTickEvent):
+            if not event.is_second_tick:
+                continue
+            try:
+                await self.warm_up(Slot(event.slot + 1))
+            except (asyncio.CancelledError, OperationCancelled):
+                raise
+            except Exception:
+                # Only an optimization: the state is computed on import if this failed
+                self.logger.exception(
+                    "Unexpected error while precomputing the state at slot %s",
+                    event.slot + 1,
+                )
+
+    async def warm_up(self, slot: Slot) -> None:
+        head = self.chain.get_canonical_head()
+        if head.slot >= slot or self.chain.has_pre_state(head.signing_root, slot):
+            return
+        try:
+            state_machine = self.chain.get_state_machine(at_slot=head.slot)
+            state = self.chain.chaindb.get_state_by_root(
+                head.state_root,
+                state_machine.get_state_class(),
+            )
+            # Only the slot processing runs in a thread, so that the node keeps handling
+            # messages in the meantime; the chain and its db are only touched on the loop.
+            pre_state = await self._run_in_executor(
+                None,
+                functools.partial(
+                    state_machine.state_transition.apply_state_transition,
+                    state,
+                    future_slot=slot,
+                ),
+            )
+        except (StateNotFound, ValidationError) as error:
+            self.logger.debug(
+                "Failed to precompute the state at slot %s on top of %s: %s",
+                slot,
+                humanize_hash(head.signing_root),
+                error,
+            )
+        else:
+            self.chain.add_pre_state(head.signing_root, slot, pre_state)
+            self.logger.debug(
+                "Precomputed the state at slot %s on top of %s",
+                slot,
+                humanize_hash(head.signing_root),
+            )
@@ -14,8 +14,6 @@ from eth_typing import (
     Hash32,
 )
 
-from eth2._utils.bls import bls
-
 from ruamel.yaml import (
     YAML,
 )
@@ -27,6 +25,9 @@ from ssz.tools import (
 from eth2.beacon.state_machines.forks.skeleton_lake.config import (
     MINIMAL_SERENITY_CONFIG
 )
+from eth2.beacon.tools.builder.keys import (
+    privtopubs,
+)
 from eth2.beacon.tools.misc.ssz_vector import (
     override_lengths,
 )
@@ -70,10 +71,8 @@ def extract_privkeys_from_dir(dir_path: Path) -> Dict[BLSPubkey, int]:
     except FileNotFoundError:
         logger.debug('Could not find key directory: %s', str(dir_path))
         return validator_keymap
-    for key_file_name in key_files:
-        key_file_path = dir_path / key_file_name
-        privkey = _read_privkey(key_file_path)
-        pubkey = bls.privtopub(privkey)
+    privkeys = tuple(_read_privkey(dir_path / key_file_name) for key_file_name in key_files)
+    for pubkey, privkey in zip(privtopubs(privkeys), privkeys):
         validator_keymap[pubkey] = privkey
         logger.debug('imported public key: %s', humanize_hash(Hash32(pubkey)))
     if len(validator_keymap) == 0:
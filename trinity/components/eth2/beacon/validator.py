@@ -4,6 +4,7 @@ from itertools import (
 from operator import (
     itemgetter,
 )
+import time
 from typing import (
     Callable,
     Dict,
@@ -28,6 +29,7 @@ from eth2.beacon.chains.base import (
 )
 from eth2.beacon.helpers import (
     compute_epoch_of_slot,
+    compute_start_slot_of_epoch,
 )
 from eth2.beacon.state_machines.base import (
     BaseBeaconStateMachine,
@@ -36,17 +38,16 @@ from eth2.beacon.state_machines.forks.serenity.blocks import (
     SerenityBeaconBlock,
 )
 from eth2.beacon.tools.builder.committee_assignment import (
-    CommitteeAssignment,
+    ValidatorDuty,
+    get_validator_duties,
 )
 from eth2.beacon.tools.builder.proposer import (
     _get_proposer_index,
     create_block_on_state,
 )
-from eth2.beacon.tools.builder.committee_assignment import (
-    get_committee_assignment,
-)
 from eth2.beacon.tools.builder.validator import (
-    create_signed_attestation_at_slot,
+    CommitteeAttesters,
+    create_signed_attestations_on_state,
 )
 from eth2.beacon.types.attestations import (
     Attestation,
@@ -58,7 +59,6 @@ from eth2.beacon.types.states import (
     BeaconState,
 )
 from eth2.beacon.typing import (
-    CommitteeIndex,
     Epoch,
     Shard,
     Slot,
@@ -87,7 +87,8 @@ class Validator(BaseService):
     slots_per_epoch: int
     latest_proposed_epoch: Dict[ValidatorIndex, Epoch]
     latest_attested_epoch: Dict[ValidatorIndex, Epoch]
-    this_epoch_assignment: Dict[ValidatorIndex, Tuple[Epoch, CommitteeAssignment]]
+    # The duties of all our validators, for the current and (once computed) next epoch
+    epoch_duties: Dict[Epoch, Dict[ValidatorIndex, ValidatorDuty]]
 
     def __init__(
             self,
@@ -108,14 +109,10 @@ class Validator(BaseService):
         # into/read from validator's own db.
         self.latest_proposed_epoch = {}
         self.latest_attested_epoch = {}
-        self.this_epoch_assignment = {}
+        self.epoch_duties = {}
         for validator_index in validator_privkeys:
             self.latest_proposed_epoch[validator_index] = Epoch(-1)
             self.latest_attested_epoch[validator_index] = Epoch(-1)
-            self.this_epoch_assignment[validator_index] = (
-                Epoch(-1),
-                CommitteeAssignment((), Shard(-1), Slot(-1), False),
-            )
         self.get_ready_attestations: GetReadyAttestationsFn = get_ready_attestations_fn
 
     async def _run(self) -> None:
@@ -143,23 +140,66 @@ class Validator(BaseService):
                     " HERE AS IT IS INTERNAL TO OUR OWN CODE"
                 )
 
-    def _get_this_epoch_assignment(self,
-                                   validator_index: ValidatorIndex,
-                                   this_epoch: Epoch) -> CommitteeAssignment:
-        # update `this_epoch_assignment` if it's outdated
-        if this_epoch > self.this_epoch_assignment[validator_index][0]:
-            state_machine = self.chain.get_state_machine()
-            state = self.chain.get_head_state()
-            self.this_epoch_assignment[validator_index] = (
-                this_epoch,
-                get_committee_assignment(
-                    state,
-                    state_machine.config,
-                    this_epoch,
-                    validator_index,
-                )
+    def _compute_epoch_duties(self,
+                              state: BeaconState,
+                              epoch: Epoch) -> Dict[ValidatorIndex, ValidatorDuty]:
+        state_machine = self.chain.get_state_machine()
+        return get_validator_duties(
+            state,
+            state_machine.config,
+            epoch,
+            tuple(self.validator_privkeys.keys()),
+        )
+
+    def _get_epoch_duties(self, epoch: Epoch) -> Dict[ValidatorIndex, ValidatorDuty]:
+        # Duties of past epochs are of no use anymore
+        for past_epoch in tuple(self.epoch_duties.keys()):
+            if past_epoch < epoch:
+                del self.epoch_duties[past_epoch]
+
+        if epoch not in self.epoch_duties:
+            self.epoch_duties[epoch] = self._compute_epoch_duties(
+                self.chain.get_head_state(),
+                epoch,
             )
-        return self.this_epoch_assignment[validator_index][1]
+        return self.epoch_duties[epoch]
+
+    async def _precompute_next_epoch_duties(self, slot: Slot) -> None:
+        """
+        Compute the duties of the next epoch during the last slot of this one, so that
+        they are ready on the first tick of the next epoch.
+        """
+        next_epoch = Epoch(compute_epoch_of_slot(slot, self.slots_per_epoch) + 1)
+        if next_epoch in self.epoch_duties:
+            return
+        if slot + 1 < compute_start_slot_of_epoch(next_epoch, self.slots_per_epoch):
+            return
+
+        # The state and config are resolved here: only the computation runs in a thread,
+        # so that the node keeps handling messages in the meantime.
+        state = self.chain.get_head_state()
+        config = self.chain.get_state_machine().config
+        try:
+            self.epoch_duties[next_epoch] = await self._run_in_executor(
+                None,
+                get_validator_duties,
+                state,
+                config,
+                next_epoch,
+                tuple(self.validator_privkeys.keys()),
+            )
+        except ValidationError as error:
+            # The head is too far behind to tell, the duties are computed once needed
+            self.logger.debug(
+                "Failed to compute the duties in epoch %s ahead of time: %s",
+                next_epoch,
+                error,
+            )
+            return
+        self.logger.debug(
+            "Computed the duties of our validators in epoch %s ahead of time",
+            next_epoch,
+        )
 
     async def handle_first_tick(self, slot: Slot) -> None:
         head = self.chain.get_canonical_head()
@@ -226,6 +266,7 @@ class Validator(BaseService):
             )
 
         await self.attest(slot)
+        await self._precompute_next_epoch_duties(slot)
 
     async def propose_block(self,
                             proposer_index: ValidatorIndex,
@@ -293,37 +334,30 @@ class Validator(BaseService):
 
     def _is_attesting(self,
                       validator_index: ValidatorIndex,
-                      assignment: CommitteeAssignment,
+                      duty: ValidatorDuty,
                       slot: Slot,
                       epoch: Epoch) -> bool:
         has_attested = epoch <= self.latest_attested_epoch[validator_index]
-        return not has_attested and slot == assignment.slot
+        return not has_attested and slot == duty.slot
 
     @to_tuple
     def _get_attesting_validator_and_shard(self,
-                                           assignments: Dict[ValidatorIndex, CommitteeAssignment],
+                                           duties: Dict[ValidatorIndex, ValidatorDuty],
                                            slot: Slot,
                                            epoch: Epoch) -> Iterable[Tuple[ValidatorIndex, Shard]]:
-        for validator_index, assignment in assignments.items():
-            if self._is_attesting(validator_index, assignment, slot, epoch):
-                yield (validator_index, assignment.shard)
+        for validator_index, duty in duties.items():
+            if self._is_attesting(validator_index, duty, slot, epoch):
+                yield (validator_index, duty.shard)
 
     async def attest(self, slot: Slot) -> Tuple[Attestation, ...]:
-        attestations: Tuple[Attestation, ...] = ()
+        start_time = time.perf_counter()
         head = self.chain.get_canonical_head()
         state_machine = self.chain.get_state_machine()
-        state = self.chain.get_head_state()
         epoch = compute_epoch_of_slot(slot, self.slots_per_epoch)
 
-        validator_assignments = {
-            validator_index: self._get_this_epoch_assignment(
-                validator_index,
-                epoch,
-            )
-            for validator_index in self.validator_privkeys
-        }
+        validator_duties = self._get_epoch_duties(epoch)
         attesting_validators = self._get_attesting_validator_and_shard(
-            validator_assignments,
+            validator_duties,
             slot,
             epoch,
         )
@@ -335,36 +369,44 @@ class Validator(BaseService):
             attesting_validators,
             key=itemgetter(1),
         )
-        # Group the attesting validators by shard
-        attesting_validators_groups = groupby(
-            sorted_attesting_validators,
-            key=itemgetter(1),
-        )
-        for shard, group in attesting_validators_groups:
-            # Get the validator_index -> privkey map of the attesting validators
-            attesting_validator_privkeys = {
-                attesting_data[0]: self.validator_privkeys[attesting_data[0]]
-                for attesting_data in group
-            }
-            attesting_validators_indices = tuple(attesting_validator_privkeys.keys())
-            # Get one of the attesting validator's assignment in order to get the committee info
-            assignment = self._get_this_epoch_assignment(
-                attesting_validators_indices[0],
-                epoch,
+        # Group the attesting validators by shard, i.e. by committee
+        committee_attesters: Tuple[CommitteeAttesters, ...] = ()
+        for shard, group in groupby(sorted_attesting_validators, key=itemgetter(1)):
+            attesting_validators_indices = tuple(
+                validator_index for validator_index, _ in group
             )
-            attestation = create_signed_attestation_at_slot(
-                state,
-                state_machine.config,
-                state_machine,
-                slot,
-                head.signing_root,
-                attesting_validator_privkeys,
-                assignment.committee,
+            # Get one of the attesting validator's duty in order to get the committee info
+            committee = validator_duties[attesting_validators_indices[0]].committee
+            committee_attesters += ((
+                committee,
                 shard,
                 tuple(
-                    CommitteeIndex(assignment.committee.index(index))
+                    validator_duties[index].committee_index
                     for index in attesting_validators_indices
                 ),
+            ),)
+
+        # The state of the slot is resolved here, usually from the states precomputed in
+        # the previous slot. All the signatures of the slot are then made in one batch,
+        # in a thread so that the node keeps handling messages in the meantime.
+        # Signatures of the validators of the same committee are aggregated in a single
+        # attestation.
+        state = self.chain.get_pre_state(head.signing_root, slot)
+        attestations = await self._run_in_executor(
+            None,
+            create_signed_attestations_on_state,
+            state,
+            state_machine.config,
+            head.signing_root,
+            self.validator_privkeys,
+            committee_attesters,
+        )
+
+        for (committee, _, attesting_indices), attestation in zip(
+                committee_attesters,
+                attestations):
+            attesting_validators_indices = tuple(
+                committee[committee_index] for committee_index in attesting_indices
             )
             self.logger.debug(
                 bold_green("validators %s attesting to block %s with attestation %s"),
@@ -378,7 +420,11 @@ class Validator(BaseService):
             self.logger.debug("broadcasting attestation %s", attestation)
             await self.p2p_node.broadcast_attestation(attestation)
 
-            attestations = attestations + (attestation,)
-        # TODO: Aggregate attestations
-
+        self.logger.debug(
+            "broadcast %d attestations of %d validators at slot %s, %.3fs after the tick",
+            len(attestations),
+            len(attesting_validators),
+            slot,
+            time.perf_counter() - start_time,
+        )
         return attestations
@@ -6,7 +6,6 @@ import traceback
 import random
 from typing import (
     Dict,
-    Iterable,
     Optional,
     Sequence,
     Tuple,
@@ -17,7 +16,7 @@ from cancel_token import (
     CancelToken,
 )
 
-from eth_utils import ValidationError, to_tuple
+from eth_utils import ValidationError
 from eth_utils.toolz import first
 
 from eth.exceptions import (
@@ -128,6 +127,7 @@ from .topic_validators import (
     get_beacon_block_validator,
 )
 from .utils import (
+    encode_blocks_response,
     make_rpc_v1_ssz_protocol_id,
     make_tcp_ip_maddr,
     read_req,
@@ -183,7 +183,7 @@ class Peer:
         )
 
     async def request_recent_beacon_blocks(
-        self, block_roots: Sequence[HashTreeRoot]
+        self, block_roots: Sequence[SigningRoot]
     ) -> Tuple[BaseBeaconBlock, ...]:
         return await self.node.request_recent_beacon_blocks(self._id, block_roots)
 
@@ -452,7 +452,7 @@ class Node(BaseService):
 
     async def _validate_hello_req(self, hello_other_side: HelloRequest) -> None:
         state_machine = self.chain.get_state_machine()
-        state = self.chain.get_head_state()
+        state = self.chain.get_head_state_view()
         config = state_machine.config
         if hello_other_side.fork_version != state.fork.current_version:
             raise ValidationError(
@@ -489,7 +489,7 @@ class Node(BaseService):
             )
 
     def _make_hello_packet(self) -> HelloRequest:
-        state = self.chain.get_head_state()
+        state = self.chain.get_head_state_view()
         head = self.chain.get_canonical_head()
         finalized_checkpoint = state.finalized_checkpoint
         return HelloRequest(
@@ -503,7 +503,7 @@ class Node(BaseService):
     def _compare_chain_tip_and_finalized_epoch(self,
                                                peer_finalized_epoch: Epoch,
                                                peer_head_slot: Slot) -> None:
-        checkpoint = self.chain.get_head_state().finalized_checkpoint
+        checkpoint = self.chain.get_head_state_view().finalized_checkpoint
         head_block = self.chain.get_canonical_head()
         peer_has_higher_finalized_epoch = peer_finalized_epoch > checkpoint.epoch
         peer_has_equal_finalized_epoch = peer_finalized_epoch == checkpoint.epoch
@@ -721,59 +721,9 @@ class Node(BaseService):
             await stream.close()
         await self.disconnect_peer(peer_id)
 
-    @to_tuple
-    def _get_blocks_from_canonical_chain_by_slot(
-        self,
-        slot_of_requested_blocks: Sequence[Slot],
-    ) -> Iterable[BaseBeaconBlock]:
-        # If peer's head block is on our canonical chain,
-        # start getting the requested blocks by slots.
-        for slot in slot_of_requested_blocks:
-            try:
-                block = self.chain.get_canonical_block_by_slot(slot)
-            except BlockNotFound:
-                pass
-            else:
-                yield block
-
-    @to_tuple
-    def _get_blocks_from_fork_chain_by_root(
-        self,
-        start_slot: Slot,
-        peer_head_block: BaseBeaconBlock,
-        slot_of_requested_blocks: Sequence[Slot],
-    ) -> Iterable[BaseBeaconBlock]:
-        # Peer's head block is on a fork chain,
-        # start getting the requested blocks by
-        # traversing the history from the head.
-
-        # `slot_of_requested_blocks` starts with earliest slot
-        # and end with most recent slot, so we start traversing
-        # from the most recent slot.
-        cur_index = len(slot_of_requested_blocks) - 1
-        block = peer_head_block
-        if block.slot == slot_of_requested_blocks[cur_index]:
-            yield block
-            cur_index -= 1
-        while block.slot > start_slot and cur_index >= 0:
-            try:
-                block = self.chain.get_block_by_root(block.parent_root)
-            except (BlockNotFound, ValidationError):
-                # This should not happen as we only persist block if its
-                # ancestors are also in the database.
-                break
-            else:
-                while block.slot < slot_of_requested_blocks[cur_index]:
-                    if cur_index > 0:
-                        cur_index -= 1
-                    else:
-                        break
-                if block.slot == slot_of_requested_blocks[cur_index]:
-                    yield block
-
     def _validate_start_slot(self, start_slot: Slot) -> None:
         config = self.chain.get_state_machine().config
-        state = self.chain.get_head_state()
+        state = self.chain.get_head_state_view()
         finalized_epoch_start_slot = compute_start_slot_of_epoch(
             epoch=state.finalized_checkpoint.epoch,
             slots_per_epoch=config.SLOTS_PER_EPOCH,
@@ -784,11 +734,14 @@ class Node(BaseService):
                 f" latest finalized slot({finalized_epoch_start_slot})"
             )
 
-    def _get_requested_beacon_blocks(
+    def _get_requested_beacon_blocks_ssz(
         self,
         beacon_blocks_request: BeaconBlocksRequest,
         requested_head_block: BaseBeaconBlock,
-    ) -> Tuple[BaseBeaconBlock, ...]:
+    ) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encoding of the requested blocks, which are sent as they are stored.
+        """
         slot_of_requested_blocks = tuple(
             beacon_blocks_request.start_slot + i * beacon_blocks_request.step
             for i in range(beacon_blocks_request.count)
@@ -804,35 +757,35 @@ class Node(BaseService):
         # We have the peer's head block in our database,
         # next check if the head block is on our canonical chain.
         try:
-            canonical_block_at_slot = self.chain.get_canonical_block_by_slot(
+            canonical_block_root = self.chain.get_canonical_block_root(
                 requested_head_block.slot
             )
-            block_match = canonical_block_at_slot == requested_head_block
+            block_match = canonical_block_root == requested_head_block.signing_root
         except BlockNotFound:
             self.logger.debug(
-                (
-                    "The requested head block is not on our canonical chain  "
-                    "requested_head_block: %s  canonical_block_at_slot: %s"
-                ),
+                "The requested head block is not on our canonical chain  "
+                "requested_head_block: %s",
                 requested_head_block,
-                canonical_block_at_slot,
             )
             block_match = False
-        finally:
-            if block_match:
-                # Peer's head block is on our canonical chain
-                return self._get_blocks_from_canonical_chain_by_slot(
-                    slot_of_requested_blocks
-                )
-            else:
-                # Peer's head block is not on our canonical chain
-                # Validate `start_slot` is greater than our latest finalized slot
-                self._validate_start_slot(beacon_blocks_request.start_slot)
-                return self._get_blocks_from_fork_chain_by_root(
-                    beacon_blocks_request.start_slot,
-                    requested_head_block,
-                    slot_of_requested_blocks,
-                )
+
+        if block_match:
+            # Peer's head block is on our canonical chain,
+            # get the requested blocks by slots.
+            return self.chain.get_canonical_block_ssz_by_slot_range(
+                beacon_blocks_request.start_slot,
+                len(slot_of_requested_blocks),
+                beacon_blocks_request.step,
+            )
+        else:
+            # Peer's head block is not on our canonical chain
+            # Validate `start_slot` is greater than our latest finalized slot
+            self._validate_start_slot(beacon_blocks_request.start_slot)
+            # Get the requested blocks by traversing the history from the head.
+            return self.chain.get_ancestor_block_ssz_by_slots(
+                requested_head_block.signing_root,
+                slot_of_requested_blocks,
+            )
 
     async def _handle_beacon_blocks(self, stream: INetStream) -> None:
         peer_id = stream.mplex_conn.peer_id
@@ -866,7 +819,7 @@ class Node(BaseService):
         except (BlockNotFound, ValidationError) as error:
             self.logger.info("Sending empty blocks, reason: %s", error)
             # We don't have the chain data peer is requesting
-            requested_beacon_blocks: Tuple[BaseBeaconBlock, ...] = tuple()
+            requested_beacon_blocks_ssz: Tuple[bytes, ...] = tuple()
         else:
             # Check if slot of specified head block is greater than specified start slot
             if requested_head_block.slot < beacon_blocks_request.start_slot:
@@ -894,7 +847,7 @@ class Node(BaseService):
                 return
             else:
                 try:
-                    requested_beacon_blocks = self._get_requested_beacon_blocks(
+                    requested_beacon_blocks_ssz = self._get_requested_beacon_blocks_ssz(
                         beacon_blocks_request, requested_head_block
                     )
                 except ValidationError as val_error:
@@ -920,8 +873,11 @@ class Node(BaseService):
                     return
         # TODO: Should it be a successful response if peer is requesting
         # blocks on a fork we don't have data for?
-        beacon_blocks_response = BeaconBlocksResponse(blocks=requested_beacon_blocks)
-        self.logger.debug("Sending beacon blocks response %s", beacon_blocks_response)
+        # The blocks are sent as they are stored, without decoding and encoding them again
+        beacon_blocks_response = encode_blocks_response(requested_beacon_blocks_ssz)
+        self.logger.debug(
+            "Sending beacon blocks response with %d blocks", len(requested_beacon_blocks_ssz)
+        )
         try:
             await write_resp(stream, beacon_blocks_response, ResponseCode.SUCCESS)
             has_error = False
@@ -934,8 +890,9 @@ class Node(BaseService):
         finally:
             if has_error:
                 self.logger.info(
-                    "Processing beacon blocks request failed: failed to write message %s",
-                    beacon_blocks_response,
+                    "Processing beacon blocks request failed: "
+                    "failed to write message with %d blocks",
+                    len(requested_beacon_blocks_ssz),
                 )
                 return
 
@@ -1048,17 +1005,21 @@ class Node(BaseService):
             recent_beacon_blocks_request,
         )
 
-        recent_beacon_blocks = []
+        recent_beacon_blocks_ssz = []
         for block_root in recent_beacon_blocks_request.block_roots:
             try:
-                block = self.chain.get_block_by_hash_tree_root(block_root)
+                block_ssz = self.chain.get_block_ssz_by_root(block_root)
             except (BlockNotFound, ValidationError):
                 pass
             else:
-                recent_beacon_blocks.append(block)
+                recent_beacon_blocks_ssz.append(block_ssz)
 
-        recent_beacon_blocks_response = RecentBeaconBlocksResponse(blocks=recent_beacon_blocks)
-        self.logger.debug("Sending recent beacon blocks response %s", recent_beacon_blocks_response)
+        # The blocks are sent as they are stored, without decoding and encoding them again
+        recent_beacon_blocks_response = encode_blocks_response(recent_beacon_blocks_ssz)
+        self.logger.debug(
+            "Sending recent beacon blocks response with %d blocks",
+            len(recent_beacon_blocks_ssz),
+        )
         try:
             await write_resp(stream, recent_beacon_blocks_response, ResponseCode.SUCCESS)
             has_error = False
@@ -1071,8 +1032,9 @@ class Node(BaseService):
         finally:
             if has_error:
                 self.logger.info(
-                    "Processing recent beacon blocks request failed: failed to write message %s",
-                    recent_beacon_blocks_response,
+                    "Processing recent beacon blocks request failed: "
+                    "failed to write message with %d blocks",
+                    len(recent_beacon_blocks_ssz),
                 )
                 return
 
@@ -1085,7 +1047,7 @@ class Node(BaseService):
     async def request_recent_beacon_blocks(
             self,
             peer_id: ID,
-            block_roots: Sequence[HashTreeRoot]) -> Tuple[BaseBeaconBlock, ...]:
+            block_roots: Sequence[SigningRoot]) -> Tuple[BaseBeaconBlock, ...]:
         if peer_id not in self.handshaked_peers:
             error_msg = f"not handshaked with peer={peer_id} yet"
             self.logger.info("Request recent beacon block failed: %s", error_msg)
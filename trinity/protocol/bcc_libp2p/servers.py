@@ -1,7 +1,10 @@
+import time
 from typing import (
+    Callable,
     Dict,
     Iterable,
     List,
+    Optional,
     Set,
     Tuple,
     Union,
@@ -26,6 +29,11 @@ from libp2p.pubsub.pb import rpc_pb2
 
 from p2p.service import BaseService
 
+from eth2._utils.bitfield import (
+    get_vote_count,
+    has_voted,
+)
+from eth2._utils.bls import bls
 from eth2.beacon.attestation_helpers import (
     get_attestation_data_slot,
 )
@@ -33,6 +41,9 @@ from eth2.beacon.chains.base import (
     BaseBeaconChain,
 )
 from eth2.beacon.operations.pool import OperationPool
+from eth2.beacon.types.attestation_data import (
+    AttestationData,
+)
 from eth2.beacon.types.attestations import (
     Attestation,
 )
@@ -41,11 +52,10 @@ from eth2.beacon.types.blocks import (
     BeaconBlock,
 )
 from eth2.beacon.typing import (
+    Bitfield,
     SigningRoot,
     HashTreeRoot,
-)
-from eth2.beacon.state_machines.forks.serenity.block_validation import (
-    validate_attestation_slot,
+    Slot,
 )
 
 from trinity.protocol.bcc_libp2p.node import Node
@@ -60,21 +70,68 @@ if TYPE_CHECKING:
 
 
 PROCESS_ORPHAN_BLOCKS_PERIOD = 10.0
+MAX_ORPHAN_BLOCKS = 1024
+# Give up on the parents of an orphan block after this many seconds
+MAX_ORPHAN_BLOCK_AGE = 600.0
+
+
+def _has_no_vote_outside(bitfield: Bitfield, covering_bitfield: Bitfield) -> bool:
+    return len(bitfield) == len(covering_bitfield) and all(
+        has_voted(covering_bitfield, index)
+        for index in range(len(bitfield))
+        if has_voted(bitfield, index)
+    )
+
+
+def _are_disjoint(bitfield: Bitfield, other_bitfield: Bitfield) -> bool:
+    return len(bitfield) == len(other_bitfield) and not any(
+        has_voted(bitfield, index) and has_voted(other_bitfield, index)
+        for index in range(len(bitfield))
+    )
+
+
+def _merge_bitfields(bitfield: Bitfield, other_bitfield: Bitfield) -> Bitfield:
+    return Bitfield(tuple(
+        has_voted(bitfield, index) or has_voted(other_bitfield, index)
+        for index in range(len(bitfield))
+    ))
 
 
 class AttestationPool(OperationPool[Attestation]):
     """
     Store the attestations not yet included on chain.
+
+    Attestations are indexed by slot and by data root (which determines the shard), and
+    attestations of the same data with disjoint votes are aggregated when added, if their
+    signatures are verified.
     """
-    # TODO: can probably use lru-cache or even database
+    _data_roots_by_slot: Dict[Slot, Set[HashTreeRoot]]
+    _roots_by_data_root: Dict[HashTreeRoot, Set[HashTreeRoot]]
+    _data_root_slots: Dict[HashTreeRoot, Slot]
+    _verified_roots: Set[HashTreeRoot]
+
+    def __init__(self, get_attestation_slot: Callable[[AttestationData], Slot]) -> None:
+        super().__init__()
+        # The slot at which the data of an attestation was voted for
+        self._get_attestation_slot: Callable[[AttestationData], Slot] = get_attestation_slot
+        self._data_roots_by_slot = {}
+        self._roots_by_data_root = {}
+        self._data_root_slots = {}
+        self._verified_roots = set()
 
     def __len__(self) -> int:
         return len(self._pool_storage.keys())
 
     def __contains__(self, attestation_or_root: Union[Attestation, HashTreeRoot]) -> bool:
+        """
+        Return whether the attestation is in the pool, or for an ``Attestation``, whether
+        all of its votes are in an aggregate in the pool.
+        """
         attestation_root: HashTreeRoot
         if isinstance(attestation_or_root, Attestation):
             attestation_root = attestation_or_root.hash_tree_root
+            if attestation_root not in self._pool_storage:
+                return self._get_covering_attestation(attestation_or_root) is not None
         elif isinstance(attestation_or_root, bytes):
             attestation_root = attestation_or_root
         else:
@@ -88,6 +145,77 @@ class AttestationPool(OperationPool[Attestation]):
         except KeyError:
             return False
 
+    def _get_same_data_attestations(self, data_root: HashTreeRoot) -> Tuple[Attestation, ...]:
+        return tuple(
+            self._pool_storage[root] for root in self._roots_by_data_root.get(data_root, ())
+        )
+
+    def _get_covering_attestation(self, attestation: Attestation) -> Optional[Attestation]:
+        if get_vote_count(attestation.aggregation_bits) == 0:
+            return None
+        for pooled_attestation in self._get_same_data_attestations(
+                attestation.data.hash_tree_root):
+            if _has_no_vote_outside(
+                    attestation.aggregation_bits,
+                    pooled_attestation.aggregation_bits):
+                return pooled_attestation
+        return None
+
+    def _aggregate(self, attestation: Attestation) -> Attestation:
+        """
+        Merge ``attestation`` with the pooled attestations of the same data it does not
+        overlap with, removing them from the pool.
+
+        Both must have verified signatures: an invalid signature would make the aggregate
+        invalid, losing the valid votes merged into it.
+        """
+        if get_vote_count(attestation.aggregation_bits) == 0:
+            return attestation
+        for pooled_attestation in self._get_same_data_attestations(
+                attestation.data.hash_tree_root):
+            if pooled_attestation.hash_tree_root not in self._verified_roots:
+                continue
+            if not _are_disjoint(attestation.aggregation_bits, pooled_attestation.aggregation_bits):
+                continue
+            if get_vote_count(pooled_attestation.aggregation_bits) == 0:
+                continue
+            try:
+                signature = bls.aggregate_signatures(
+                    (attestation.signature, pooled_attestation.signature)
+                )
+            except (ValidationError, ValueError):
+                continue
+            self.remove(pooled_attestation)
+            attestation = attestation.copy(
+                aggregation_bits=_merge_bitfields(
+                    attestation.aggregation_bits,
+                    pooled_attestation.aggregation_bits,
+                ),
+                signature=signature,
+            )
+        return attestation
+
+    def add(self, attestation: Attestation, is_signature_verified: bool = False) -> None:
+        """
+        Add ``attestation`` to the pool. It is only aggregated if ``is_signature_verified``,
+        i.e. its signature was already checked, and not merely deferred to a batch.
+        """
+        if attestation.hash_tree_root in self._pool_storage:
+            return
+        if self._get_covering_attestation(attestation) is not None:
+            return
+        if is_signature_verified:
+            attestation = self._aggregate(attestation)
+            self._verified_roots.add(attestation.hash_tree_root)
+
+        data_root = attestation.data.hash_tree_root
+        if data_root not in self._data_root_slots:
+            slot = self._get_attestation_slot(attestation.data)
+            self._data_root_slots[data_root] = slot
+            self._data_roots_by_slot.setdefault(slot, set()).add(data_root)
+        self._roots_by_data_root.setdefault(data_root, set()).add(attestation.hash_tree_root)
+        super().add(attestation)
+
     def get_all(self) -> Tuple[Attestation, ...]:
         return tuple(self._pool_storage.values())
 
@@ -95,24 +223,117 @@ class AttestationPool(OperationPool[Attestation]):
         for attestation in attestations:
             self.add(attestation)
 
+    def _remove_root(self, attestation_root: HashTreeRoot) -> None:
+        attestation = self._pool_storage.pop(attestation_root)
+        self._verified_roots.discard(attestation_root)
+        data_root = attestation.data.hash_tree_root
+        same_data_roots = self._roots_by_data_root[data_root]
+        same_data_roots.discard(attestation_root)
+        if len(same_data_roots) == 0:
+            del self._roots_by_data_root[data_root]
+            slot = self._data_root_slots.pop(data_root)
+            self._data_roots_by_slot[slot].discard(data_root)
+            if len(self._data_roots_by_slot[slot]) == 0:
+                del self._data_roots_by_slot[slot]
+
     def remove(self, attestation: Attestation) -> None:
+        """
+        Remove ``attestation`` and the attestations whose votes are all in it, e.g.
+        because it is included on chain.
+        """
         if attestation.hash_tree_root in self._pool_storage:
-            del self._pool_storage[attestation.hash_tree_root]
+            self._remove_root(attestation.hash_tree_root)
+        if get_vote_count(attestation.aggregation_bits) == 0:
+            return
+        for pooled_attestation in self._get_same_data_attestations(
+                attestation.data.hash_tree_root):
+            if _has_no_vote_outside(
+                    pooled_attestation.aggregation_bits,
+                    attestation.aggregation_bits):
+                self._remove_root(pooled_attestation.hash_tree_root)
 
     def batch_remove(self, attestations: Iterable[Attestation]) -> None:
         for attestation in attestations:
             self.remove(attestation)
 
+    def prune(self, slot: Slot, slots_per_epoch: int) -> None:
+        """
+        Drop the attestations which can't be included in a block at ``slot`` or later.
+        """
+        for attestation_slot in tuple(self._data_roots_by_slot.keys()):
+            if attestation_slot + slots_per_epoch < slot:
+                for data_root in tuple(self._data_roots_by_slot[attestation_slot]):
+                    for root in tuple(self._roots_by_data_root[data_root]):
+                        self._remove_root(root)
+
+    @to_tuple
+    def get_attestations_for_block(self,
+                                   slot: Slot,
+                                   slots_per_epoch: int,
+                                   min_attestation_inclusion_delay: int,
+                                   max_attestations: int) -> Iterable[Attestation]:
+        """
+        Return at most ``max_attestations`` attestations which can be included in a block
+        at ``slot``, covering as many votes as possible.
+
+        The pool is left untouched: attestations which are too old for ``slot`` are
+        skipped, and only dropped by :meth:`prune`.
+        """
+        candidates: List[Attestation] = []
+        for attestation_slot, data_roots in self._data_roots_by_slot.items():
+            if attestation_slot + min_attestation_inclusion_delay > slot:
+                continue
+            if attestation_slot + slots_per_epoch < slot:
+                continue
+            for data_root in data_roots:
+                # Greedily pick the attestations of the same data which add the most votes
+                same_data_attestations = sorted(
+                    self._get_same_data_attestations(data_root),
+                    key=lambda attestation: get_vote_count(attestation.aggregation_bits),
+                    reverse=True,
+                )
+                covered_bitfield: Optional[Bitfield] = None
+                for attestation in same_data_attestations:
+                    bitfield = attestation.aggregation_bits
+                    # An attestation without votes is of no use in a block
+                    if get_vote_count(bitfield) == 0:
+                        continue
+                    if covered_bitfield is None:
+                        covered_bitfield = bitfield
+                    elif _has_no_vote_outside(bitfield, covered_bitfield):
+                        continue
+                    elif len(bitfield) == len(covered_bitfield):
+                        covered_bitfield = _merge_bitfields(covered_bitfield, bitfield)
+                    candidates.append(attestation)
+
+        candidates.sort(
+            key=lambda attestation: get_vote_count(attestation.aggregation_bits),
+            reverse=True,
+        )
+        yield from candidates[:max_attestations]
+
 
 class OrphanBlockPool:
     """
     Store the orphan blocks(the blocks who arrive before their parents).
-    """
-    # TODO: can probably use lru-cache or even database
-    _pool: Set[BaseBeaconBlock]
 
-    def __init__(self) -> None:
-        self._pool = set()
+    Blocks are indexed by their signing root and by their parent root. The pool holds at
+    most ``max_size`` blocks, for at most ``max_age`` seconds: the oldest blocks are
+    dropped first, along with their descendants which can't be imported without them.
+    """
+    # Insertion ordered, so the oldest blocks come first
+    _pool: Dict[SigningRoot, BaseBeaconBlock]
+    _arrival_times: Dict[SigningRoot, float]
+    _children: Dict[SigningRoot, Set[SigningRoot]]
+
+    def __init__(self,
+                 max_size: int = MAX_ORPHAN_BLOCKS,
+                 max_age: float = MAX_ORPHAN_BLOCK_AGE) -> None:
+        self.max_size = max_size
+        self.max_age = max_age
+        self._pool = {}
+        self._arrival_times = {}
+        self._children = {}
 
     def __len__(self) -> int:
         return len(self._pool)
@@ -125,34 +346,81 @@ class OrphanBlockPool:
             block_root = block_or_block_root
         else:
             raise TypeError("`block_or_block_root` should be `BaseBeaconBlock` or `SigningRoot`")
-        try:
-            self.get(block_root)
-            return True
-        except BlockNotFound:
-            return False
+        return block_root in self._pool
 
     def to_list(self) -> List[BaseBeaconBlock]:
-        return list(self._pool)
+        return list(self._pool.values())
 
     def get(self, block_root: SigningRoot) -> BaseBeaconBlock:
-        for block in self._pool:
-            if block.signing_root == block_root:
-                return block
-        raise BlockNotFound(f"No block with signing_root {block_root} is found")
+        try:
+            return self._pool[block_root]
+        except KeyError:
+            raise BlockNotFound(f"No block with signing_root {block_root} is found")
+
+    def get_missing_parent_roots(self) -> Tuple[SigningRoot, ...]:
+        """
+        Return the roots of the parents of orphan blocks which are not orphans themselves.
+        """
+        return tuple(
+            parent_root for parent_root in self._children if parent_root not in self._pool
+        )
 
     def add(self, block: BaseBeaconBlock) -> None:
-        if block in self._pool:
+        block_root = block.signing_root
+        if block_root in self._pool:
             return
-        self._pool.add(block)
+        self.prune_expired()
+        while len(self._pool) >= self.max_size:
+            self._remove_with_descendants(next(iter(self._pool)))
+
+        self._pool[block_root] = block
+        self._arrival_times[block_root] = time.monotonic()
+        self._children.setdefault(block.parent_root, set()).add(block_root)
+
+    def _remove(self, block_root: SigningRoot) -> BaseBeaconBlock:
+        block = self._pool.pop(block_root)
+        del self._arrival_times[block_root]
+        siblings = self._children[block.parent_root]
+        siblings.discard(block_root)
+        if len(siblings) == 0:
+            del self._children[block.parent_root]
+        return block
+
+    def _remove_with_descendants(self, block_root: SigningRoot) -> None:
+        self._remove(block_root)
+        self.remove_descendants(block_root)
+
+    def remove_descendants(self, block_root: SigningRoot) -> Tuple[BaseBeaconBlock, ...]:
+        """
+        Drop the orphan blocks descending from ``block_root``, e.g. because it is invalid.
+        """
+        removed: Tuple[BaseBeaconBlock, ...] = ()
+        parent_roots = [block_root]
+        while len(parent_roots) != 0:
+            children = self.pop_children(parent_roots.pop())
+            removed += children
+            parent_roots.extend(child.signing_root for child in children)
+        return removed
+
+    def prune_expired(self) -> Tuple[SigningRoot, ...]:
+        """
+        Drop the blocks whose ancestors did not show up in time, and their descendants.
+        """
+        expiry_time = time.monotonic() - self.max_age
+        expired_roots: Tuple[SigningRoot, ...] = ()
+        while len(self._pool) != 0:
+            oldest_root = next(iter(self._pool))
+            if self._arrival_times[oldest_root] > expiry_time:
+                break
+            expired_roots += (oldest_root,)
+            self._remove_with_descendants(oldest_root)
+        return expired_roots
 
     def pop_children(self, block_root: SigningRoot) -> Tuple[BaseBeaconBlock, ...]:
-        children = tuple(
-            orphan_block
-            for orphan_block in self._pool
-            if orphan_block.parent_root == block_root
+        return tuple(
+            self._remove(child_root)
+            for child_root in tuple(self._children.get(block_root, ()))
         )
-        self._pool.difference_update(children)
-        return children
 
 
 class BCCReceiveServer(BaseService):
@@ -173,7 +441,7 @@ class BCCReceiveServer(BaseService):
         self.chain = chain
         self.topic_msg_queues = topic_msg_queues
         self.p2p_node = p2p_node
-        self.attestation_pool = AttestationPool()
+        self.attestation_pool = AttestationPool(self._get_attestation_slot)
         self.orphan_block_pool = OrphanBlockPool()
 
     async def _run(self) -> None:
@@ -202,15 +470,18 @@ class BCCReceiveServer(BaseService):
         """
         while True:
             await self.sleep(PROCESS_ORPHAN_BLOCKS_PERIOD)
+            # Prune Bruce Wayne type of orphan block
+            # (whose parent block seemingly never going to show up)
+            expired_roots = self.orphan_block_pool.prune_expired()
+            if len(expired_roots) > 0:
+                self.logger.debug(
+                    "Dropped orphan blocks=%s whose ancestors never showed up",
+                    tuple(encode_hex(root) for root in expired_roots),
+                )
             if len(self.orphan_block_pool) == 0:
                 continue
-            # TODO: Prune Bruce Wayne type of orphan block
-            # (whose parent block seemingly never going to show up)
-            orphan_blocks = self.orphan_block_pool.to_list()
-            parent_roots = set(block.parent_root for block in orphan_blocks)
-            block_roots = set(block.signing_root for block in orphan_blocks)
-            # Remove dependent orphan blocks
-            parent_roots.difference_update(block_roots)
+            # Only the parents which are not orphan blocks themselves
+            parent_roots = set(self.orphan_block_pool.get_missing_parent_roots())
             # Keep requesting parent blocks from all peers
             for peer in self.p2p_node.handshaked_peers.peers.values():
                 if len(parent_roots) == 0:
@@ -240,8 +511,9 @@ class BCCReceiveServer(BaseService):
         # Check if attestation has been seen already.
         if not self._is_attestation_new(attestation):
             return
-        # Add new attestation to attestation pool.
-        self.attestation_pool.add(attestation)
+        # Add new attestation to attestation pool. Its signature was checked on its own by
+        # the topic validator, before the message was queued.
+        self.attestation_pool.add(attestation, is_signature_verified=True)
 
     async def _handle_beacon_block(self, msg: rpc_pb2.Message) -> None:
         block = ssz.decode(msg.data, BeaconBlock)
@@ -273,10 +545,10 @@ class BCCReceiveServer(BaseService):
                 "Successfully imported block=%s",
                 encode_hex(block.signing_root),
             )
-        # If the block is invalid, we should drop it.
+        # If the block is invalid, we should drop it, along with its descendants.
         except ValidationError as error:
-            # TODO: Possibly drop all of its descendants in `self.orphan_block_pool`?
             self.logger.debug("Fail to import block=%s  reason=%s", block, error)
+            self.orphan_block_pool.remove_descendants(block.signing_root)
         else:
             # Successfully imported the block. See if any blocks in `self.orphan_block_pool`
             # depend on it. If there are, try to import them.
@@ -284,6 +556,9 @@ class BCCReceiveServer(BaseService):
             self._try_import_orphan_blocks(block.signing_root)
             # Remove attestations in block that are also in the attestation pool.
             self.attestation_pool.batch_remove(block.body.attestations)
+            # and the ones which are now too old to be included in the next blocks.
+            config = self.chain.get_state_machine_class_for_block_slot(block.slot).config
+            self.attestation_pool.prune(block.slot, config.SLOTS_PER_EPOCH)
 
     def _try_import_orphan_blocks(self, parent_root: SigningRoot) -> None:
         """
@@ -315,8 +590,8 @@ class BCCReceiveServer(BaseService):
                     )
                     imported_roots.append(block.signing_root)
                 except ValidationError as error:
-                    # TODO: Possibly drop all of its descendants in `self.orphan_block_pool`?
                     self.logger.debug("Fail to import block=%s  reason=%s", block, error)
+                    self.orphan_block_pool.remove_descendants(block.signing_root)
 
     def _is_block_root_in_orphan_block_pool(self, block_root: SigningRoot) -> bool:
         return block_root in self.orphan_block_pool
@@ -336,21 +611,20 @@ class BCCReceiveServer(BaseService):
     def _is_block_seen(self, block: BaseBeaconBlock) -> bool:
         return self._is_block_root_seen(block_root=block.signing_root)
 
-    @to_tuple
-    def get_ready_attestations(self) -> Iterable[Attestation]:
+    def _get_attestation_slot(self, attestation_data: AttestationData) -> Slot:
+        state = self.chain.get_head_state()
+        config = self.chain.get_state_machine_class_for_block_slot(state.slot).config
+        return get_attestation_data_slot(state, attestation_data, config)
+
+    def get_ready_attestations(self) -> Tuple[Attestation, ...]:
+        """
+        Return the attestations to include in a block on top of the head state.
+        """
         config = self.chain.get_state_machine().config
         state = self.chain.get_head_state()
-        for attestation in self.attestation_pool.get_all():
-            data = attestation.data
-            attestation_slot = get_attestation_data_slot(state, data, config)
-            try:
-                validate_attestation_slot(
-                    attestation_slot,
-                    state.slot,
-                    config.SLOTS_PER_EPOCH,
-                    config.MIN_ATTESTATION_INCLUSION_DELAY,
-                )
-            except ValidationError:
-                continue
-            else:
-                yield attestation
+        return self.attestation_pool.get_attestations_for_block(
+            state.slot,
+            config.SLOTS_PER_EPOCH,
+            config.MIN_ATTESTATION_INCLUSION_DELAY,
+            config.MAX_ATTESTATIONS,
+        )
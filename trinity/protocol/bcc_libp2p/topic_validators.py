@@ -42,17 +42,11 @@ def get_beacon_block_validator(chain: BaseBeaconChain) -> Callable[..., bool]:
             return False
 
         state_machine = chain.get_state_machine(block.slot - 1)
-        state = chain.get_state_by_slot(block.slot - 1)
-        state_transition = state_machine.state_transition
-        # Fast forward to state in future slot in order to pass
-        # block.slot validity check
-        state = state_transition.apply_state_transition(
-            state,
-            future_slot=block.slot,
-        )
         try:
+            # The parent state fast forwarded to `block.slot`, shared with the block import
+            state = chain.get_pre_state(block.parent_root, block.slot)
             process_block_header(state, block, state_machine.config, True)
-        except (ValidationError, SignatureError) as error:
+        except (BlockNotFound, ValidationError, SignatureError) as error:
             logger.debug(
                 bold_red("Failed to validate block=%s, error=%s"),
                 encode_hex(block.signing_root),
@@ -1,5 +1,6 @@
 import asyncio
 from typing import (
+    Sequence,
     Tuple,
     Type,
     TypeVar,
@@ -42,6 +43,8 @@ from .exceptions import (
 
 MsgType = TypeVar("MsgType", bound=ssz.Serializable)
 
+SSZ_OFFSET_SIZE = 4
+
 
 def peer_id_from_pubkey(pubkey: datatypes.PublicKey) -> ID:
     algo = multihash.Func.sha2_256
@@ -128,11 +131,12 @@ async def read_resp(
 
 async def write_resp(
     stream: INetStream,
-    msg: Union[MsgType, str],
+    msg: Union[MsgType, bytes, str],
     resp_code: ResponseCode,
 ) -> None:
     """
     Write either a `MsgType` response message or an error message to the `stream`.
+    A response message which is already SSZ encoded can be passed as `bytes`.
     `WriteMessageFailure` is raised if fail to read the message.
     """
     try:
@@ -142,7 +146,9 @@ async def write_resp(
     msg_bytes: bytes
     # MsgType: `msg` is of type `ssz.Serializable` if response code is success.
     if resp_code == ResponseCode.SUCCESS:
-        if isinstance(msg, ssz.Serializable):
+        if isinstance(msg, bytes):
+            msg_bytes = _serialize_bytes(msg)
+        elif isinstance(msg, ssz.Serializable):
             try:
                 msg_bytes = _serialize_ssz_msg(msg)
             except ssz.SerializationError as error:
@@ -210,3 +216,23 @@ def _serialize_bytes(payload: bytes) -> bytes:
 def _serialize_ssz_msg(msg: MsgType) -> bytes:
     msg_bytes = ssz.encode(msg)
     return _serialize_bytes(msg_bytes)
+
+
+def encode_blocks_response(blocks_ssz: Sequence[bytes]) -> bytes:
+    """
+    Return the SSZ encoding of a `BeaconBlocksResponse` or `RecentBeaconBlocksResponse`
+    with the blocks `blocks_ssz`, which are already SSZ encoded.
+    """
+    # The response is a container with a single variable-size field, the list of blocks,
+    # which starts right after its offset. The list of variable-size blocks is the offsets
+    # of the blocks, relative to the start of the list, followed by the blocks.
+    offset = SSZ_OFFSET_SIZE * len(blocks_ssz)
+    block_offsets = []
+    for block_ssz in blocks_ssz:
+        block_offsets.append(offset.to_bytes(SSZ_OFFSET_SIZE, "little"))
+        offset += len(block_ssz)
+    return b"".join(
+        (SSZ_OFFSET_SIZE.to_bytes(SSZ_OFFSET_SIZE, "little"),) +
+        tuple(block_offsets) +
+        tuple(blocks_ssz)
+    )
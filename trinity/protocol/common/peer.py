@@ -37,6 +37,7 @@ from p2p.tracking.connection import (
 )
 
 from trinity.constants import TO_NETWORKING_BROADCAST_CONFIG
+from trinity.exceptions import WrongGenesisFailure, WrongNetworkFailure
 from trinity.protocol.common.abc import ChainInfoAPI, HeadInfoAPI
 from trinity.protocol.common.api import ChainInfo, HeadInfo
 from trinity.protocol.eth.api import ETHAPI
@@ -139,6 +140,11 @@ class BaseChainPeerPool(BasePeerPool):
     peer_factory_class: Type[BaseChainPeerFactory]
     peer_tracker: BaseEth1PeerTracker
 
+    protocol_mismatch_exceptions = BasePeerPool.protocol_mismatch_exceptions + (
+        WrongNetworkFailure,
+        WrongGenesisFailure,
+    )
+
     @property
     def highest_td_peer(self) -> BaseChainPeer:
         peers = tuple(self.connected_nodes.values())
@@ -25,6 +25,7 @@ from lahja import (
 
 from p2p.abc import CommandAPI, SessionAPI
 from p2p.cancellable import CancellableMixin
+from p2p.exceptions import PeerConnectionLost
 from p2p.peer import (
     BasePeer,
     PeerSubscriber,
@@ -71,11 +72,16 @@ class BaseRequestServer(BaseService, PeerSubscriber):
             cmd: CommandAPI,
             msg: Payload) -> None:
         try:
+            # Don't produce more responses for a peer which isn't keeping up
+            # with the data we already sent it.
+            await self.wait(peer.drain())
             await self._handle_msg(peer, cmd, msg)
         except OperationCancelled:
             # Silently swallow OperationCancelled exceptions because otherwise they'll be caught
             # by the except below and treated as unexpected.
             pass
+        except PeerConnectionLost:
+            self.logger.debug("Lost connection to %s while handling %s", peer, cmd)
         except Exception:
             self.logger.exception("Unexpected error when processing msg from %s", peer)
 
@@ -4,6 +4,7 @@ from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransactionFields
 
+from p2p.priority import CommandPriority
 from p2p.protocol import Command
 
 from trinity.rlp.block_body import BlockBody
@@ -25,11 +26,13 @@ class Status(Command):
 
 
 class NewBlockHashes(Command):
+    priority = CommandPriority.GOSSIP
     _cmd_id = 1
     structure = sedes.CountableList(sedes.List([hash_sedes, sedes.big_endian_int]))
 
 
 class Transactions(Command):
+    priority = CommandPriority.GOSSIP
     _cmd_id = 2
     structure = sedes.CountableList(BaseTransactionFields)
 
@@ -45,6 +48,7 @@ class GetBlockHeaders(Command):
 
 
 class BlockHeaders(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 4
     structure = sedes.CountableList(BlockHeader)
 
@@ -55,11 +59,13 @@ class GetBlockBodies(Command):
 
 
 class BlockBodies(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 6
     structure = sedes.CountableList(BlockBody)
 
 
 class NewBlock(Command):
+    priority = CommandPriority.GOSSIP
     _cmd_id = 7
     structure = (
         ('block', sedes.List([BlockHeader,
@@ -75,6 +81,7 @@ class GetNodeData(Command):
 
 
 class NodeData(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 14
     structure = sedes.CountableList(sedes.binary)
 
@@ -85,5 +92,6 @@ class GetReceipts(Command):
 
 
 class Receipts(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 16
     structure = sedes.CountableList(sedes.CountableList(Receipt))
@@ -4,3 +4,7 @@ MAX_STATE_FETCH = 384
 MAX_BODIES_FETCH = 128
 MAX_RECEIPTS_FETCH = 256
 MAX_HEADERS_FETCH = 192
+
+# Number of transaction hashes we remember for each peer in order to discard
+# repeated `Transactions` messages without decoding them.
+MAX_SEEN_TX_HASHES = 4096
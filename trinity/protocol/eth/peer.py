@@ -5,6 +5,10 @@ from typing import (
 
 from cached_property import cached_property
 
+import cachetools
+
+from eth_hash.auto import keccak
+
 from lahja import EndpointAPI
 
 from eth_typing import BlockNumber
@@ -15,8 +19,10 @@ from lahja import (
     BroadcastConfig,
 )
 
+from p2p._utils import split_rlp_list
 from p2p.abc import BehaviorAPI, CommandAPI, HandshakerAPI, SessionAPI
 from p2p.exceptions import PeerConnectionLost
+from p2p.exchange.abc import PerformanceAPI
 from p2p.protocol import (
     Payload,
 )
@@ -50,7 +56,7 @@ from .commands import (
     NewBlockHashes,
     Transactions,
 )
-from .constants import MAX_HEADERS_FETCH
+from .constants import MAX_HEADERS_FETCH, MAX_SEEN_TX_HASHES
 from .events import (
     GetBlockHeadersEvent,
     GetBlockHeadersRequest,
@@ -86,6 +92,37 @@ class ETHPeer(BaseChainPeer):
     def eth_api(self) -> ETHAPI:
         return self.connection.get_logic(ETHAPI.name, ETHAPI)
 
+    def get_performance_trackers(self) -> Tuple[PerformanceAPI, ...]:
+        return tuple(exchange.tracker for exchange in self.eth_api.exchanges)
+
+    def setup_protocol_handlers(self) -> None:
+        super().setup_protocol_handlers()
+        # Hashes of the transactions this peer already sent us.  Used to
+        # discard repeated `Transactions` messages before they get decoded.
+        self._seen_tx_hashes: cachetools.LRUCache = cachetools.LRUCache(MAX_SEEN_TX_HASHES)
+        self.connection.get_multiplexer().add_msg_filter(
+            Transactions,
+            self._has_unseen_transactions,
+        )
+
+    def _has_unseen_transactions(self, encoded_payload: bytes) -> bool:
+        try:
+            encoded_txs = split_rlp_list(encoded_payload)
+        except ValueError:
+            # Let the regular decoding deal with malformed messages.
+            return True
+
+        if not encoded_txs:
+            return True
+
+        has_unseen = False
+        for encoded_tx in encoded_txs:
+            tx_hash = keccak(encoded_tx)
+            if tx_hash not in self._seen_tx_hashes:
+                self._seen_tx_hashes[tx_hash] = None
+                has_unseen = True
+        return has_unseen
+
 
 class ETHProxyPeer(BaseProxyPeer):
     """
@@ -18,6 +18,7 @@ from rlp import sedes
 from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
 
+from p2p.priority import CommandPriority
 from p2p.protocol import Command
 from p2p.typing import Payload
 
@@ -89,6 +90,7 @@ class Status(Command):
 
 
 class Announce(Command):
+    priority = CommandPriority.GOSSIP
     _cmd_id = 1
     structure = (
         ('head_hash', sedes.binary),
@@ -119,6 +121,7 @@ class GetBlockHeaders(Command):
 
 
 class BlockHeaders(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 3
     structure = (
         ('request_id', sedes.big_endian_int),
@@ -136,6 +139,7 @@ class GetBlockBodies(Command):
 
 
 class BlockBodies(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 5
     structure = (
         ('request_id', sedes.big_endian_int),
@@ -153,6 +157,7 @@ class GetReceipts(Command):
 
 
 class Receipts(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 7
     structure = (
         ('request_id', sedes.big_endian_int),
@@ -179,6 +184,7 @@ class GetProofs(Command):
 
 
 class Proofs(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 9
     structure = (
         ('request_id', sedes.big_endian_int),
@@ -215,6 +221,7 @@ class GetContractCodes(Command):
 
 
 class ContractCodes(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 11
     structure = (
         ('request_id', sedes.big_endian_int),
@@ -236,6 +243,7 @@ class GetProofsV2(GetProofs):
 
 
 class ProofsV2(Command):
+    priority = CommandPriority.RESPONSE
     _cmd_id = 16
     structure = (
         ('request_id', sedes.big_endian_int),
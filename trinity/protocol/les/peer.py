@@ -21,6 +21,7 @@ from lahja import (
 )
 
 from p2p.abc import BehaviorAPI, CommandAPI, HandshakerAPI, SessionAPI
+from p2p.exchange.abc import PerformanceAPI
 from p2p.peer_pool import BasePeerPool
 from p2p.typing import Payload
 
@@ -77,6 +78,9 @@ class LESPeer(BaseChainPeer):
     def les_api(self) -> LESAPI:
         return self.connection.get_logic(LESAPI.name, LESAPI)
 
+    def get_performance_trackers(self) -> Tuple[PerformanceAPI, ...]:
+        return tuple(exchange.tracker for exchange in self.les_api.exchanges)
+
 
 class LESProxyPeer(BaseProxyPeer):
     """
@@ -7,6 +7,7 @@ from typing import (
     Type,
     TypeVar,
 )
+import cachetools
 from lahja import EndpointAPI
 
 from eth_keys import datatypes
@@ -16,7 +17,14 @@ from eth_typing import BlockNumber
 from eth.abc import AtomicDatabaseAPI, VirtualMachineAPI
 
 from p2p.abc import NodeAPI
-from p2p.constants import DEFAULT_MAX_PEERS, DEVP2P_V5
+from p2p.constants import (
+    DEFAULT_MAX_PEERS,
+    DEVP2P_V5,
+    INBOUND_HANDSHAKE_BURST_PER_IP,
+    INBOUND_HANDSHAKE_RATE_PER_IP,
+    MAX_CONCURRENT_INBOUND_HANDSHAKES,
+    MAX_TRACKED_HANDSHAKE_IPS,
+)
 from p2p.disconnect import DisconnectReason
 from p2p.exceptions import (
     HandshakeFailure,
@@ -25,6 +33,7 @@ from p2p.exceptions import (
 )
 from p2p.handshake import receive_dial_in, DevP2PHandshakeParams
 from p2p.service import BaseService
+from p2p.token_bucket import NotEnoughTokens, TokenBucket
 
 from trinity._utils.version import construct_trinity_client_identifier
 from trinity.chains.base import AsyncChainAPI
@@ -97,6 +106,12 @@ class BaseServer(BaseService, Generic[TPeerPool]):
         if self.preferred_nodes is None and network_id in DEFAULT_PREFERRED_NODES:
             self.preferred_nodes = DEFAULT_PREFERRED_NODES[self.network_id]
 
+        # inbound handshake limits
+        self._inbound_handshakes_in_progress = 0
+        self._handshake_rate_limiters: cachetools.LRUCache = cachetools.LRUCache(
+            MAX_TRACKED_HANDSHAKE_IPS,
+        )
+
         # child services
         self.peer_pool = self._make_peer_pool()
 
@@ -140,9 +155,45 @@ class BaseServer(BaseService, Generic[TPeerPool]):
         self.logger.info("Closing server...")
         await self._close_tcp_listener()
 
+    def _should_accept_handshake(self, writer: asyncio.StreamWriter) -> bool:
+        if self._inbound_handshakes_in_progress >= MAX_CONCURRENT_INBOUND_HANDSHAKES:
+            self.logger.debug2(
+                "Dropping inbound connection: %d handshakes already in progress",
+                self._inbound_handshakes_in_progress,
+            )
+            return False
+
+        peername = writer.get_extra_info("peername")
+        if peername is None:
+            # `Transport.receive_connection` raises an appropriate error for this.
+            return True
+
+        ip, *_ = peername
+        try:
+            rate_limiter = self._handshake_rate_limiters[ip]
+        except KeyError:
+            rate_limiter = TokenBucket(
+                rate=INBOUND_HANDSHAKE_RATE_PER_IP,
+                capacity=INBOUND_HANDSHAKE_BURST_PER_IP,
+            )
+            self._handshake_rate_limiters[ip] = rate_limiter
+
+        try:
+            rate_limiter.take_nowait()
+        except NotEnoughTokens:
+            self.logger.debug2("Dropping inbound connection: %s is handshaking too often", ip)
+            return False
+        else:
+            return True
+
     async def receive_handshake(
             self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
 
+        if not self._should_accept_handshake(writer):
+            writer.close()
+            return
+
+        self._inbound_handshakes_in_progress += 1
         try:
             try:
                 await self._receive_handshake(reader, writer)
@@ -160,6 +211,8 @@ class BaseServer(BaseService, Generic[TPeerPool]):
             pass
         except Exception as e:
             self.logger.exception("Unexpected error handling handshake")
+        finally:
+            self._inbound_handshakes_in_progress -= 1
 
     async def _receive_handshake(
             self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
@@ -173,6 +226,7 @@ class BaseServer(BaseService, Generic[TPeerPool]):
             protocol_handshakers=handshakers,
             token=self.cancel_token,
         )
+        self.peer_pool.inbound_handshake_rate.record()
 
         # Create and register peer in peer_pool
         peer = factory.create_peer(connection)
@@ -1,6 +1,10 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import itertools
+import time
 from typing import (
+    Dict,
+    Sequence,
     Tuple,
     AsyncGenerator,
 )
@@ -8,6 +12,9 @@ from typing import (
 from eth_utils import (
     ValidationError,
 )
+from eth_utils.toolz import (
+    sliding_window,
+)
 
 from cancel_token import (
     CancelToken,
@@ -30,6 +37,7 @@ from trinity.db.beacon.chain import BaseAsyncBeaconChainDB
 from trinity.protocol.bcc_libp2p.node import PeerPool, Peer
 from trinity.sync.beacon.constants import (
     MAX_BLOCKS_PER_REQUEST,
+    MAX_PENDING_BATCHES,
     PEER_SELECTION_RETRY_INTERVAL,
     PEER_SELECTION_MAX_RETRIES,
 )
@@ -43,13 +51,22 @@ from trinity.protocol.bcc_libp2p.exceptions import RequestFailure
 
 
 class BeaconChainSyncer(BaseService):
-    """Sync from our finalized head until their preliminary head."""
+    """
+    Sync from our finalized head until their preliminary head.
+
+    Blocks are requested from every peer on the same head as the best peer in parallel, and
+    imported while the next batches are downloaded. The imports run on a single dedicated
+    thread, one batch at a time: it is the only code of the syncer writing to the chain,
+    and the event loop keeps serving the downloads in the meantime.
+    """
 
     chain_db: BaseAsyncBeaconChainDB
     peer_pool: PeerPool
     block_importer: SyncBlockImporter
     genesis_config: Eth2GenesisConfig
     sync_peer: Peer
+    sync_peers: Tuple[Peer, ...]
+    _import_executor: ThreadPoolExecutor
 
     def __init__(self,
                  chain_db: BaseAsyncBeaconChainDB,
@@ -65,6 +82,11 @@ class BeaconChainSyncer(BaseService):
         self.genesis_config = genesis_config
 
         self.sync_peer = None
+        self.sync_peers = ()
+        self._import_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='beacon-sync-import',
+        )
 
     @property
     def is_sync_peer_selected(self) -> bool:
@@ -97,10 +119,11 @@ class BeaconChainSyncer(BaseService):
             self.logger.info("Failed to find suitable sync peer in time")
             return
 
+        self.sync_peers = self.select_sync_peers(self.sync_peer)
         await self.wait(self.sync())
 
         new_head = await self.chain_db.coro_get_canonical_head(BeaconBlock)
-        self.logger.info(f"Sync with {self.sync_peer} finished, new head: {new_head}")
+        self.logger.info(f"Sync with {self.sync_peers} finished, new head: {new_head}")
 
     async def select_sync_peer(self) -> Peer:
         if len(self.peer_pool) == 0:
@@ -119,6 +142,19 @@ class BeaconChainSyncer(BaseService):
 
         return best_peer
 
+    def select_sync_peers(self, best_peer: Peer) -> Tuple[Peer, ...]:
+        """
+        Return the peers which can serve the chain of ``best_peer``, with ``best_peer`` first.
+
+        Blocks are requested by slot on the chain of the peer's head, so only the peers on the
+        same head are guaranteed to send blocks of the same chain.
+        """
+        return (best_peer,) + tuple(
+            peer
+            for peer in self.peer_pool.peers.values()
+            if peer is not best_peer and peer.head_root == best_peer.head_root
+        )
+
     async def sync(self) -> None:
 
         try:
@@ -130,73 +166,176 @@ class BeaconChainSyncer(BaseService):
 
         self.logger.info(
             "Syncing with %s (their head slot: %d, our finalized slot: %d)",
-            self.sync_peer,
+            self.sync_peers,
             self.sync_peer.head_slot,
             finalized_slot,
         )
         start_slot = finalized_slot + 1
-        batches = self.request_batches(start_slot)
+        batches = self.request_batches(start_slot, self.sync_peer.head_slot)
 
         last_block = None
-        async for batch in batches:
-            if last_block is None:
-                try:
-                    await self.validate_first_batch(batch)
-                except ValidationError:
-                    return
-            else:
-                if batch[0].parent_root != last_block.signing_root:
-                    self.logger.info(f"Received batch is not linked to previous one")
-                    break
-            last_block = batch[-1]
-
-            for block in batch:
-                # Copied from `RegularChainBodySyncer._import_blocks`
-                try:
-                    _, new_canonical_blocks, old_canonical_blocks = self.block_importer.import_block(block)  # noqa: E501
-
-                    if new_canonical_blocks == (block,):
-                        # simple import of a single new block.
-                        self.logger.info("Imported block %d", block.slot)
-                    elif not new_canonical_blocks:
-                        # imported block from a fork.
-                        self.logger.info("Imported non-canonical block %d", block.slot)
-                    elif old_canonical_blocks:
-                        self.logger.info(
-                            "Chain Reorganization: Imported block %d"
-                            ", %d blocks discarded and %d new canonical blocks added",
-                            block.slot,
-                            len(old_canonical_blocks),
-                            len(new_canonical_blocks),
-                        )
-                    else:
-                        raise Exception("Invariant: unreachable code path")
-                except ValidationError as error:
-                        self.logger.info(f"Received invalid block from {self.sync_peer}: {error}")
+        imported_block_count = 0
+        start_time = time.perf_counter()
+        try:
+            async for batch in batches:
+                if len(batch) == 0:
+                    # Every slot of the batch was skipped
+                    continue
+
+                if last_block is None:
+                    try:
+                        await self.validate_first_batch(batch)
+                    except ValidationError:
+                        return
+                else:
+                    if batch[0].parent_root != last_block.signing_root:
+                        self.logger.info(f"Received batch is not linked to previous one")
                         break
+                last_block = batch[-1]
+
+                batch_imported_count = await self._run_in_executor(
+                    self._import_executor,
+                    self._import_batch,
+                    batch,
+                )
+                imported_block_count += batch_imported_count
+                if batch_imported_count != len(batch):
+                    break
+
+                elapsed = time.perf_counter() - start_time
+                self.logger.info(
+                    "Imported %d blocks up to slot %d (%.1f blocks/sec)",
+                    imported_block_count,
+                    last_block.slot,
+                    imported_block_count / elapsed,
+                )
+        finally:
+            await batches.aclose()
+
+    def _import_batch(self, batch: Tuple[BaseBeaconBlock, ...]) -> int:
+        """
+        Import the blocks of ``batch`` in order, and return how many were imported.
+
+        Only ever run on the import thread. The import stops early if the syncer is
+        cancelled, as the batch is no longer awaited then.
+        """
+        for imported_count, block in enumerate(batch):
+            if self.is_cancelled:
+                return imported_count
+            # Copied from `RegularChainBodySyncer._import_blocks`
+            try:
+                _, new_canonical_blocks, old_canonical_blocks = self.block_importer.import_block(block)  # noqa: E501
+
+                if new_canonical_blocks == (block,):
+                    # simple import of a single new block.
+                    self.logger.debug("Imported block %d", block.slot)
+                elif not new_canonical_blocks:
+                    # imported block from a fork.
+                    self.logger.debug("Imported non-canonical block %d", block.slot)
+                elif old_canonical_blocks:
+                    self.logger.info(
+                        "Chain Reorganization: Imported block %d"
+                        ", %d blocks discarded and %d new canonical blocks added",
+                        block.slot,
+                        len(old_canonical_blocks),
+                        len(new_canonical_blocks),
+                    )
+                else:
+                    raise Exception("Invariant: unreachable code path")
+            except ValidationError as error:
+                self.logger.info(f"Received invalid block from {self.sync_peers}: {error}")
+                return imported_count
+        return len(batch)
+
+    async def _cleanup(self) -> None:
+        # Wait for the block being imported, without blocking the event loop
+        await asyncio.get_event_loop().run_in_executor(None, self._import_executor.shutdown)
 
     async def request_batches(self,
                               start_slot: Slot,
+                              target_slot: Slot,
                               ) -> AsyncGenerator[Tuple[BaseBeaconBlock, ...], None]:
-        slot = start_slot
+        """
+        Yield the batches of blocks from ``start_slot`` until ``target_slot``, in order.
+
+        The slots are split in requests of ``MAX_BLOCKS_PER_REQUEST``, which are sent to all
+        sync peers in parallel, at most ``MAX_PENDING_BATCHES`` ahead of the yielded batch.
+        A failed request is retried with another peer before any later slots, and the failing
+        peer is not used again.
+        """
+        request_start_slots = tuple(
+            Slot(slot) for slot in range(start_slot, target_slot + 1, MAX_BLOCKS_PER_REQUEST)
+        )
+        if len(request_start_slots) == 0:
+            return
+
+        batches: Dict[Slot, 'asyncio.Future[Tuple[BaseBeaconBlock, ...]]'] = {
+            slot: asyncio.Future() for slot in request_start_slots
+        }
+        # Lowest slots first, so that the permit released by a failed request goes to its
+        # retry: batches are only yielded, and their permits released, in order
+        pending_slots: 'asyncio.PriorityQueue[Slot]' = asyncio.PriorityQueue()
+        for slot in request_start_slots:
+            pending_slots.put_nowait(slot)
+        request_permits = asyncio.Semaphore(MAX_PENDING_BATCHES)
+
+        workers = tuple(
+            asyncio.ensure_future(self._request_batches_from_peer(
+                peer, target_slot, pending_slots, batches, request_permits,
+            ))
+            for peer in self.sync_peers
+        )
+        all_workers_done = asyncio.ensure_future(asyncio.wait(workers))
+        try:
+            for slot in request_start_slots:
+                await self.wait(asyncio.wait(
+                    (batches[slot], all_workers_done),
+                    return_when=asyncio.FIRST_COMPLETED,
+                ))
+                if not batches[slot].done():
+                    self.logger.info("No sync peer left to request blocks from")
+                    break
+                request_permits.release()
+                yield batches[slot].result()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            all_workers_done.cancel()
+
+    async def _request_batches_from_peer(
+            self,
+            peer: Peer,
+            target_slot: Slot,
+            pending_slots: 'asyncio.PriorityQueue[Slot]',
+            batches: Dict[Slot, 'asyncio.Future[Tuple[BaseBeaconBlock, ...]]'],
+            request_permits: asyncio.Semaphore) -> None:
         while True:
-            self.logger.debug(
-                "Requesting blocks from %s starting at #%d", self.sync_peer, slot
-            )
+            await request_permits.acquire()
+            slot = await pending_slots.get()
+            count = min(MAX_BLOCKS_PER_REQUEST, target_slot + 1 - slot)
+            self.logger.debug("Requesting blocks from %s starting at #%d", peer, slot)
             try:
-                batch = await self.sync_peer.request_beacon_blocks(
-                    slot, MAX_BLOCKS_PER_REQUEST
+                batch = await peer.request_beacon_blocks(slot, count)
+                self._validate_batch(batch, slot, count)
+            except (RequestFailure, ValidationError) as error:
+                self.logger.debug("Request batch from %s failed  reason: %s", peer, error)
+                # Let another peer request the slots
+                pending_slots.put_nowait(slot)
+                request_permits.release()
+                return
+            batches[slot].set_result(batch)
+
+    @staticmethod
+    def _validate_batch(batch: Sequence[BaseBeaconBlock], start_slot: Slot, count: int) -> None:
+        for block in batch:
+            if not start_slot <= block.slot < start_slot + count:
+                raise ValidationError(
+                    f"Block at slot {block.slot} is out of the requested range"
+                    f" [{start_slot}, {start_slot + count})"
                 )
-            except RequestFailure as error:
-                self.logger.debug("Request batch failed  reason: %s", error)
-                break
-
-            if len(batch) == 0:
-                break
-
-            yield batch
-
-            slot = batch[-1].slot + 1
+        for parent, child in sliding_window(2, batch):
+            if child.parent_root != parent.signing_root:
+                raise ValidationError(f"Block at slot {child.slot} is not linked to its parent")
 
     async def validate_first_batch(self, batch: Tuple[BaseBeaconBlock, ...]) -> None:
         parent_root = batch[0].parent_root
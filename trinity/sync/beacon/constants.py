@@ -1,3 +1,5 @@
 MAX_BLOCKS_PER_REQUEST = 64
 PEER_SELECTION_RETRY_INTERVAL = 5
 PEER_SELECTION_MAX_RETRIES = 6
+# How many batches may be downloaded ahead of the one being imported
+MAX_PENDING_BATCHES = 16